@@ -1,21 +1,133 @@
-from flask import Flask, request, render_template, redirect, url_for, jsonify, flash
+from flask import Blueprint, Flask, Response, current_app, request, render_template, redirect, url_for, jsonify, flash, abort, make_response, send_from_directory, session
 from flask_sqlalchemy import SQLAlchemy
-from datetime import datetime
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.exc import StaleDataError
+from werkzeug.local import LocalProxy
+import click
+from datetime import datetime, timedelta, timezone
+import functools
+import json
+import time
 import os
+import random
+import secrets
 from enum import Enum
 import math
+import csv
+import io
+from bracket_view import BracketCache, bracket_entry, build_bracket_view, match_entry
+import elimination
+import jobs
+from events import EventBroker
+from stats_cache import PlayerStatsCache
+from summary_cache import SummaryCache
+from tournament_locks import TournamentLocks
+from pairing import build_opponent_index, swiss_pairings
+from schedule import round_pairings, rounds_per_cycle
+import migrations
+import ratings
+from standings import compute_tiebreaks, standing_key, tiebreak_deltas
+import server
+import storage
+from instrumentation import count_queries, install_instrumentation, install_query_counter
+from jsonapi import json_response, paged_rows, parse_page, select_fields
 
-app = Flask(__name__, static_url_path='/static')
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///tournament.db'
-app.secret_key = os.urandom(24)  # Generates a random 24-byte key
-db = SQLAlchemy(app)
+db = SQLAlchemy()
+# Routes and CLI commands; create_app registers them on each app
+bp = Blueprint('main', __name__, cli_group=None)
 
-app.app_context().push()
+def _app_state(name):
+    return LocalProxy(lambda: current_app.extensions['tourneyman'][name])
+
+# Per-app in-memory state, created by create_app
+bracket_cache = _app_state('bracket_cache')  # Bracket view models by tournament revision
+_opponent_indexes = _app_state('opponent_indexes')
+player_stats_cache = _app_state('player_stats_cache')  # Cross-tournament player totals
+tournament_summary_cache = _app_state('tournament_summary')  # Status counts and recent players for the home and list pages
+event_broker = _app_state('event_broker')  # Live updates for /tournaments/<id>/events streams
+tournament_locks = _app_state('tournament_locks')  # Serializes this process's writes per tournament
+
+def load_secret_key(app):
+    """Use SECRET_KEY if configured, else a key generated once and kept in the instance folder.
+
+    A stable key keeps sessions and flash messages valid across restarts.
+    """
+    if app.config.get('SECRET_KEY'):
+        return
+    path = os.path.join(app.instance_path, 'secret_key')
+    if not os.path.exists(path):
+        os.makedirs(app.instance_path, exist_ok=True)
+        try:
+            # O_EXCL so processes starting together all end up with the same key
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            with os.fdopen(fd, 'w') as f:
+                f.write(secrets.token_hex(32))
+        except FileExistsError:
+            pass
+    with open(path) as f:
+        app.config['SECRET_KEY'] = f.read().strip()
+
+def create_app(config=None):
+    """Create and configure an app.
+
+    ``config`` overrides every other setting, e.g.
+    ``create_app({'SQLALCHEMY_DATABASE_URI': 'sqlite://'})`` for an isolated
+    in-memory app. Nothing connects to the database until the first query.
+    """
+    started = time.perf_counter()
+    app = Flask(__name__, static_url_path='/static')
+    storage.load_config(app, config)  # Database URI, pooling and SQLite tuning
+    load_secret_key(app)
+    # Part of every ETag so a restart (possibly with new templates) never matches
+    # pages cached before it; set it to a release name to share ETags across workers
+    app.config.setdefault('ETAG_SALT', format(int(time.time()), 'x'))
+    
+    db.init_app(app)
+    with app.app_context():
+        storage.install_sqlite_pragmas(db.engine, app.config)
+        install_query_counter(app, db.engine)  # Per-request SQL statement counts
+    
+    bracket_cache = BracketCache()
+    app.extensions['tourneyman'] = {
+        'bracket_cache': bracket_cache,
+        'opponent_indexes': {},
+        # Invalidated by writes to any of the player's tournaments
+        'player_stats_cache': PlayerStatsCache(bracket_cache.version),
+        # Invalidated by any tournament write, and when a tournament starts or ends
+        'tournament_summary': SummaryCache(bracket_cache.generation, TOURNAMENT_SUMMARY_TTL),
+        'event_broker': EventBroker(),
+        'tournament_locks': TournamentLocks(),
+    }
+    # Opt-in Server-Timing headers, /metrics and profiling (see instrumentation.py)
+    for key, value in jobs.DEFAULTS.items():
+        app.config.setdefault(key, value)
+    install_instrumentation(app, metrics_gauges=[(
+        'tourneyman_live_streams', 'Open live update streams.',
+        app.extensions['tourneyman']['event_broker'].subscriber_count
+    )] + [
+        (f'tourneyman_jobs_{status.name.lower()}', f'Background jobs {status.value.lower()}.',
+         functools.partial(count_jobs, status.value))
+        for status in (JobStatus.QUEUED, JobStatus.RUNNING, JobStatus.FAILED)
+    ])
+    app.register_blueprint(bp)
+    
+    app.extensions['tourneyman']['startup_seconds'] = time.perf_counter() - started
+    return app
+
+def clear_caches():
+    """Empty the current app's in-memory caches, so the next reads go to the database."""
+    bracket_cache.clear()
+    player_stats_cache.clear()
+    _opponent_indexes.clear()
+    tournament_summary_cache.clear()
 
 class TournamentFormat(Enum):
     SINGLE_ELIMINATION = 'Single Elimination'
     DOUBLE_ELIMINATION = 'Double Elimination'
     ROUND_ROBIN = 'Round Robin'
+    DOUBLE_ROUND_ROBIN = 'Double Round Robin'
     SWISS = 'Swiss'
 
 class TournamentStatus(Enum):
@@ -33,6 +145,12 @@ class PlayerStatus(Enum):
     WON = 'Won'
     LOST = 'Lost'
 
+class JobStatus(Enum):
+    QUEUED = 'Queued'
+    RUNNING = 'Running'
+    DONE = 'Done'
+    FAILED = 'Failed'
+
 class Tournament(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     tournament_id = db.Column(db.Integer, nullable=False, unique=True)
@@ -42,13 +160,40 @@ class Tournament(db.Model):
     start_date = db.Column(db.DateTime, nullable=False)
     end_date = db.Column(db.DateTime, nullable=True)
     current_round = db.Column(db.Integer, default=1)  # For non-bracket formats
+    # Version column: bumped by every write and checked by it (see tournament_write); also the ETag
+    revision = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    updated_at = db.Column(db.DateTime, nullable=True)
+    # Current-round progress for non-bracket formats, kept up to date by every write
+    round_expected = db.Column(db.Integer, nullable=False, default=0, server_default='0')  # Players due a result
+    round_reported = db.Column(db.Integer, nullable=False, default=0, server_default='0')  # Players with a result
     contestants = db.relationship('Contestant', backref='tournament', lazy=True)
     matches = db.relationship('MatchResult', backref='tournament', lazy=True)
 
+    __table_args__ = (
+        db.Index('ix_tournament_start_date', 'start_date'),
+    )
+    __mapper_args__ = {'version_id_col': revision}
+
     @property
     def is_elimination_format(self):
         return self.tFormat in [TournamentFormat.SINGLE_ELIMINATION.value, TournamentFormat.DOUBLE_ELIMINATION.value]
 
+    @property
+    def active_players(self):
+        return [c for c in self.contestants if c.active]
+
+    @property
+    def is_round_robin(self):
+        return self.tFormat in [TournamentFormat.ROUND_ROBIN.value, TournamentFormat.DOUBLE_ROUND_ROBIN.value]
+
+    @property
+    def is_double_round_robin(self):
+        return self.tFormat == TournamentFormat.DOUBLE_ROUND_ROBIN.value
+
+    @property
+    def is_single_elimination(self):
+        return self.tFormat == TournamentFormat.SINGLE_ELIMINATION.value
+
     @property
     def is_double_elimination(self):
         return self.tFormat == TournamentFormat.DOUBLE_ELIMINATION.value
@@ -57,125 +202,179 @@ class Tournament(db.Model):
         """Determine the current round based on the round count."""
         return self.current_round
 
+    def touch(self):
+        """Mark the tournament as changed; call before committing any write to it.
+
+        The UPDATE this causes bumps the revision, and fails with
+        StaleDataError if another write committed since the row was read.
+        """
+        self.updated_at = datetime.now()
+
+    @property
+    def round_complete(self):
+        """Every player due to play this round has a result (non-bracket formats)."""
+        return self.round_expected > 0 and self.round_reported >= self.round_expected
+
+    def start_round(self, active_count):
+        """Reset the round counters for a new round."""
+        self.round_expected = active_count
+        self.round_reported = 0
+
     def increment_round(self):
         """Increment the round count."""
         self.current_round += 1
+        sync_round_progress(self)
+        state = tournament_event(self)
+        self.touch()
         db.session.commit()
+        bracket_cache.bump(self.tournament_id)
+        event_broker.publish(self.tournament_id, 'round', state)
+
+    def opponent_index(self):
+        """Return ({player: frozenset(opponents)}, {player: bye count}) for this tournament.
+
+        Built from a single column query and cached under the tournament's
+        revision, which every write moves, whichever process makes it.
+        """
+        cached = _opponent_indexes.get(self.tournament_id)
+        if cached is None or cached[0] != self.revision:
+            names = {c.id: c.player for c in self.contestants}
+            rows = db.session.query(MatchResult.player1_id, MatchResult.player2_id).filter_by(
+                tournament_id=self.tournament_id
+            ).all()
+            cached = (self.revision,) + build_opponent_index(
+                (names[player1_id], names.get(player2_id)) for player1_id, player2_id in rows
+            )
+            _opponent_indexes[self.tournament_id] = cached
+        return cached[1], cached[2]
 
     def get_swiss_pairings(self):
-        """Generate Swiss-system Monrad pairings for the current round"""
+        """Generate Swiss-system pairings for the current round.
+
+        Players are paired within score groups by minimum-cost matching, so
+        rematches only happen when no rematch-free pairing exists.
+        """
         if self.tFormat != TournamentFormat.SWISS.value:
             raise ValueError("Tournament is not Swiss format")
 
-        # Get active players and sort by score, then seed
-        players = sorted(
-            [p for p in self.contestants if p.active],
-            key=lambda x: (-x.score, x.seed or float('inf'))
+        players = {p.player: p for p in self.contestants if p.active}
+        opponents, byes = self.opponent_index()
+        pairings = swiss_pairings(
+            [(p.player, p.score, rank) for rank, p in enumerate(sorted(players.values(), key=pairing_key))],
+            opponents,
+            byes
         )
-        
-        # Get all previous matches to avoid repeats
-        previous_matches = {
-            (m.player1, m.player2) for m in self.matches
-        }
-        
-        pairings = []
-        unpaired = players.copy()
-        
-        while len(unpaired) >= 2:
-            player1 = unpaired.pop(0)
-            
-            # Find the highest-ranked opponent that player1 hasn't faced
-            for i, player2 in enumerate(unpaired):
-                if (player1.player, player2.player) not in previous_matches and \
-                   (player2.player, player1.player) not in previous_matches:
-                    unpaired.pop(i)
-                    pairings.append((player1, player2))
-                    break
-            else:
-                # If no valid opponent found, pair with the next available player
-                player2 = unpaired.pop(0)
-                pairings.append((player1, player2))
-        
-        # Handle odd number of players with a bye
-        if unpaired:
-            pairings.append((unpaired[0], None))
-        
-        return pairings
+        return [
+            (players[player1], players[player2] if player2 is not None else None)
+            for player1, player2 in pairings
+        ]
 
     def get_round_robin_pairings(self):
-        """Generate Round Robin pairings for the current round using Circle method"""
-        if self.tFormat != TournamentFormat.ROUND_ROBIN.value:
+        """Generate Round Robin pairings for the current round from the Berger table"""
+        if not self.is_round_robin:
             raise ValueError("Tournament is not Round Robin format")
 
-        players = [p for p in self.contestants if p.active]
-        if len(players) % 2 != 0:
-            players.append(None)  # Add a bye slot for odd number of players
-        
-        n = len(players)
-        round_num = self.current_round
-        
-        # Create the initial circle arrangement
-        circle = players[:1] + players[1:][:(n-1)][::-1]
-        
-        # Rotate (round_num - 1) times
-        for _ in range(round_num - 1):
-            circle = [circle[0]] + [circle[-1]] + circle[1:-1]
-        
-        # Generate pairings
-        pairings = []
-        for i in range(n // 2):
-            if circle[i] is not None and circle[n-1-i] is not None:
-                pairings.append((circle[i], circle[n-1-i]))
-            elif circle[i] is not None:
-                pairings.append((circle[i], None))  # Bye
-            elif circle[n-1-i] is not None:
-                pairings.append((circle[n-1-i], None))  # Bye
-        
-        return pairings
+        # Berger table positions follow the pairing order fixed when play began
+        players = sorted((p for p in self.contestants if p.active), key=pairing_key)
+        pairings = round_pairings(len(players), self.current_round, double=self.is_double_round_robin)
+        return [
+            (players[home], players[away] if away is not None else None)
+            for home, away in pairings
+        ]
 
-    def total_rounds_needed(self):
+    def total_rounds_needed(self, player_count=None):
         """Calculate total rounds needed based on format and player count"""
-        player_count = len([c for c in self.contestants if c.active])
-        if self.tFormat == TournamentFormat.ROUND_ROBIN.value:
-            return player_count - 1
+        if player_count is None:
+            player_count = len([c for c in self.contestants if c.active])
+        if self.is_round_robin:
+            return rounds_per_cycle(player_count) * (2 if self.is_double_round_robin else 1)
         elif self.tFormat == TournamentFormat.SWISS.value:
             # Swiss typically uses log2(N) rounds, rounded up
-            return math.ceil(math.log2(player_count))
-        return None  # For elimination formats
+            return math.ceil(math.log2(player_count)) if player_count > 1 else 0
+        elif self.is_elimination_format:
+            # The bracket holds everyone who entered, including players knocked out since
+            return elimination.stage_count(max(len(self.contestants), 2), double=self.is_double_elimination)
+        return None
+
+def player_key(name):
+    """Case-insensitive form of a player name, for lookups and prefix search."""
+    return name.strip().casefold()
+
+class Player(db.Model):
+    """A person across tournaments; each tournament they enter gives them a Contestant."""
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(80), nullable=False)
+    name_key = db.Column(db.String(80), nullable=False)  # player_key(name)
+    created_at = db.Column(db.DateTime, nullable=True, default=datetime.now)
+    rating = db.Column(db.Float, nullable=False, default=ratings.DEFAULT_RATING)  # Elo, see ratings.py
+    rated_matches = db.Column(db.Integer, nullable=False, default=0)
+    entries = db.relationship('Contestant', backref='profile', lazy=True)
+
+    __table_args__ = (
+        db.UniqueConstraint('name', name='unique_player_name'),
+        db.Index('ix_player_name_key', 'name_key'),
+    )
 
 class Contestant(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    player = db.Column(db.String(80), nullable=False)
+    player = db.Column(db.String(80), nullable=False)  # The name they entered under
+    player_id = db.Column(db.Integer, db.ForeignKey('player.id'), nullable=False)
     seed = db.Column(db.Integer, nullable=True)
+    rating = db.Column(db.Float, nullable=True)  # The player's rating on entry, which seeds unseeded players
+    # Place in the round robin / Swiss pairing order, fixed by the first result (see fix_positions)
+    position = db.Column(db.Integer, nullable=True)
     tournament_id = db.Column(db.Integer, db.ForeignKey('tournament.tournament_id'), nullable=False)
     score = db.Column(db.Float, default=0.0)
     matches_played = db.Column(db.Integer, default=0)
     matches_won = db.Column(db.Integer, default=0)
     matches_drawn = db.Column(db.Integer, default=0)  # For Swiss/Round Robin
     losses = db.Column(db.Integer, default=0)
+    buchholz = db.Column(db.Float, default=0.0)  # Sum of opponents' scores
+    sonneborn_berger = db.Column(db.Float, default=0.0)  # Scores of beaten opponents, half for draws
     active = db.Column(db.Boolean, default=True)
     status = db.Column(db.String(20), nullable=True)  # Nullable for non-bracket formats
+    # Matches name their players through these, so load them with the match
     matches_as_player1 = db.relationship('MatchResult', 
                                        foreign_keys='MatchResult.player1_id',
-                                       backref='player1_contestant',
+                                       backref=db.backref('player1_contestant', lazy='joined'),
                                        lazy=True)
     matches_as_player2 = db.relationship('MatchResult',
                                        foreign_keys='MatchResult.player2_id',
-                                       backref='player2_contestant',
+                                       backref=db.backref('player2_contestant', lazy='joined'),
                                        lazy=True)
 
     __table_args__ = (
         db.UniqueConstraint('tournament_id', 'player', name='unique_tournament_player'),
+        db.Index('ix_contestant_tournament_active', 'tournament_id', 'active'),
+        db.Index('ix_contestant_tournament_status', 'tournament_id', 'status'),
+        db.Index('ix_contestant_player', 'player'),
+        db.Index('ix_contestant_player_id', 'player_id', 'tournament_id', unique=True),
+        db.Index('ix_contestant_standings', 'tournament_id', 'score', 'buchholz', 'sonneborn_berger'),
     )
 
+    @classmethod
+    def standings(cls, tournament_id, active_only=False):
+        """Contestants ordered by score, then Buchholz, then Sonneborn-Berger."""
+        query = cls.query.filter_by(tournament_id=tournament_id)
+        if active_only:
+            query = query.filter_by(active=True)
+        return query.order_by(
+            cls.score.desc(),
+            cls.buchholz.desc(),
+            cls.sonneborn_berger.desc(),
+            cls.player
+        )
+
     @property
     def player_matches(self):
         return self.matches_as_player1 + self.matches_as_player2
 
     def handle_match_result(self, won, is_bye=False, is_draw=False):
-        """Handle match result based on tournament format"""
-        tournament = Tournament.query.filter_by(tournament_id=self.tournament_id).first()
-        
+        """Apply a match result to this player's stats.
+
+        Elimination status comes from the bracket (see record_results).
+        Changes are left in the session; the caller commits.
+        """
         self.matches_played += 1
         if is_draw:
             self.matches_drawn += 1
@@ -185,27 +384,23 @@ class Contestant(db.Model):
             self.score += 1
         else:
             self.losses += 1
-            if tournament.is_double_elimination:
-                if self.losses == 1:
-                    self.status = PlayerStatus.LOSERS_BRACKET.value
-                else:
-                    self.status = PlayerStatus.ELIMINATED.value
-                    self.active = False
-            else:
-                self.status = PlayerStatus.ELIMINATED.value
-                self.active = False
-        db.session.commit()
+
+    def knock_out(self, eliminated):
+        """Move a player who lost an elimination match on: out, or down to the losers bracket."""
+        if eliminated:
+            self.status = PlayerStatus.ELIMINATED.value
+            self.active = False
+        else:
+            self.status = PlayerStatus.LOSERS_BRACKET.value
 
 class MatchResult(db.Model):
+    """A played match. Players are contestant ids; names are read through the contestants."""
     id = db.Column(db.Integer, primary_key=True)
     tournament_id = db.Column(db.Integer, db.ForeignKey('tournament.tournament_id'), nullable=False)
     round_number = db.Column(db.Integer, nullable=False)
     player1_id = db.Column(db.Integer, db.ForeignKey('contestant.id'), nullable=False)
     player2_id = db.Column(db.Integer, db.ForeignKey('contestant.id'), nullable=True)  # Nullable for byes
-    player1 = db.Column(db.String(80), nullable=False)
-    player2 = db.Column(db.String(80), nullable=True)  # Nullable for byes
-    winner = db.Column(db.String(80), nullable=True)
-    loser = db.Column(db.String(80), nullable=True)
+    winner_side = db.Column(db.SmallInteger, nullable=True)  # 1 or 2; None for a draw, 1 for a bye
     score = db.Column(db.String(100), nullable=True)
     is_draw = db.Column(db.Boolean, default=False)  # For Swiss/Round Robin
     status = db.Column(db.String(20), nullable=False, default='SCHEDULED')
@@ -215,155 +410,807 @@ class MatchResult(db.Model):
     __table_args__ = (
         db.CheckConstraint(
             """
-            (player2 IS NULL AND status = 'BYE' AND winner = player1 AND loser IS NULL) OR 
-            (player2 IS NOT NULL AND status != 'BYE' AND 
-             ((is_draw = true AND winner IS NULL AND loser IS NULL) OR
-              (is_draw = false AND winner IN (player1, player2) AND loser IN (player1, player2))))
+            (player2_id IS NULL AND status = 'BYE' AND winner_side = 1) OR 
+            (player2_id IS NOT NULL AND status != 'BYE' AND player2_id != player1_id AND
+             ((is_draw = true AND winner_side IS NULL) OR
+              (is_draw = false AND winner_side IN (1, 2))))
             """,
             name='valid_match_state'
         ),
+        db.Index('ix_match_result_tournament_round', 'tournament_id', 'round_number'),
+        db.Index('ix_match_result_player1', 'player1_id', 'completion_time'),
+        db.Index('ix_match_result_player2', 'player2_id', 'completion_time'),
     )
+    # One per player in the match, created and deleted with it
+    entries = db.relationship('MatchEntry', lazy=True, cascade='all, delete-orphan')
 
-def register_bye(tournament_id, player_name):
-    """Register a bye for a player in the current round."""
-    try:
-        tournament = Tournament.query.filter_by(tournament_id=tournament_id).first_or_404()
-        player = Contestant.query.filter_by(tournament_id=tournament_id, player=player_name, active=True).first_or_404()
-        
-        # Check if player already has a match in this round
-        existing_match = MatchResult.query.filter(
-            MatchResult.tournament_id == tournament_id,
-            MatchResult.round_number == tournament.current_round,
+    @hybrid_property
+    def winner_id(self):
+        return {1: self.player1_id, 2: self.player2_id}.get(self.winner_side)
+
+    @winner_id.expression
+    def winner_id(cls):
+        return db.case((cls.winner_side == 1, cls.player1_id), (cls.winner_side == 2, cls.player2_id))
+
+    @property
+    def player1(self):
+        return self.player1_contestant.player
+
+    @property
+    def player2(self):
+        return self.player2_contestant.player if self.player2_contestant is not None else None
+
+    @property
+    def winner(self):
+        if self.winner_side is None:
+            return None
+        return self.player1 if self.winner_side == 1 else self.player2
+
+    @property
+    def loser(self):
+        if self.winner_side is None or self.player2_contestant is None:
+            return None
+        return self.player2 if self.winner_side == 1 else self.player1
+
+class MatchEntry(db.Model):
+    """A player's place in a match; the database refuses a second one in the same round."""
+    match_id = db.Column(db.Integer, db.ForeignKey('match_result.id'), primary_key=True)
+    contestant_id = db.Column(db.Integer, db.ForeignKey('contestant.id'), primary_key=True)
+    tournament_id = db.Column(db.Integer, nullable=False)
+    round_number = db.Column(db.Integer, nullable=False)
+
+    __table_args__ = (
+        db.UniqueConstraint('tournament_id', 'round_number', 'contestant_id', name='unique_round_entry'),
+    )
+
+# Contestant aliases for reading match players' names in column queries (see with_match_players)
+match_player1 = db.aliased(Contestant, name='match_player1')
+match_player2 = db.aliased(Contestant, name='match_player2')
+
+MATCH_NAME_COLUMNS = {
+    'player1': match_player1.player.label('player1'),
+    'player2': match_player2.player.label('player2'),
+    'winner': db.case(
+        (MatchResult.winner_side == 1, match_player1.player),
+        (MatchResult.winner_side == 2, match_player2.player)
+    ).label('winner'),
+    'loser': db.case(
+        (MatchResult.winner_side == 1, match_player2.player),
+        (MatchResult.winner_side == 2, match_player1.player)
+    ).label('loser'),
+}
+
+def with_match_players(query):
+    """Join each match's contestants so MATCH_NAME_COLUMNS can be selected."""
+    return query.join(
+        match_player1, match_player1.id == MatchResult.player1_id
+    ).outerjoin(
+        match_player2, match_player2.id == MatchResult.player2_id
+    )
+
+def named_matches(rows, names):
+    """Turn (player1_id, player2_id, winner_id, is_draw) rows into names, via {contestant id: name}."""
+    return [
+        (names[player1_id], names.get(player2_id), names.get(winner_id), bool(is_draw))
+        for player1_id, player2_id, winner_id, is_draw in rows
+    ]
+
+class BracketMatch(db.Model):
+    """One match of an elimination bracket, laid out up front by elimination.build."""
+    id = db.Column(db.Integer, primary_key=True)
+    tournament_id = db.Column(db.Integer, db.ForeignKey('tournament.tournament_id'), nullable=False)
+    position = db.Column(db.Integer, nullable=False)
+    bracket = db.Column(db.String(1), nullable=False)  # elimination.WINNERS, LOSERS or FINALS
+    round_number = db.Column(db.Integer, nullable=False)  # Round within its bracket
+    stage = db.Column(db.Integer, nullable=False)  # Tournament round it can first be played in
+    # Contestant ids: None until decided, elimination.BYE (0) for a bye
+    player1 = db.Column(db.Integer, nullable=True)
+    player2 = db.Column(db.Integer, nullable=True)
+    winner = db.Column(db.Integer, nullable=True)
+    loser = db.Column(db.Integer, nullable=True)
+    score = db.Column(db.String(100), nullable=True)
+    state = db.Column(db.String(10), nullable=False, default=elimination.PENDING)
+    winner_to = db.Column(db.Integer, nullable=True)  # Position the winner moves to
+    winner_slot = db.Column(db.Integer, nullable=True)
+    loser_to = db.Column(db.Integer, nullable=True)  # Position the loser drops to (double elimination)
+    loser_slot = db.Column(db.Integer, nullable=True)
+    match_result_id = db.Column(db.Integer, db.ForeignKey('match_result.id'), nullable=True)
+    match_result = db.relationship('MatchResult')
+
+    __table_args__ = (
+        db.UniqueConstraint('tournament_id', 'position', name='unique_bracket_position'),
+    )
+
+class Job(db.Model):
+    """A unit of background work, run by a handler from JOB_HANDLERS (see jobs.py)."""
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(50), nullable=False)
+    key = db.Column(db.String(100), nullable=True)  # A job is not queued twice under the same key
+    payload = db.Column(db.Text, nullable=True)  # JSON keyword arguments for the handler
+    status = db.Column(db.String(20), nullable=False, default=JobStatus.QUEUED.value)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    run_at = db.Column(db.DateTime, nullable=False, default=datetime.now)  # Due time, pushed back by retries
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.now)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    worker = db.Column(db.String(200), nullable=True)
+    result = db.Column(db.Text, nullable=True)  # JSON returned by the handler
+    error = db.Column(db.Text, nullable=True)  # Why the last attempt failed
+
+    __table_args__ = (
+        db.Index('ix_job_status_run_at', 'status', 'run_at'),
+        db.Index('ix_job_key', 'key', 'status'),
+    )
+
+    @property
+    def outcome(self):
+        return json.loads(self.result) if self.result else None
+
+def load_bracket(tournament_id):
+    """The saved bracket matches of a tournament, by position (empty until it starts)."""
+    return BracketMatch.query.filter_by(tournament_id=tournament_id).order_by(BracketMatch.position).all()
+
+def bracket_with_names(tournament_id):
+    """Query for the saved bracket matches by position, each with the names of its two players."""
+    player1, player2 = db.aliased(Contestant), db.aliased(Contestant)
+    return db.session.query(BracketMatch, player1.player, player2.player).outerjoin(
+        player1, player1.id == BracketMatch.player1
+    ).outerjoin(
+        player2, player2.id == BracketMatch.player2
+    ).filter(BracketMatch.tournament_id == tournament_id).order_by(BracketMatch.position)
+
+def load_bracket_names(tournament_id):
+    """The saved bracket and {contestant id: name} for everyone placed in it, in one query."""
+    rows = bracket_with_names(tournament_id).all()
+    names = {}
+    for match, name1, name2 in rows:
+        names[match.player1] = name1
+        names[match.player2] = name2
+    return [match for match, _, _ in rows], names
+
+def is_legacy_bracket(tournament):
+    """An elimination event played before brackets were saved: it has results but no bracket rows.
+
+    Migration 11 rebuilt the bracket of every such event whose history fits
+    one. The rest are shown and run from their match history as before:
+    free pairings each round, out after one loss (two in double elimination).
+    """
+    if not tournament.is_elimination_format:
+        return False
+    tournament_id = tournament.tournament_id
+    return db.session.query(
+        db.exists().where(MatchResult.tournament_id == tournament_id)
+        & ~db.exists().where(BracketMatch.tournament_id == tournament_id)
+    ).scalar()
+
+def contestant_names(contestants):
+    """{contestant id: name}, for showing bracket matches."""
+    return {c.id: c.player for c in contestants}
+
+def seeding_key(contestant):
+    """Sort key for seeding: typed-in seeds first, then by rating on entry, then registration order.
+
+    The rating is the one the player had when they entered, so the order
+    stays fixed while the tournament runs.
+    """
+    return (
+        contestant.seed is None, contestant.seed or 0,
+        contestant.rating is None, -(contestant.rating or 0),
+        contestant.id or 0
+    )
+
+def pairing_key(contestant):
+    """Sort key for round robin and Swiss pairing: the fixed position, then seeding for anyone unplaced."""
+    return (contestant.position is None, contestant.position or 0, seeding_key(contestant))
+
+def fix_positions(contestants):
+    """Give unplaced contestants the next pairing positions in seeding order; called as results come in.
+
+    Once a contestant has a position, later seed or rating changes no longer
+    move them in the schedule.
+    """
+    next_position = max((c.position for c in contestants if c.position is not None), default=0) + 1
+    for contestant in sorted((c for c in contestants if c.position is None), key=seeding_key):
+        contestant.position = next_position
+        next_position += 1
+
+def seeded_players(contestants):
+    """Active contestant ids, best seed first (see seeding_key)."""
+    return [c.id for c in sorted((c for c in contestants if c.active), key=seeding_key)]
+
+def layout_bracket(tournament, contestants):
+    """Lay out the bracket for the current active players without saving it ([] if under 2)."""
+    players = seeded_players(contestants)
+    if len(players) < 2:
+        return []
+    return elimination.build(players, double=tournament.is_double_elimination)
+
+def start_bracket(tournament, contestants):
+    """Lay out the bracket and add it to the session; called when the first result comes in."""
+    bracket = [
+        BracketMatch(tournament_id=tournament.tournament_id, **match.as_dict())
+        for match in layout_bracket(tournament, contestants)
+    ]
+    db.session.add_all(bracket)
+    return bracket
+
+def bracket_for_view(tournament):
+    """The saved bracket, or the one the current players would get if it has not started.
+
+    Returns (bracket, {contestant id: name}).
+    """
+    bracket, names = load_bracket_names(tournament.tournament_id)
+    if bracket:
+        return bracket, names
+    if is_legacy_bracket(tournament):
+        return [], {}  # Drawn from the match history instead
+    return layout_bracket(tournament, tournament.contestants), contestant_names(tournament.contestants)
+
+def advance_bracket(tournament, contestants, bracket):
+    """Move the current round to the earliest unplayed bracket match, or finish the tournament."""
+    if not bracket:
+        return
+    stage = elimination.current_stage(bracket)
+    if stage is not None:
+        tournament.current_round = stage
+        return
+    winner = elimination.champion(bracket)
+    champion = next((c for c in contestants.values() if c.id == winner), None)
+    if champion is not None:
+        champion.status = PlayerStatus.WON.value
+    tournament.status = TournamentStatus.COMPLETED.value
+
+def load_round_state(tournament_id):
+    """Load a tournament, all its contestants (with their Player) and who has played this round in one query.
+
+    Returns (tournament, {player name: Contestant}, set of player names with a
+    match in the current round).
+    """
+    rows = db.session.query(Tournament, Contestant, MatchResult.id).outerjoin(
+        Contestant, Contestant.tournament_id == Tournament.tournament_id
+    ).outerjoin(
+        # Ratings are updated as results come in
+        Player, Player.id == Contestant.player_id
+    ).options(db.contains_eager(Contestant.profile)).outerjoin(
+        MatchResult, db.and_(
+            MatchResult.tournament_id == Tournament.tournament_id,
+            MatchResult.round_number == Tournament.current_round,
             db.or_(
-                MatchResult.player1 == player_name,
-                MatchResult.player2 == player_name
+                MatchResult.player1_id == Contestant.id,
+                MatchResult.player2_id == Contestant.id
             )
-        ).first()
+        )
+    ).filter(Tournament.tournament_id == tournament_id).all()
+    
+    if not rows:
+        abort(404)
+    
+    tournament = rows[0][0]
+    contestants = {}
+    players_with_matches = set()
+    for _, contestant, match_id in rows:
+        if contestant is None:
+            continue
+        contestants[contestant.player] = contestant
+        if match_id is not None:
+            players_with_matches.add(contestant.player)
+    
+    return tournament, contestants, players_with_matches
+
+def update_tiebreaks(contestants, scores_before, previous_matches, new_matches):
+    """Apply incremental Buchholz/Sonneborn-Berger changes for a batch of results."""
+    new_scores = {name: contestant.score or 0.0 for name, contestant in contestants.items()}
+    score_deltas = {
+        name: new_scores[name] - before
+        for name, before in scores_before.items()
+        if new_scores[name] != before
+    }
+    deltas = tiebreak_deltas(score_deltas, new_scores, previous_matches, new_matches)
+    for name, (buchholz, sonneborn_berger) in deltas.items():
+        contestant = contestants.get(name)
+        if contestant is None:
+            continue
+        contestant.buchholz = (contestant.buchholz or 0.0) + buchholz
+        contestant.sonneborn_berger = (contestant.sonneborn_berger or 0.0) + sonneborn_berger
+
+def recompute_standings(tournament_id):
+    """Rebuild every contestant's tiebreaks in a tournament from its match history."""
+    contestants = Contestant.query.filter_by(tournament_id=tournament_id).all()
+    matches = db.session.query(
+        MatchResult.player1_id, MatchResult.player2_id, MatchResult.winner_id, MatchResult.is_draw
+    ).filter_by(tournament_id=tournament_id).all()
+    tiebreaks = compute_tiebreaks({c.id: c.score or 0.0 for c in contestants}, matches)
+    for contestant in contestants:
+        contestant.buchholz, contestant.sonneborn_berger = tiebreaks.get(contestant.id, (0.0, 0.0))
+
+def count_round_progress(tournament_id, round_number):
+    """Count (expected, reported) players for a round from the contestant and match rows.
+
+    Expected players are the active ones plus anyone who withdrew after
+    reporting a result this round; byes count as a result.
+    """
+    reported = set()
+    for player1_id, player2_id in db.session.query(MatchResult.player1_id, MatchResult.player2_id).filter_by(
+        tournament_id=tournament_id, round_number=round_number
+    ):
+        reported.add(player1_id)
+        if player2_id is not None:
+            reported.add(player2_id)
+    active = {contestant_id for (contestant_id,) in db.session.query(Contestant.id).filter_by(
+        tournament_id=tournament_id, active=True
+    )}
+    return len(active | reported), len(reported)
+
+def sync_round_progress(tournament):
+    """Recount the current round's counters from the database, e.g. after the round is set by hand."""
+    tournament.round_expected, tournament.round_reported = count_round_progress(
+        tournament.tournament_id, tournament.current_round
+    )
+
+def advance_tournament(tournament, contestants, bracket=None):
+    """Apply tournament completion and round transitions in memory; the caller commits.
+
+    Non-bracket formats move on when the round counters say every player due
+    has reported, so nothing is rescanned.
+    """
+    if tournament.is_elimination_format:
+        if bracket is None:
+            bracket = load_bracket(tournament.tournament_id)
+        if bracket or not is_legacy_bracket(tournament):
+            advance_bracket(tournament, contestants, bracket)
+            return
+        # Legacy events end when one player is left
+        active = [c for c in contestants.values() if c.active]
+        if len(active) <= 1:
+            for player in active:
+                player.status = PlayerStatus.WON.value
+            tournament.status = TournamentStatus.COMPLETED.value
+            return
+    
+    if not tournament.round_complete:
+        return
+    
+    active_count = sum(1 for c in contestants.values() if c.active)
+    if not tournament.is_elimination_format and \
+            tournament.current_round >= tournament.total_rounds_needed(active_count):
+        # Set the highest scorer's status to 'Won' and others to 'Lost'
+        highest_scorer = min(contestants.values(), key=standing_key)
+        for player in contestants.values():
+            player.status = PlayerStatus.WON.value if player is highest_scorer else PlayerStatus.LOST.value
+        tournament.status = TournamentStatus.COMPLETED.value
+        return
+    
+    tournament.current_round += 1
+    tournament.start_round(active_count)
+
+def rate_players(player1, player2, score1):
+    """Update two Players' ratings for a match in which player 1 scored ``score1``."""
+    player1.rating, player2.rating = ratings.rate_match(
+        player1.rating, player1.rated_matches, player2.rating, player2.rated_matches, score1
+    )
+    player1.rated_matches += 1
+    player2.rated_matches += 1
+
+
+def rebuild_ratings():
+    """Recompute every player's rating from the full match history; returns the matches replayed."""
+    # Writing first takes SQLite's write lock, so no result can be recorded
+    # between reading the history and storing the ratings replayed from it
+    Player.query.update({'rating': ratings.DEFAULT_RATING, 'rated_matches': 0}, synchronize_session=False)
+    player1 = db.aliased(Contestant)
+    player2 = db.aliased(Contestant)
+    history = [
+        (player1_id, player2_id, 0.5 if is_draw else (1.0 if winner_side == 1 else 0.0))
+        for player1_id, player2_id, winner_side, is_draw in db.session.query(
+            player1.player_id, player2.player_id, MatchResult.winner_side, MatchResult.is_draw
+        ).join(
+            player1, player1.id == MatchResult.player1_id
+        ).join(
+            player2, player2.id == MatchResult.player2_id
+        ).order_by(MatchResult.completion_time, MatchResult.id)
+    ]
+    rated = ratings.recompute(history)
+    if rated:
+        db.session.execute(db.update(Player), [
+            {'id': player_id, 'rating': rating, 'rated_matches': count}
+            for player_id, (rating, count) in rated.items()
+        ])
+    db.session.commit()
+    player_stats_cache.bump_all()  # The summaries show ratings
+    return len(history)
+
+class ResultValidationError(ValueError):
+    """Raised when one or more submitted results do not fit the current round."""
+    def __init__(self, errors):
+        super().__init__('; '.join(errors))
+        self.errors = errors
+
+class ConcurrentWriteError(ValueError):
+    """Raised when a write keeps colliding with other writes to the same tournament."""
+
+WRITE_ATTEMPTS = 4
+WRITE_RETRY_SECONDS = 0.05  # Upper bound of the random pause before the first retry; grows per attempt
+
+def is_round_entry_conflict(error):
+    """True if an IntegrityError is the unique_round_entry constraint refusing a second match in a round."""
+    message = str(error.orig)
+    # SQLite names the columns rather than the constraint
+    return 'unique_round_entry' in message or \
+        'match_entry.tournament_id, match_entry.round_number, match_entry.contestant_id' in message
+
+def tournament_write(func):
+    """Make ``func(tournament_id, ...)`` a serialized, conflict-checked write to that tournament.
+
+    Writes to one tournament take turns within this process while other
+    tournaments' writes carry on. Between processes, the tournament's revision
+    is checked on commit: if another write committed since the read
+    (StaleDataError), or the write would give a player two matches in a round
+    (unique_round_entry), it is rolled back and run again from a fresh read.
+    Any other IntegrityError is a real constraint violation and is raised as is.
+    ``func`` must commit, and only touch caches and publish events after that.
+    """
+    @functools.wraps(func)
+    def wrapper(tournament_id, *args, **kwargs):
+        with tournament_locks.hold(tournament_id):
+            for attempt in range(1, WRITE_ATTEMPTS + 1):
+                try:
+                    return func(tournament_id, *args, **kwargs)
+                except (StaleDataError, IntegrityError) as e:
+                    db.session.rollback()
+                    if isinstance(e, IntegrityError) and not is_round_entry_conflict(e):
+                        raise
+                    if attempt == WRITE_ATTEMPTS:
+                        raise ConcurrentWriteError(
+                            'The tournament was changed by someone else at the same time. Please try again.'
+                        )
+                    time.sleep(random.uniform(0, WRITE_RETRY_SECONDS * attempt))
+    return wrapper
+
+def parse_flag(value):
+    """Interpret form, JSON and CSV truthy values ('true', '1', 'yes', True)."""
+    if isinstance(value, bool):
+        return value
+    return str(value or '').strip().lower() in ('true', '1', 'yes', 'y')
+
+def tournament_event(tournament):
+    """The round and status part of a live update."""
+    return {
+        'tournament_id': tournament.tournament_id,
+        'current_round': tournament.current_round,
+        'status': tournament.status
+    }
+
+def match_event(match):
+    """A recorded match as sent to live clients."""
+    entry = match_entry(match)
+    entry.update(
+        id=match.id,
+        loser=match.loser,
+        score=match.score,
+        completion_time=match.completion_time.strftime('%Y-%m-%d %H:%M')
+    )
+    return entry
+
+def standing_ranks(contestants):
+    """{player name: place in the standings, from 1}, tiebreaks included."""
+    return {c.player: rank for rank, c in enumerate(sorted(contestants, key=standing_key), 1)}
+
+def standing_event(contestant, rank):
+    """A contestant's standings row as sent to live clients.
+
+    ``rank`` lets clients order rows the way the server does, tiebreaks included.
+    """
+    return {
+        'player': contestant.player,
+        'rank': rank,
+        'score': contestant.score,
+        'buchholz': contestant.buchholz,
+        'sonneborn_berger': contestant.sonneborn_berger,
+        'matches_won': contestant.matches_won,
+        'matches_played': contestant.matches_played,
+        'matches_drawn': contestant.matches_drawn,
+        'active': contestant.active,
+        'status': contestant.status
+    }
+
+@tournament_write
+def record_results(tournament_id, results, expected_round=None):
+    """Validate and record a batch of results for the current round in a single transaction.
+
+    Each result is a dict with 'player1', 'player2' (empty or None for a bye),
+    'score' and 'is_draw'. Every result is checked before anything is written;
+    if any fail, a ResultValidationError listing all problems is raised and
+    nothing is recorded. Round completion is checked once, after the batch.
+    
+    In elimination formats each pair must be a ready match of the bracket,
+    which is laid out from the seeds when the first result comes in; players
+    may play ahead of the current round as soon as their opponent is known.
+    Legacy events (see is_legacy_bracket) take any pairing in the current round.
+    """
+    try:
+        tournament, contestants, players_with_matches = load_round_state(tournament_id)
+        current_round = tournament.current_round
+        errors = []
         
-        if existing_match:
-            raise ValueError(f"Player {player_name} already has a match in round {tournament.current_round}")
+        if expected_round is not None and int(expected_round) != current_round:
+            raise ResultValidationError([f"Results are for round {expected_round} but the tournament is in round {current_round}"])
         
-        # Create bye match
-        match = MatchResult(
-            tournament_id=tournament_id,
-            round_number=tournament.current_round,
-            player1_id=player.id,
-            player1=player_name,
-            status='BYE',
-            winner=player_name,
-            completion_time=datetime.now()
-        )
+        bracket = None
+        bracket_matches = []
+        if tournament.is_elimination_format:
+            bracket = load_bracket(tournament_id)
+            if bracket or not is_legacy_bracket(tournament):
+                bracket = bracket or start_bracket(tournament, contestants.values())
+                ready = elimination.player_index(bracket)
+            else:
+                bracket = None
         
-        # Update player statistics
-        player.matches_played += 1
-        player.matches_won += 1
-        player.score += 1
+        # Validate every result before touching any rows
+        outcomes = []
+        seen = set() if bracket is not None else set(players_with_matches)
+        for index, result in enumerate(results, start=1):
+            prefix = f"Result {index}: " if len(results) > 1 else ""
+            if not isinstance(result, dict):
+                errors.append(f"{prefix}Expected an object with player1, player2 and score")
+                continue
+            player1_name = str(result.get('player1') or '').strip()
+            player2_name = str(result.get('player2') or '').strip() or None
+            score = str(result.get('score') or '').strip() or None
+            is_draw = parse_flag(result.get('is_draw')) and not tournament.is_elimination_format
+            
+            # Ensure players are different
+            if player1_name == player2_name:
+                errors.append(f"{prefix}Players must be different")
+                continue
+            
+            names = [name for name in (player1_name, player2_name) if name is not None]
+            missing = [name for name in names if name not in contestants or not contestants[name].active]
+            if missing:
+                errors.append(f"{prefix}Player {', '.join(missing)} not found in tournament")
+                continue
+            
+            # Check if either player already has a match in this round
+            already = [name for name in names if name in seen]
+            if already:
+                errors.extend(f"{prefix}Player {name} already has a match in round {current_round}" for name in already)
+                continue
+            
+            if bracket is not None:
+                if player2_name is None:
+                    errors.append(f"{prefix}Byes are assigned by the bracket")
+                    continue
+                bracket_match = ready.get(contestants[player1_name].id)
+                if bracket_match is None or not elimination.is_ready(bracket_match) or \
+                        contestants[player2_name].id not in (bracket_match.player1, bracket_match.player2):
+                    errors.append(f"{prefix}{player1_name} and {player2_name} are not due to play each other")
+                    continue
+                bracket_matches.append(bracket_match)
+            seen.update(names)
+            
+            if player2_name is None:
+                outcomes.append((player1_name, None, player1_name, None, score, False))
+            elif is_draw:
+                outcomes.append((player1_name, player2_name, None, None, score, True))
+            else:
+                # Determine winner from score
+                scores = (score or '').split('-')
+                try:
+                    score1, score2 = map(int, scores)
+                except ValueError:
+                    errors.append(f"{prefix}Invalid score format. Use X-Y format (e.g., 2-1)")
+                    continue
+                if score1 > score2:
+                    outcomes.append((player1_name, player2_name, player1_name, player2_name, score, False))
+                else:
+                    outcomes.append((player1_name, player2_name, player2_name, player1_name, score, False))
         
-        db.session.add(match)
-        db.session.commit()
+        if errors:
+            raise ResultValidationError(errors)
         
-        # Get the tournament by ID
-        tournament = Tournament.query.filter_by(tournament_id=tournament_id).first()
+        # Earlier matches of everyone in the batch, for tiebreak propagation
+        batch_players = {name for outcome in outcomes for name in outcome[:2] if name is not None}
+        batch_ids = [contestants[name].id for name in batch_players]
+        previous_matches = named_matches(db.session.query(
+            MatchResult.player1_id, MatchResult.player2_id, MatchResult.winner_id, MatchResult.is_draw
+        ).filter(
+            MatchResult.tournament_id == tournament_id,
+            db.or_(MatchResult.player1_id.in_(batch_ids), MatchResult.player2_id.in_(batch_ids))
+        ), {c.id: name for name, c in contestants.items()}) if batch_ids else []
+        scores_before = {name: contestants[name].score or 0.0 for name in batch_players}
+        ranks_before = standing_ranks(contestants.values())
         
-        # Check active players
-        active_players = [c for c in tournament.contestants if c.active]
-        if len(active_players) == 1:
-            tournament.status = TournamentStatus.COMPLETED.value
-            db.session.commit()
+        completion_time = datetime.now()
+        matches = []
+        changed_positions = set()
+        for index, (player1_name, player2_name, winner, loser, score, is_draw) in enumerate(outcomes):
+            player1 = contestants[player1_name]
+            player2 = contestants[player2_name] if player2_name is not None else None
+            bracket_match = bracket_matches[index] if bracket is not None else None
+            round_number = bracket_match.stage if bracket_match is not None else current_round
+            match = MatchResult(
+                tournament_id=tournament_id,
+                round_number=round_number,
+                player1_id=player1.id,
+                player2_id=player2.id if player2 else None,
+                player1_contestant=player1,
+                player2_contestant=player2,
+                winner_side=None if winner is None else (1 if winner == player1_name else 2),
+                score=score,
+                is_draw=is_draw,
+                status='BYE' if player2 is None else 'COMPLETED',
+                completion_time=completion_time,
+                entries=[
+                    MatchEntry(contestant_id=contestant.id, tournament_id=tournament_id, round_number=round_number)
+                    for contestant in (player1, player2) if contestant is not None
+                ]
+            )
+            matches.append(match)
+            
+            # Update player statistics
+            if player2 is None:
+                player1.handle_match_result(won=True, is_bye=True)
+            elif is_draw:
+                # Both players get half a point
+                player1.handle_match_result(won=False, is_draw=True)
+                player2.handle_match_result(won=False, is_draw=True)
+            else:
+                contestants[winner].handle_match_result(won=True)
+                contestants[loser].handle_match_result(won=False)
+            if player2 is not None:
+                rate_players(player1.profile, player2.profile, 0.5 if is_draw else float(winner == player1_name))
+            
+            if bracket_match is not None:
+                positions, eliminated = elimination.record(bracket, bracket_match, contestants[winner].id, score)
+                changed_positions.update(positions)
+                contestants[loser].knock_out(eliminated)
+                bracket_match.match_result = match
+            elif tournament.is_elimination_format and loser is not None:
+                lives = 2 if tournament.is_double_elimination else 1
+                contestants[loser].knock_out(contestants[loser].losses >= lives)
         
-        # Check if round is complete
-        check_round_completion(tournament_id)
+        db.session.add_all(matches)
+        if bracket is None:
+            tournament.round_reported += len(seen) - len(players_with_matches)
+            if not tournament.is_elimination_format:
+                fix_positions(contestants.values())
+        update_tiebreaks(contestants, scores_before, previous_matches, [
+            (player1_name, player2_name, winner, is_draw)
+            for player1_name, player2_name, winner, _, _, is_draw in outcomes
+        ])
+        advance_tournament(tournament, contestants, bracket=bracket)
         
-        return True
-    except Exception as e:
+        # Build the live update before commit expires the rows; players
+        # moved in the standings by someone else's result are sent too
+        ranks = standing_ranks(contestants.values())
+        changed = [
+            c for c in contestants.values() if db.session.is_modified(c) or ranks[c.player] != ranks_before[c.player]
+        ]
+        db.session.flush()
+        event = tournament_event(tournament)
+        event['matches'] = [match_event(match) for match in matches]
+        event['standings'] = [standing_event(c, ranks[c.player]) for c in changed]
+        if bracket is not None:
+            names = contestant_names(contestants.values())
+            event['bracket'] = [bracket_entry(bracket[position], names) for position in sorted(changed_positions)]
+        
+        tournament.touch()
+        db.session.commit()
+        bracket_cache.bump(tournament_id)
+        event_broker.publish(tournament_id, 'results', event)
+        return matches
+    except Exception:
         db.session.rollback()
-        raise e
+        raise
+
+def record_result(tournament_id, player1_name, player2_name, score, is_draw=False):
+    """Record a single match result; see record_results."""
+    return record_results(tournament_id, [{
+        'player1': player1_name,
+        'player2': player2_name,
+        'score': score,
+        'is_draw': is_draw
+    }])[0]
+
+def register_bye(tournament_id, player_name):
+    """Register a bye for a player in the current round."""
+    record_results(tournament_id, [{'player1': player_name, 'player2': None}])
+    return True
 
+def read_results_csv(stream):
+    """Read results from CSV with a 'player1,player2,score,is_draw' header."""
+    reader = csv.DictReader(stream)
+    missing = {'player1', 'player2'} - set(reader.fieldnames or [])
+    if missing:
+        raise ValueError(f"CSV is missing column(s): {', '.join(sorted(missing))}")
+    return list(reader)
+
+@tournament_write
 def check_round_completion(tournament_id):
-    """Check if all players in the current round have matches and increment round if needed."""
-    tournament = Tournament.query.filter_by(tournament_id=tournament_id).first_or_404()
-    active_players = Contestant.query.filter_by(tournament_id=tournament_id, active=True).all()
-    current_round = tournament.current_round
-    
-    # Get all matches for the current round
-    current_round_matches = MatchResult.query.filter_by(
-        tournament_id=tournament_id,
-        round_number=current_round
-    ).all()
-    
-    # Count players who have matches in current round
-    players_with_matches = set()
-    for match in current_round_matches:
-        players_with_matches.add(match.player1)
-        if match.player2:  # Don't add None for byes
-            players_with_matches.add(match.player2)
-    
-    # Check if all active players have matches
-    if tournament.is_double_elimination:
-        if current_round % 2 == 1:
-            # Winners bracket round
-            # Check if all players in winners bracket have played
-            winners_players = Contestant.query.filter_by(tournament_id=tournament_id, status=PlayerStatus.WINNERS_BRACKET.value).all()
-            if all(p.player in players_with_matches for p in winners_players):
-                tournament.increment_round()
-        else:
-            # Losers bracket round
-            # Check if all players in losers bracket have played
-            losers_players = Contestant.query.filter_by(tournament_id=tournament_id, status=PlayerStatus.LOSERS_BRACKET.value).all()
-            if all(p.player in players_with_matches for p in losers_players):
-                tournament.increment_round()
-    else:
-        if active_players.count == len(players_with_matches): 
-            tournament.increment_round()
-    
-    if tournament.status == TournamentStatus.COMPLETED.value:
-        tournament.current_round -= 1
-    
-    # Update tournament
+    """Recount the current round from the match rows and increment the round if it is complete."""
+    tournament, contestants, _ = load_round_state(tournament_id)
+    if not tournament.is_elimination_format or is_legacy_bracket(tournament):
+        sync_round_progress(tournament)
+    advance_tournament(tournament, contestants)
+    event = tournament_event(tournament)
+    tournament.touch()
     db.session.commit()
+    bracket_cache.bump(tournament_id)
+    event_broker.publish(tournament_id, 'round', event)
+
+def conditional_tournament_page(view):
+    """Answer 304 Not Modified when the client's copy of a tournament page is current.
+
+    ETag and Last-Modified come from the tournament's revision, read with one
+    indexed lookup before the view runs any other query or renders anything.
+    """
+    @functools.wraps(view)
+    def wrapper(tournament_id, **kwargs):
+        revision, updated_at = db.session.query(
+            Tournament.revision, Tournament.updated_at
+        ).filter_by(tournament_id=tournament_id).first_or_404()
+        etag = f"{tournament_id}-{revision}-{current_app.config['ETAG_SALT']}"
+        last_modified = updated_at.astimezone(timezone.utc).replace(microsecond=0) if updated_at else None
+        
+        # Pending flash messages have to be rendered (base.html shows and
+        # clears them), so never short-circuit then
+        flashes = '_flashes' in session
+        if not flashes:
+            if request.if_none_match:
+                fresh = request.if_none_match.contains(etag)
+            else:
+                fresh = bool(last_modified and request.if_modified_since and last_modified <= request.if_modified_since)
+            if fresh:
+                response = Response(status=304)
+                response.set_etag(etag)
+                response.cache_control.no_cache = True
+                return response
+        
+        response = make_response(view(tournament_id, **kwargs))
+        if flashes:
+            # A copy showing the message must not be revalidated and shown again
+            response.cache_control.no_store = True
+        elif response.status_code == 200:
+            response.set_etag(etag)
+            if last_modified:
+                response.last_modified = last_modified
+            # Let browsers keep the page but check back every time
+            response.cache_control.no_cache = True
+        return response
+    return wrapper
+
+@bp.route(server.HEALTH_PATH)
+def healthz():
+    """Readiness check for launchers and load balancers: 200 once the database answers."""
+    try:
+        db.session.execute(db.text('SELECT 1'))
+    except Exception as e:
+        return jsonify({'status': 'unavailable', 'error': str(e)}), 503
+    return jsonify({
+        'status': 'ok',
+        'startup_ms': round(current_app.extensions['tourneyman']['startup_seconds'] * 1000, 1)
+    })
 
-@app.route('/')
+@bp.route('/')
 def index():
     """Home page."""
-    # Get active tournaments
-    active_tournaments = Tournament.query.filter(
-        Tournament.status.in_([TournamentStatus.PENDING.value, TournamentStatus.ACTIVE.value])
-    ).order_by(Tournament.start_date.desc()).all()
-    
-    # Get recent players (players who have participated in the last 5 tournaments)
-    recent_tournaments = Tournament.query.order_by(
-        Tournament.start_date.desc()
-    ).limit(5).all()
-    
-    recent_player_ids = set()
-    recent_players = []
-    
-    for tournament in recent_tournaments:
-        for contestant in tournament.contestants:
-            if contestant.player not in recent_player_ids:
-                recent_player_ids.add(contestant.player)
-                recent_players.append(contestant)
-    
-    # Sort players by matches played (descending)
-    recent_players.sort(key=lambda x: x.matches_played, reverse=True)
-    
+    summary = tournament_summary()
     return render_template(
         'index.html',
-        active_tournaments=active_tournaments,
-        recent_players=recent_players[:10]  # Show top 10 recent players
+        active_tournaments=summary['active'],
+        recent_players=summary['recent_players']
     )
 
-@app.route('/about')
+@bp.route('/about')
 def about():
     return render_template('about.html')
 
-@app.route('/new')
+@bp.route('/new')
 def new():
     # Set min datetime to current time
     current_time = datetime.now().strftime('%Y-%m-%dT%H:%M')
     return render_template('new.html', min_datetime=current_time)
 
-@app.route('/new/submit', methods=['POST'])
+@bp.route('/new/submit', methods=['POST'])
 def create():
     try:
         data = request.form
@@ -396,83 +1243,88 @@ def create():
         
         db.session.add(tournament)
         db.session.commit()
+        bracket_cache.bump(tournament_id)
         
-        return redirect(url_for('tournaments'))
+        return redirect(url_for('main.tournaments'))
     except Exception as e:
         return render_template('error.html', error=str(e))
 
-@app.route('/tournaments')
+@bp.route('/tournaments')
 def tournaments():
-    tournaments = Tournament.query.all()
-    current_time = datetime.now()
-    
-    # Update tournament statuses based on current time
-    for tournament in tournaments:
-        if tournament.status != TournamentStatus.COMPLETED.value and tournament.status != TournamentStatus.CANCELED.value:
-            if current_time < tournament.start_date:
-                new_status = TournamentStatus.PENDING.value
-            elif current_time <= tournament.end_date:
-                new_status = TournamentStatus.ACTIVE.value
-            else:
-                new_status = TournamentStatus.COMPLETED.value
-                
-            if new_status != tournament.status:
-                tournament.status = new_status
-    
-    tournaments = sorted(tournaments, key=lambda x: (int(x.status != TournamentStatus.ACTIVE.value), int(x.status != TournamentStatus.PENDING.value), int(x.status != TournamentStatus.COMPLETED.value), -int(round(x.start_date.timestamp()))))
-    
-    db.session.commit()
-    return render_template('tournaments.html', tournaments=tournaments)
+    """Tournament list, newest first, optionally filtered by status."""
+    status_filter = request.args.get('status', 'all')
+    if status_filter not in TOURNAMENT_LIST_FILTERS:
+        return render_template('error.html', error=f"Unknown status filter '{status_filter}'")
+    tournaments, next_cursor = tournament_page(status_filter, parse_time_cursor(request.args.get('before')))
+    return render_template(
+        'tournaments.html',
+        tournaments=tournaments,
+        status_filter=status_filter,
+        status_counts=tournament_summary()['counts'],
+        next_cursor=next_cursor,
+        is_first_page=not request.args.get('before')
+    )
 
-@app.route('/tournaments/<int:tournament_id>')
+@bp.route('/tournaments/<int:tournament_id>')
+@conditional_tournament_page
 def tournament_details(tournament_id):
-    tournament = Tournament.query.filter_by(tournament_id=tournament_id).first_or_404()
-    return render_template('tournament_details.html', tournament=tournament)
+    tournament = Tournament.query.options(
+        selectinload(Tournament.contestants)
+    ).filter_by(tournament_id=tournament_id).first_or_404()
+    matches = MatchResult.query.filter_by(tournament_id=tournament_id).order_by(
+        MatchResult.completion_time.desc()
+    ).all()
+    return render_template('tournament_details.html', tournament=tournament, matches=matches)
 
-@app.route('/tournaments/<int:tournament_id>/add_player')
+@bp.route('/tournaments/<int:tournament_id>/add_player')
 def add_player_page(tournament_id):
     tournament = Tournament.query.filter_by(tournament_id=tournament_id).first_or_404()
     return render_template('add_player.html', tournament=tournament)
 
-@app.route('/tournaments/<int:tournament_id>/add_players', methods=['GET', 'POST'])
+@bp.route('/tournaments/<int:tournament_id>/add_players', methods=['GET', 'POST'])
 def add_players(tournament_id):
+    """Enter many players at once: returning players by checkbox, new ones one name per line."""
     tournament = Tournament.query.filter_by(tournament_id=tournament_id).first_or_404()
     
     if request.method == 'POST':
-        # Logic to add players to the tournament
-        player_ids = request.form.getlist('player_ids')
-        for player_id in player_ids:
-            player = Contestant.query.get(player_id)
-            if player:
-                player.tournament_id = tournament_id  # Associate player with tournament
-                db.session.add(player)
-        db.session.commit()
-        flash('Players added successfully.')
-        return redirect(url_for('tournament_details', tournament_id=tournament_id))
+        try:
+            player_ids = set()
+            for value in request.form.getlist('player_ids'):
+                try:
+                    player_ids.add(int(value))
+                except ValueError:
+                    raise ValueError(f"Invalid player id '{value}'")
+            names = [name.strip() for name in request.form.get('names', '').splitlines() if name.strip()]
+            added = add_contestants(tournament_id, player_ids, names)
+            flash(f'Added {len(added)} player(s).', 'success')
+            return redirect(url_for('main.tournament_details', tournament_id=tournament_id))
+        except Exception as e:
+            db.session.rollback()
+            return render_template('error.html', error=str(e))
     
-    # Get existing players
-    existing_players = Contestant.query.filter_by(tournament_id=None).all()  # Players not in any tournament
-    return render_template('add_players.html', tournament=tournament, players=existing_players)
+    query = request.args.get('q', '').strip()
+    players = search_players(query, limit=RETURNING_PLAYERS_LIMIT, exclude_tournament=tournament_id) \
+        if query else returning_players(tournament_id)
+    return render_template('add_players.html', tournament=tournament, players=players, query=query)
 
-@app.route('/tournaments/<int:tournament_id>/players')
+@bp.route('/tournaments/<int:tournament_id>/players')
+@conditional_tournament_page
 def player_list(tournament_id):
     tournament = Tournament.query.filter_by(tournament_id=tournament_id).first_or_404()
     players = Contestant.query.filter_by(tournament_id=tournament_id).all()
     return render_template('player_list.html', tournament=tournament, players=players)
 
-@app.route('/tournaments/<int:tournament_id>/match_management')
+@bp.route('/tournaments/<int:tournament_id>/match_management')
 def match_management(tournament_id):
     """Match management page."""
     tournament = Tournament.query.filter_by(tournament_id=tournament_id).first_or_404()
     
-    # Get active players
+    # Active players in name order for the player selects, and pre-sorted standings
     active_players = Contestant.query.filter_by(
         tournament_id=tournament_id,
         active=True
-    ).all()
-    
-    # Sort players alphabetically
-    active_players.sort(key=lambda x: x.player.lower())
+    ).order_by(db.func.lower(Contestant.player)).all()
+    standings = Contestant.standings(tournament_id, active_only=True).all()
     
     # Create serializable player data for JavaScript
     serializable_players = []
@@ -487,311 +1339,1332 @@ def match_management(tournament_id):
             'matches_drawn': contestant.matches_drawn or 0  # Handle None values
         })
     
+    # Scheduled pairings for the current round (round robin only)
+    scheduled_pairings = tournament.get_round_robin_pairings() if tournament.is_round_robin else None
+    
+    # Bracket matches whose players are both known and still to play (elimination only)
+    ready_matches = None
+    if tournament.is_elimination_format:
+        bracket, names = bracket_for_view(tournament)
+        ready_matches = [bracket_entry(match, names) for match in bracket if elimination.is_ready(match)]
+    
     return render_template(
         'match_management.html',
         tournament=tournament,
         active_players=active_players,  # For template rendering
         players=serializable_players,
+        standings=standings,
+        scheduled_pairings=scheduled_pairings,
+        ready_matches=ready_matches,
         bracket='winners'  # Default to winners bracket
     )
 
-@app.route('/tournaments/<int:tournament_id>/recent_matches')
+@bp.route('/tournaments/<int:tournament_id>/recent_matches')
+@conditional_tournament_page
 def recent_matches(tournament_id):
+    # Read before the data, so an event published meanwhile is replayed rather than missed
+    last_event_id = event_broker.last_event_id(tournament_id)
     tournament = Tournament.query.filter_by(tournament_id=tournament_id).first_or_404()
     matches = MatchResult.query.filter_by(tournament_id=tournament_id).order_by(MatchResult.id.desc()).limit(10).all()
-    return render_template('recent_matches.html', tournament=tournament, matches=matches)
+    return render_template('recent_matches.html', tournament=tournament, matches=matches, last_event_id=last_event_id)
 
-@app.route('/tournaments/<int:tournament_id>/update')
+@bp.route('/tournaments/<int:tournament_id>/update')
 def update_tournament_page(tournament_id):
     tournament = Tournament.query.filter_by(tournament_id=tournament_id).first_or_404()
     return render_template('update_tournament.html', tournament=tournament)
 
-@app.route('/tournaments/<int:tournament_id>/add_player', methods=['POST'])
+@bp.route('/tournaments/<int:tournament_id>/add_player', methods=['POST'])
 def add_player(tournament_id):
     try:
-        tournament = Tournament.query.filter_by(tournament_id=tournament_id).first_or_404()
-        
-        player = Contestant(
-            player=request.form['player'],
-            seed=request.form.get('seed'),
-            tournament_id=tournament_id
-        )
-
-        if tournament.is_double_elimination:
-            player.status = PlayerStatus.WINNERS_BRACKET.value
-        else:
-            player.status = PlayerStatus.ACTIVE.value
-
-        db.session.add(player)
-        db.session.commit()
-        
-        return redirect(url_for('tournament_details', tournament_id=tournament_id))
+        player_name = request.form['player'].strip()
+        if not player_name:
+            raise ValueError("Player name is required")
+        add_contestant(tournament_id, player_name, seed=request.form.get('seed') or None)
+        return redirect(url_for('main.tournament_details', tournament_id=tournament_id))
     except Exception as e:
         return render_template('error.html', error=str(e))
 
-@app.route('/tournaments/<int:tournament_id>/remove_player', methods=['POST'])
+@bp.route('/tournaments/<int:tournament_id>/remove_player', methods=['POST'])
 def remove_player(tournament_id):
     try:
         player_name = request.form['player']
         reason = request.form['reason']
-        
-        player = Contestant.query.filter_by(
-            tournament_id=tournament_id,
-            player=player_name
-        ).first_or_404()
-        
-        # Set player as inactive instead of deleting
-        player.active = False
-        player.status = PlayerStatus.WITHDRAWN.value
-        
-        # Get the tournament by ID
-        tournament = Tournament.query.filter_by(tournament_id=tournament_id).first()
-        
+        withdraw_player(tournament_id, player_name)
+        return redirect(url_for('main.tournament_details', tournament_id=tournament_id))
+    except Exception as e:
+        return render_template('error.html', error=str(e))
+
+@tournament_write
+def withdraw_player(tournament_id, player_name):
+    """Withdraw a player, advancing the round or bracket if they were all it was waiting for."""
+    player = Contestant.query.filter_by(
+        tournament_id=tournament_id,
+        player=player_name
+    ).first_or_404()
+    
+    # Get the tournament by ID
+    tournament = Tournament.query.filter_by(tournament_id=tournament_id).first()
+    bracket = load_bracket(tournament_id) if tournament.is_elimination_format else []
+    # Non-bracket formats and legacy elimination events (see is_legacy_bracket) count rounds
+    counts_rounds = not bracket and (not tournament.is_elimination_format or is_legacy_bracket(tournament))
+    
+    if player.active and counts_rounds:
+        # A player who has not reported this round is no longer due to
+        reported = db.session.query(MatchResult.id).filter(
+            MatchResult.tournament_id == tournament_id,
+            MatchResult.round_number == tournament.current_round,
+            db.or_(MatchResult.player1_id == player.id, MatchResult.player2_id == player.id)
+        ).first() is not None
+        if not reported:
+            tournament.round_expected -= 1
+    
+    # Set player as inactive instead of deleting
+    player.active = False
+    player.status = PlayerStatus.WITHDRAWN.value
+    
+    contestants = {c.player: c for c in tournament.contestants}
+    changed_positions = set()
+    if bracket:
+        # Their opponent advances on a walkover
+        changed_positions = elimination.withdraw(bracket, player.id)
+        advance_bracket(tournament, contestants, bracket)
+    else:
         # Check active players
         active_players = [c for c in tournament.contestants if c.active]
         if len(active_players) == 1:
             tournament.status = TournamentStatus.COMPLETED.value
-        
-        db.session.commit()
-        
-        return redirect(url_for('tournament_details', tournament_id=tournament_id))
-    except Exception as e:
-        return render_template('error.html', error=str(e))
+        elif counts_rounds:
+            # They may have been the last player the round was waiting for
+            advance_tournament(tournament, contestants)
+    
+    event = tournament_event(tournament)
+    event['standings'] = [standing_event(player, standing_ranks(contestants.values())[player.player])]
+    if bracket:
+        names = contestant_names(contestants.values())
+        event['bracket'] = [bracket_entry(bracket[position], names) for position in sorted(changed_positions)]
+    tournament.touch()
+    db.session.commit()
+    bracket_cache.bump(tournament_id)
+    event_broker.publish(tournament_id, 'withdrawal', event)
 
-@app.route('/tournaments/<int:tournament_id>/submit_result', methods=['POST'])
+@bp.route('/tournaments/<int:tournament_id>/submit_result', methods=['POST'])
 def submit_result(tournament_id):
     try:
-        tournament = Tournament.query.filter_by(tournament_id=tournament_id).first_or_404()
         data = request.form
-        
-        # Ensure players are different
-        if data['player1'] == data['player2']:
-            raise ValueError("Players must be different")
-        
-        # Check if either player already has a match in this round
-        current_round = tournament.current_round
-        for player in [data['player1'], data['player2']]:
-            existing_match = MatchResult.query.filter(
-                MatchResult.tournament_id == tournament_id,
-                MatchResult.round_number == current_round,
-                db.or_(
-                    MatchResult.player1 == player,
-                    MatchResult.player2 == player
-                )
-            ).first()
-            
-            if existing_match:
-                raise ValueError(f"Player {player} already has a match in round {current_round}")
-        
-        # Get player IDs
-        player1 = Contestant.query.filter_by(player=data['player1'], tournament_id=tournament_id).first()
-        player2 = Contestant.query.filter_by(player=data['player2'], tournament_id=tournament_id).first()
-        
-        if not player1 or not player2:
-            raise ValueError("One or both players not found in tournament")
-        
-        # Handle draws for non-elimination formats
-        is_draw = False
-        if not tournament.is_elimination_format and data.get('is_draw') == 'true':
-            is_draw = True
-            winner = None
-            loser = None
-        else:
-            # Determine winner from score
-            scores = data['score'].split('-')
-            if len(scores) != 2:
-                raise ValueError("Invalid score format. Use X-Y format (e.g., 2-1)")
-                
-            score1, score2 = map(int, scores)
-            winner = data['player1'] if score1 > score2 else data['player2']
-            loser = data['player2'] if score1 > score2 else data['player1']
-        
-        # Create match result
-        match = MatchResult(
-            tournament_id=tournament_id,
-            round_number=current_round,
-            player1_id=player1.id,
-            player2_id=player2.id,
-            player1=player1.player,  # Use string value instead of Contestant object
-            player2=player2.player,  # Use string value instead of Contestant object
-            winner=winner,
-            loser=loser,
-            score=data['score'],
-            is_draw=is_draw,
-            status='COMPLETED',
-            completion_time=datetime.now()
+        record_result(
+            tournament_id,
+            data['player1'],
+            data['player2'],
+            data.get('score'),
+            is_draw=data.get('is_draw') == 'true'
         )
-        
-        # Update player statistics
-        if is_draw:
-            # Both players get half a point
-            player1.handle_match_result(won=False, is_draw=True)
-            player2.handle_match_result(won=False, is_draw=True)
+        return redirect(url_for('main.tournament_details', tournament_id=tournament_id))
+    except Exception as e:
+        return render_template('error.html', error=str(e))
+
+@bp.route('/tournaments/<int:tournament_id>/results/bulk', methods=['POST'])
+def submit_results_bulk(tournament_id):
+    """Record a whole round at once.
+
+    Accepts JSON ({"round": N, "results": [{"player1", "player2", "score", "is_draw"}, ...]})
+    or a CSV body (Content-Type: text/csv) with the same columns.
+    """
+    try:
+        if request.mimetype == 'text/csv':
+            results = read_results_csv(io.StringIO(request.get_data(as_text=True)))
+            expected_round = request.args.get('round')
         else:
-            # Update winner
-            winner_obj = player1 if winner == player1.player else player2
-            winner_obj.handle_match_result(won=True)
-            
-            # Update loser
-            loser_obj = player2 if winner == player1.player else player1
-            loser_obj.handle_match_result(won=False)
+            data = request.get_json(silent=True)
+            if isinstance(data, list):
+                data = {'results': data}
+            if not isinstance(data, dict) or not isinstance(data.get('results'), list):
+                raise ResultValidationError(["Expected a JSON object with a 'results' list"])
+            results = data['results']
+            expected_round = data.get('round')
         
-        db.session.add(match)
+        matches = record_results(tournament_id, results, expected_round=expected_round)
+    except ResultValidationError as e:
+        return jsonify({'errors': e.errors}), 400
+    except ConcurrentWriteError as e:
+        return jsonify({'errors': [str(e)]}), 409
+    except ValueError as e:
+        return jsonify({'errors': [str(e)]}), 400
+    
+    tournament = Tournament.query.filter_by(tournament_id=tournament_id).first()
+    return jsonify({
+        'recorded': len(matches),
+        'current_round': tournament.current_round,
+        'status': tournament.status
+    })
+
+MATCH_HISTORY_PAGE_SIZE = 50
+TOURNAMENT_PAGE_SIZE = 24
+TOURNAMENT_SUMMARY_TTL = 60  # Seconds; bounds staleness from writes made by other processes
+FINAL_STATUSES = (TournamentStatus.COMPLETED.value, TournamentStatus.CANCELED.value)
+# Filter name -> status it shows, in the order the list page offers them
+TOURNAMENT_LIST_FILTERS = {
+    'all': None,
+    'active': TournamentStatus.ACTIVE.value,
+    'pending': TournamentStatus.PENDING.value,
+    'completed': TournamentStatus.COMPLETED.value,
+    'canceled': TournamentStatus.CANCELED.value
+}
+
+def effective_status(now):
+    """SQL expression for a tournament's status as of ``now``.
+
+    Completed and canceled are final; otherwise the dates decide, exactly as
+    when the stored status was rewritten on every list view.
+    """
+    return db.case(
+        (Tournament.status.in_(FINAL_STATUSES), Tournament.status),
+        (Tournament.start_date > now, TournamentStatus.PENDING.value),
+        (db.or_(Tournament.end_date.is_(None), Tournament.end_date >= now), TournamentStatus.ACTIVE.value),
+        else_=TournamentStatus.COMPLETED.value
+    )
+
+def status_condition(status, now):
+    """SQL condition for tournaments whose effective status is ``status``."""
+    open_ = Tournament.status.notin_(FINAL_STATUSES)
+    if status == TournamentStatus.PENDING.value:
+        return db.and_(open_, Tournament.start_date > now)
+    if status == TournamentStatus.ACTIVE.value:
+        return db.and_(open_, Tournament.start_date <= now,
+                       db.or_(Tournament.end_date.is_(None), Tournament.end_date >= now))
+    if status == TournamentStatus.COMPLETED.value:
+        return db.or_(Tournament.status == status, db.and_(open_, Tournament.end_date < now))
+    return Tournament.status == status
+
+def tournament_page(status_filter, before=None, limit=TOURNAMENT_PAGE_SIZE):
+    """One page of the tournament list, newest first, using keyset pagination.
+
+    Returns ([(tournament, effective status)], cursor for the next page or None).
+    """
+    now = datetime.now()
+    query = db.session.query(Tournament, effective_status(now)).options(selectinload(Tournament.contestants))
+    if TOURNAMENT_LIST_FILTERS[status_filter] is not None:
+        query = query.filter(status_condition(TOURNAMENT_LIST_FILTERS[status_filter], now))
+    if before is not None:
+        before_date, before_id = before
+        query = query.filter(db.or_(
+            Tournament.start_date < before_date,
+            db.and_(Tournament.start_date == before_date, Tournament.id < before_id)
+        ))
+    rows = query.order_by(Tournament.start_date.desc(), Tournament.id.desc()).limit(limit + 1).all()
+    
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1][0]
+        next_cursor = f"{last.start_date.isoformat()}_{last.id}"
+    return rows, next_cursor
+
+def tournament_summary():
+    """Status counts, open tournaments and recent players, cached across requests.
+
+    The entry is dropped on any tournament write and expires when the next
+    tournament starts or ends, since that changes effective statuses.
+    """
+    summary = tournament_summary_cache.get()
+    if summary is not None:
+        return summary
+    generation = tournament_summary_cache.generation()
+    now = datetime.now()
+    status = effective_status(now)
+    
+    counts = dict.fromkeys(TOURNAMENT_LIST_FILTERS, 0)
+    for value, count in db.session.query(status, db.func.count()).group_by(status):
+        counts['all'] += count
+        for name, filter_status in TOURNAMENT_LIST_FILTERS.items():
+            if filter_status == value:
+                counts[name] += count
+    
+    active = [
+        {'tournament_id': tid, 'name': name, 'tFormat': tformat, 'status': value, 'start_date': start_date}
+        for tid, name, tformat, value, start_date in db.session.query(
+            Tournament.tournament_id, Tournament.name, Tournament.tFormat, status, Tournament.start_date
+        ).filter(db.or_(
+            status_condition(TournamentStatus.ACTIVE.value, now),
+            status_condition(TournamentStatus.PENDING.value, now)
+        )).order_by(Tournament.start_date.desc(), Tournament.id.desc())
+    ]
+    
+    # Players of the 5 most recent tournaments, most matches played first
+    recent_ids = db.session.query(Tournament.tournament_id).order_by(
+        Tournament.start_date.desc(), Tournament.id.desc()
+    ).limit(5).scalar_subquery()
+    # Each player's entry in the latest of those they played in
+    entries = db.session.query(
+        Player.name, Contestant.matches_played, Contestant.matches_won,
+        db.func.row_number().over(
+            partition_by=Contestant.player_id,
+            order_by=(Tournament.start_date.desc(), Tournament.id.desc())
+        ).label('latest')
+    ).join(Player, Player.id == Contestant.player_id).join(
+        Tournament, Tournament.tournament_id == Contestant.tournament_id
+    ).filter(Contestant.tournament_id.in_(recent_ids)).subquery()
+    recent_players = [
+        {'player': name, 'matches_played': played or 0, 'matches_won': won or 0}
+        for name, played, won in db.session.query(
+            entries.c.name, entries.c.matches_played, entries.c.matches_won
+        ).filter(entries.c.latest == 1).order_by(entries.c.matches_played.desc(), entries.c.name).limit(10)
+    ]
+    
+    # Effective statuses next change when an open tournament starts or ends
+    next_change = db.session.query(db.func.min(db.case(
+        (Tournament.start_date > now, Tournament.start_date), else_=Tournament.end_date
+    ))).filter(
+        Tournament.status.notin_(FINAL_STATUSES),
+        db.or_(Tournament.start_date > now, Tournament.end_date >= now)
+    ).scalar()
+    
+    summary = {
+        'counts': counts,
+        'active': active,
+        'recent_players': recent_players
+    }
+    tournament_summary_cache.store(generation, summary, expires_at=next_change.timestamp() if next_change else None)
+    return summary
+
+def refresh_tournament_statuses():
+    """Store the date-based status of every open tournament; returns the ids that changed.
+
+    Pages compute the status in SQL, so this only keeps the stored column
+    (used by the detail pages and the API) in step.
+    """
+    now = datetime.now()
+    status = effective_status(now)
+    changed = [tid for (tid,) in db.session.query(Tournament.tournament_id).filter(
+        Tournament.status.notin_(FINAL_STATUSES), Tournament.status != status
+    )]
+    if changed:
+        Tournament.query.filter(Tournament.tournament_id.in_(changed)).update(
+            {'status': status, 'revision': Tournament.revision + 1, 'updated_at': now}, synchronize_session=False
+        )
         db.session.commit()
-        
-        # Check for tournament end conditions
-        if tournament.is_elimination_format:
-            active_players = Contestant.query.filter_by(tournament_id=tournament_id, active=True).all()
-            if len(active_players) == 1:
-                # Set the remaining player's status to 'Won'
-                active_players[0].status = PlayerStatus.WON.value
-                tournament.status = TournamentStatus.COMPLETED.value
-                db.session.commit()
-        else:
-            if tournament.current_round > tournament.total_rounds_needed:
-                # Set the highest scorer's status to 'Won' and others to 'Lost'
-                highest_scorer = max(tournament.contestants, key=lambda p: p.score)
-                highest_scorer.status = PlayerStatus.WON.value
-                for player in tournament.contestants:
-                    if player != highest_scorer:
-                        player.status = PlayerStatus.LOST.value
-                tournament.status = TournamentStatus.COMPLETED.value
-                db.session.commit()
-        
-        # Check if round is complete and increment if needed
-        check_round_completion(tournament_id)
-        
-        return redirect(url_for('tournament_details', tournament_id=tournament_id))
+        for tournament_id in changed:
+            bracket_cache.bump(tournament_id)
+    return changed
+
+# Background jobs (see jobs.py). Handlers take the job's payload as keyword
+# arguments, commit their own writes and return a JSON-able result.
+JOB_HANDLERS = {}
+JOB_PAGE_SIZE = 50
+
+def job_handler(name):
+    def register(func):
+        JOB_HANDLERS[name] = func
+        return func
+    return register
+
+def enqueue_job(name, key=None, delay=0, **payload):
+    """Queue a job in the current session; it is committed with the write that needs it.
+
+    While a job with the same ``key`` is still queued, that job is returned
+    instead, so a burst of writes leaves one job to do the follow-up work.
+    """
+    if name not in JOB_HANDLERS:
+        raise ValueError(f"Unknown job '{name}'")
+    if key is not None:
+        queued = Job.query.filter_by(key=key, status=JobStatus.QUEUED.value).first()
+        if queued is not None:
+            return queued
+    job = Job(
+        name=name,
+        key=key,
+        payload=json.dumps(payload) if payload else None,
+        run_at=datetime.now() + timedelta(seconds=delay)
+    )
+    db.session.add(job)
+    return job
+
+def schedule_job(name):
+    """Queue a periodic job from JOB_SCHEDULE, unless one is already waiting."""
+    enqueue_job(name, key=name)
+    db.session.commit()
+
+def claim_job(worker):
+    """Mark the next due job as running and return (id, name, payload, attempts), or None."""
+    now = datetime.now()
+    due = db.session.query(Job.id).filter(
+        Job.status == JobStatus.QUEUED.value, Job.run_at <= now
+    ).order_by(Job.run_at, Job.id).limit(1).scalar_subquery()
+    # One statement, so two workers can never claim the same job
+    claimed = db.session.execute(
+        db.update(Job.__table__).where(
+            Job.id == due, Job.status == JobStatus.QUEUED.value
+        ).values(
+            status=JobStatus.RUNNING.value, attempts=Job.attempts + 1, started_at=now, worker=worker
+        ).returning(Job.id, Job.name, Job.payload, Job.attempts)
+    ).first()
+    db.session.commit()
+    return claimed
+
+def run_next_job(worker):
+    """Claim and run one due job, retrying it later if it fails; returns False if none was due."""
+    claimed = claim_job(worker)
+    if claimed is None:
+        return False
+    job_id, name, payload, attempts = claimed
+    try:
+        result = JOB_HANDLERS[name](**(json.loads(payload) if payload else {}))
     except Exception as e:
-        return render_template('error.html', error=str(e))
+        db.session.rollback()
+        current_app.logger.exception('Job %s (%s) failed on attempt %s', job_id, name, attempts)
+        now = datetime.now()
+        values = {'error': f'{type(e).__name__}: {e}', 'worker': None}
+        if attempts < current_app.config['JOB_MAX_ATTEMPTS']:
+            delay = jobs.retry_delay(attempts, current_app.config['JOB_RETRY_SECONDS'])
+            values.update(status=JobStatus.QUEUED.value, run_at=now + timedelta(seconds=delay))
+        else:
+            values.update(status=JobStatus.FAILED.value, finished_at=now)
+    else:
+        values = {
+            'status': JobStatus.DONE.value,
+            'result': json.dumps(result) if result is not None else None,
+            'error': None,
+            'finished_at': datetime.now()
+        }
+    Job.query.filter_by(id=job_id).update(values, synchronize_session=False)
+    db.session.commit()
+    return True
 
-@app.route('/player/<player_name>')
-def player_stats(player_name):
-    """View player statistics."""
-    # Get all tournaments and matches for the player
-    player_tournaments = db.session.query(Tournament).join(
+def run_due_jobs(worker=None):
+    """Run jobs until none is due; returns how many ran."""
+    worker = worker or jobs.worker_name()
+    count = 0
+    while run_next_job(worker):
+        count += 1
+    return count
+
+def count_jobs(status):
+    return db.session.query(db.func.count(Job.id)).filter(Job.status == status).scalar()
+
+def start_job_runner(app):
+    """Start the app's worker and scheduler threads; returns the runner, or None if JOB_WORKERS is 0."""
+    if not app.config['JOB_WORKERS']:
+        return None
+    runner = jobs.JobRunner(app, run_next_job, schedule_job)
+    runner.start()
+    return runner
+
+def export_dir():
+    return current_app.config.get('EXPORT_DIR') or os.path.join(current_app.instance_path, 'exports')
+
+@job_handler('update_statuses')
+def update_statuses_job():
+    return {'changed': len(refresh_tournament_statuses())}
+
+@job_handler('rebuild_ratings')
+def rebuild_ratings_job():
+    return {'matches': rebuild_ratings()}
+
+@job_handler('clear_canceled_tournament')
+@tournament_write
+def clear_canceled_tournament(tournament_id):
+    """Delete a canceled tournament's bracket and matches, then replay ratings without them."""
+    tournament = Tournament.query.filter_by(tournament_id=tournament_id).first()
+    if tournament is None or tournament.status != TournamentStatus.CANCELED.value:
+        return {'deleted': 0}
+    BracketMatch.query.filter_by(tournament_id=tournament_id).delete()
+    MatchEntry.query.filter_by(tournament_id=tournament_id).delete()
+    deleted = MatchResult.query.filter_by(tournament_id=tournament_id).delete()
+    if deleted:
+        enqueue_job('rebuild_ratings', key='rebuild_ratings')
+    tournament.touch()
+    db.session.commit()
+    bracket_cache.bump(tournament_id)
+    # Matches were deleted, so live pages reload rather than patch
+    event_broker.publish(tournament_id, 'reset', {})
+    return {'deleted': deleted}
+
+@job_handler('export_results')
+def export_results(tournament_id):
+    """Write a tournament's results to a CSV file that import-results reads back; returns its name."""
+    revision = db.session.query(Tournament.revision).filter_by(tournament_id=tournament_id).scalar()
+    if revision is None:
+        raise ValueError(f'Tournament {tournament_id} not found')
+    directory = export_dir()
+    os.makedirs(directory, exist_ok=True)
+    # Named after the revision, so a retry or a repeat export of an unchanged tournament reuses the file
+    file_name = f'results-{tournament_id}-{revision}.csv'
+    path = os.path.join(directory, file_name)
+    if not os.path.exists(path):
+        rows = with_match_players(db.session.query(
+            MatchResult.round_number, MATCH_NAME_COLUMNS['player1'], MATCH_NAME_COLUMNS['player2'],
+            MatchResult.score, MatchResult.is_draw
+        )).filter(MatchResult.tournament_id == tournament_id).order_by(MatchResult.id).yield_per(1000)
+        partial = f'{path}.{os.getpid()}.part'
+        with open(partial, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['round', 'player1', 'player2', 'score', 'is_draw'])
+            for round_number, player1, player2, score, is_draw in rows:
+                writer.writerow([round_number, player1, player2 or '', score or '', 'true' if is_draw else ''])
+        os.replace(partial, path)  # Never serve a half-written file
+    return {'file': file_name}
+
+@job_handler('clean_up_jobs')
+def clean_up_jobs():
+    """Requeue jobs whose worker went away, and delete finished jobs and exports past retention."""
+    config = current_app.config
+    now = datetime.now()
+    stale = Job.query.filter(
+        Job.status == JobStatus.RUNNING.value,
+        Job.started_at < now - timedelta(seconds=config['JOB_TIMEOUT'])
+    )
+    failed = stale.filter(Job.attempts >= config['JOB_MAX_ATTEMPTS']).update(
+        {'status': JobStatus.FAILED.value, 'error': 'Timed out', 'finished_at': now}, synchronize_session=False
+    )
+    requeued = stale.update(
+        {'status': JobStatus.QUEUED.value, 'error': 'Timed out', 'worker': None, 'run_at': now},
+        synchronize_session=False
+    )
+    cutoff = now - timedelta(days=config['JOB_RETENTION_DAYS'])
+    deleted = Job.query.filter(
+        Job.status.in_([JobStatus.DONE.value, JobStatus.FAILED.value]), Job.finished_at < cutoff
+    ).delete(synchronize_session=False)
+    db.session.commit()
+    
+    directory = export_dir()
+    if os.path.isdir(directory):
+        for entry in os.scandir(directory):
+            if entry.is_file() and entry.stat().st_mtime < cutoff.timestamp():
+                os.remove(entry.path)
+    return {'requeued': requeued, 'failed': failed, 'deleted': deleted}
+
+PLAYER_SEARCH_LIMIT = 10
+RETURNING_PLAYERS_LIMIT = 200
+RETURNING_PLAYERS_TOURNAMENTS = 20  # How far back the add players page looks
+
+def register_players(names):
+    """The Player for each name, registering any that are new; returns {name: Player}."""
+    names = set(names)
+    if not names:
+        return {}
+    players = {player.name: player for player in Player.query.filter(Player.name.in_(names))}
+    missing = names - players.keys()
+    if missing:
+        db.session.execute(db.insert(Player), [{'name': name, 'name_key': player_key(name)} for name in missing])
+        players.update((player.name, player) for player in Player.query.filter(Player.name.in_(missing)))
+    return players
+
+def enter_players(tournament, player_ids):
+    """Enter registered players into a tournament with a single INSERT ... SELECT.
+
+    Players already in the tournament are skipped. Returns the names added;
+    the caller commits.
+    """
+    if not player_ids:
+        return []
+    status = PlayerStatus.WINNERS_BRACKET.value if tournament.is_double_elimination else PlayerStatus.ACTIVE.value
+    entered = db.select(Contestant.player_id).where(Contestant.tournament_id == tournament.tournament_id)
+    names = db.session.execute(
+        db.insert(Contestant).from_select(
+            ['player', 'player_id', 'rating', 'tournament_id', 'status'],
+            db.select(
+                Player.name, Player.id, Player.rating, db.literal(tournament.tournament_id), db.literal(status)
+            ).where(Player.id.in_(player_ids), Player.id.notin_(entered))
+        ).returning(Contestant.player)
+    ).scalars().all()
+    if names and not tournament.is_elimination_format:
+        # New players are due a result in the current round
+        tournament.round_expected += len(names)
+    return names
+
+def open_for_entries(tournament_id):
+    """The tournament, if players may still join it."""
+    tournament = Tournament.query.filter_by(tournament_id=tournament_id).first_or_404()
+    if tournament.is_elimination_format and (load_bracket(tournament_id) or is_legacy_bracket(tournament)):
+        raise ValueError("Players cannot join once the bracket has started")
+    return tournament
+
+@tournament_write
+def add_contestant(tournament_id, player_name, seed=None):
+    """Enter one player by name, registering them if they are new."""
+    tournament = open_for_entries(tournament_id)
+    profile = register_players([player_name])[player_name]
+    if db.session.query(Contestant.id).filter_by(tournament_id=tournament_id, player_id=profile.id).first():
+        raise ValueError(f"Player {player_name} is already in this tournament")
+    player = Contestant(
+        player=player_name,
+        player_id=profile.id,
+        rating=profile.rating,
+        seed=seed,
+        tournament_id=tournament_id
+    )
+
+    if tournament.is_double_elimination:
+        player.status = PlayerStatus.WINNERS_BRACKET.value
+    else:
+        player.status = PlayerStatus.ACTIVE.value
+    if not tournament.is_elimination_format:
+        # New players are due a result in the current round
+        tournament.round_expected += 1
+
+    db.session.add(player)
+    tournament.touch()
+    db.session.commit()
+    bracket_cache.bump(tournament_id)
+    player_stats_cache.bump_player(player_name)
+
+@tournament_write
+def add_contestants(tournament_id, player_ids, names):
+    """Enter registered players by id and any number by name; returns the names added."""
+    tournament = open_for_entries(tournament_id)
+    player_ids = set(player_ids)
+    player_ids.update(player.id for player in register_players(names).values())
+    added = enter_players(tournament, player_ids)
+    tournament.touch()
+    db.session.commit()
+    bracket_cache.bump(tournament_id)
+    for name in added:
+        player_stats_cache.bump_player(name)
+    return added
+
+def search_players(prefix, limit=PLAYER_SEARCH_LIMIT, exclude_tournament=None):
+    """Registered players whose name starts with ``prefix``, ignoring case, in name order."""
+    key = player_key(prefix)
+    # A range on the indexed key, so SQLite can seek instead of scanning with LIKE
+    query = Player.query.filter(Player.name_key >= key, Player.name_key < key + '\U0010ffff')
+    if exclude_tournament is not None:
+        query = query.filter(Player.id.notin_(
+            db.select(Contestant.player_id).where(Contestant.tournament_id == exclude_tournament)
+        ))
+    return query.order_by(Player.name_key, Player.id).limit(limit).all()
+
+def returning_players(tournament_id, limit=RETURNING_PLAYERS_LIMIT):
+    """Players from the most recent tournaments who have not entered this one, most recent first."""
+    recent_ids = db.session.query(Tournament.tournament_id).filter(
+        Tournament.tournament_id != tournament_id
+    ).order_by(Tournament.start_date.desc(), Tournament.id.desc()).limit(RETURNING_PLAYERS_TOURNAMENTS).scalar_subquery()
+    last_played = db.func.max(Tournament.start_date)
+    return db.session.query(Player).join(
+        Contestant, Contestant.player_id == Player.id
+    ).join(
+        Tournament, Tournament.tournament_id == Contestant.tournament_id
+    ).filter(
+        Contestant.tournament_id.in_(recent_ids),
+        Player.id.notin_(db.select(Contestant.player_id).where(Contestant.tournament_id == tournament_id))
+    ).group_by(Player.id).order_by(last_played.desc(), Player.name_key).limit(limit).all()
+
+def player_entries(player_name):
+    """Each tournament the player entered, their entry and that tournament's top score."""
+    top = db.aliased(Contestant)
+    top_score = db.session.query(db.func.max(top.score)).filter(
+        top.tournament_id == Contestant.tournament_id
+    ).correlate(Contestant).scalar_subquery()
+    return db.session.query(Tournament, Contestant, top_score.label('max_score')).join(
         Contestant, Tournament.tournament_id == Contestant.tournament_id
-    ).filter(Contestant.player == player_name).all()
-    
-    # Calculate statistics
-    total_matches = 0
-    total_wins = 0
-    tournaments_won = 0
-    
-    for tournament in player_tournaments:
-        contestant = next(c for c in tournament.contestants if c.player == player_name)
-        total_matches += contestant.matches_played
-        total_wins += contestant.matches_won
-        # Check if player won the tournament (highest score in completed tournament)
-        if tournament.status == TournamentStatus.COMPLETED.value:
-            max_score = max(c.score for c in tournament.contestants)
-            if contestant.score == max_score:
-                tournaments_won += 1
+    ).join(
+        Player, Player.id == Contestant.player_id
+    ).filter(Player.name == player_name).order_by(Tournament.start_date.desc()).all()
+
+def player_summary(player_name):
+    """Totals, win rate and tournaments won across all of a player's tournaments, via SQL aggregates."""
+    top = db.aliased(Contestant)
+    top_score = db.session.query(db.func.max(top.score)).filter(
+        top.tournament_id == Contestant.tournament_id
+    ).correlate(Contestant).scalar_subquery()
+    tournaments_entered, total_matches, total_wins, tournaments_won, rating = db.session.query(
+        db.func.count(Contestant.id),
+        db.func.coalesce(db.func.sum(Contestant.matches_played), 0),
+        db.func.coalesce(db.func.sum(Contestant.matches_won), 0),
+        db.func.coalesce(db.func.sum(db.case(
+            # Won = highest score in a completed tournament
+            (db.and_(Tournament.status == TournamentStatus.COMPLETED.value, Contestant.score == top_score), 1),
+            else_=0
+        )), 0),
+        db.func.max(Player.rating)
+    ).join(
+        Tournament, Tournament.tournament_id == Contestant.tournament_id
+    ).join(
+        Player, Player.id == Contestant.player_id
+    ).filter(Player.name == player_name).one()
     
     win_rate = (total_wins / total_matches * 100) if total_matches > 0 else 0
-    
-    # Get all matches involving the player
-    matches = db.session.query(MatchResult).filter(
+    return {
+        'tournaments_entered': tournaments_entered,
+        'total_matches': total_matches,
+        'total_wins': total_wins,
+        'tournaments_won': tournaments_won,
+        'win_rate': round(win_rate, 2),
+        'rating': round(rating) if rating is not None else None
+    }
+
+def player_match_page(player_name, before=None, limit=MATCH_HISTORY_PAGE_SIZE):
+    """One page of a player's matches, newest first, using keyset pagination.
+
+    ``before`` is the (completion_time, id) of the last match on the previous
+    page. Returns ([(match row, tournament name)], cursor for the next page
+    or None); match rows are plain columns, with player names, not ORM objects.
+    """
+    entries = db.session.query(Contestant.id).join(
+        Player, Player.id == Contestant.player_id
+    ).filter(Player.name == player_name).scalar_subquery()
+    query = with_match_players(db.session.query(
+        MatchResult.id, MatchResult.round_number, MATCH_NAME_COLUMNS['player1'], MATCH_NAME_COLUMNS['player2'],
+        MATCH_NAME_COLUMNS['winner'], MatchResult.score, MatchResult.is_draw, MatchResult.completion_time,
+        Tournament.name.label('tournament_name')
+    )).join(
+        Tournament, Tournament.tournament_id == MatchResult.tournament_id
+    ).filter(
         db.or_(
-            MatchResult.player1 == player_name,
-            MatchResult.player2 == player_name
+            MatchResult.player1_id.in_(entries),
+            MatchResult.player2_id.in_(entries)
         )
-    ).order_by(MatchResult.completion_time.desc()).all()
+    )
+    if before is not None:
+        before_time, before_id = before
+        query = query.filter(db.or_(
+            MatchResult.completion_time < before_time,
+            db.and_(MatchResult.completion_time == before_time, MatchResult.id < before_id)
+        ))
+    rows = query.order_by(MatchResult.completion_time.desc(), MatchResult.id.desc()).limit(limit + 1).all()
+    
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = f"{last.completion_time.isoformat()}_{last.id}"
+    return [(row, row.tournament_name) for row in rows], next_cursor
+
+def parse_time_cursor(cursor):
+    """Turn a '<iso time>_<id>' cursor back into (datetime, id); None if absent or malformed."""
+    if not cursor:
+        return None
+    try:
+        timestamp, row_id = cursor.rsplit('_', 1)
+        return datetime.fromisoformat(timestamp), int(row_id)
+    except ValueError:
+        return None
+
+@bp.route('/player/<player_name>')
+def player_stats(player_name):
+    """View player statistics."""
+    entries = player_entries(player_name)
+    player_tournaments = [tournament for tournament, _, _ in entries]
+    
+    # Summary totals are cached until one of the player's tournaments changes
+    summary = player_stats_cache.get(player_name)
+    if summary is None:
+        player_version = player_stats_cache.player_version(player_name)
+        versions = player_stats_cache.snapshot(t.tournament_id for t in player_tournaments)
+        summary = player_summary(player_name)
+        player_stats_cache.store(player_name, player_version, versions, summary)
+    
+    before = parse_time_cursor(request.args.get('before'))
+    matches, next_cursor = player_match_page(player_name, before)
     
     return render_template(
         'player_stats.html',
         player_name=player_name,
         tournaments=player_tournaments,
+        entries=entries,
         matches=matches,
-        total_matches=total_matches,
-        total_wins=total_wins,
-        tournaments_won=tournaments_won,
-        win_rate=round(win_rate, 2)
+        next_cursor=next_cursor,
+        is_first_page=before is None,
+        total_matches=summary['total_matches'],
+        total_wins=summary['total_wins'],
+        tournaments_won=summary['tournaments_won'],
+        rating=summary['rating'],
+        win_rate=summary['win_rate']
     )
 
-@app.route('/tournaments/<int:tournament_id>/update', methods=['POST'])
+@bp.route('/tournaments/<int:tournament_id>/update', methods=['POST'])
 def update_tournament(tournament_id):
     try:
-        tournament = Tournament.query.filter_by(tournament_id=tournament_id).first_or_404()
-        data = request.form
-        
-        # Update fields if provided
-        if data.get('name'):
-            tournament.name = data['name']
-        if data.get('format'):
-            tournament.tFormat = data['format']
-        if data.get('start_date'):
-            tournament.start_date = datetime.strptime(data['start_date'], '%Y-%m-%dT%H:%M')
-        if data.get('end_date'):
-            tournament.end_date = datetime.strptime(data['end_date'], '%Y-%m-%dT%H:%M')
-        if data.get('current_round'):
-            tournament.current_round = int(data['current_round'])
-            
-        if tournament.status != TournamentStatus.COMPLETED.value and tournament.status != TournamentStatus.CANCELED.value:
-            # Update status based on new dates
-            current_time = datetime.now()
-            if current_time < tournament.start_date:
-                tournament.status = TournamentStatus.PENDING.value
-            elif current_time <= tournament.end_date:
-                tournament.status = TournamentStatus.ACTIVE.value
-            else:
-                tournament.status = TournamentStatus.COMPLETED.value
-            
-        db.session.commit()
-        return redirect(url_for('tournament_details', tournament_id=tournament_id))
+        update_tournament_settings(tournament_id, request.form)
+        return redirect(url_for('main.tournament_details', tournament_id=tournament_id))
     except Exception as e:
         return render_template('error.html', error=str(e))
 
-@app.route('/tournaments/<int:tournament_id>/register_bye', methods=['POST'])
+@tournament_write
+def update_tournament_settings(tournament_id, data):
+    """Apply the non-empty fields of the update form."""
+    tournament = Tournament.query.filter_by(tournament_id=tournament_id).first_or_404()
+    
+    # Update fields if provided
+    if data.get('name'):
+        tournament.name = data['name']
+    if data.get('format'):
+        tournament.tFormat = data['format']
+    if data.get('start_date'):
+        tournament.start_date = datetime.strptime(data['start_date'], '%Y-%m-%dT%H:%M')
+    if data.get('end_date'):
+        tournament.end_date = datetime.strptime(data['end_date'], '%Y-%m-%dT%H:%M')
+    if data.get('current_round'):
+        tournament.current_round = int(data['current_round'])
+        sync_round_progress(tournament)
+        
+    if tournament.status != TournamentStatus.COMPLETED.value and tournament.status != TournamentStatus.CANCELED.value:
+        # Update status based on new dates
+        current_time = datetime.now()
+        if current_time < tournament.start_date:
+            tournament.status = TournamentStatus.PENDING.value
+        elif current_time <= tournament.end_date:
+            tournament.status = TournamentStatus.ACTIVE.value
+        else:
+            tournament.status = TournamentStatus.COMPLETED.value
+        
+    tournament.touch()
+    db.session.commit()
+    bracket_cache.bump(tournament_id)
+
+@bp.route('/tournaments/<int:tournament_id>/register_bye', methods=['POST'])
 def register_bye_route(tournament_id):
     try:
         player_name = request.form['player']
         register_bye(tournament_id, player_name)
-        return redirect(url_for('tournament_details', tournament_id=tournament_id))
+        return redirect(url_for('main.tournament_details', tournament_id=tournament_id))
     except Exception as e:
         return render_template('error.html', error=str(e))
 
-@app.route('/tournaments/<int:tournament_id>/cancel', methods=['POST'])
+@bp.route('/tournaments/<int:tournament_id>/cancel', methods=['POST'])
 def cancel_tournament(tournament_id):
-    tournament = Tournament.query.filter_by(tournament_id=tournament_id).first_or_404()
+    db.session.query(Tournament.tournament_id).filter_by(tournament_id=tournament_id).first_or_404()
     
     # Check for confirmation
     confirmation = request.form.get('confirmation')
     if confirmation and confirmation.lower() == 'yes':
-        # Remove all matches and byes associated with the tournament
-        MatchResult.query.filter_by(tournament_id=tournament_id).delete()
-        
-        # Set tournament status to CANCELED
-        tournament.status = TournamentStatus.CANCELED.value
-        db.session.commit()
+        try:
+            mark_canceled(tournament_id)
+        except ConcurrentWriteError as e:
+            return render_template('error.html', error=str(e))
         flash('Tournament has been canceled successfully.')
     else:
         flash('Cancellation not confirmed. Tournament remains active.')
     
-    return redirect(url_for('tournament_details', tournament_id=tournament_id))
+    return redirect(url_for('main.tournament_details', tournament_id=tournament_id))
+
+@tournament_write
+def mark_canceled(tournament_id):
+    """Set tournament status to CANCELED; a background job deletes the bracket, matches and byes."""
+    tournament = Tournament.query.filter_by(tournament_id=tournament_id).first()
+    tournament.status = TournamentStatus.CANCELED.value
+    tournament.touch()
+    enqueue_job('clear_canceled_tournament', key=f'clear_canceled_tournament:{tournament_id}',
+                tournament_id=tournament_id)
+    db.session.commit()
+    bracket_cache.bump(tournament_id)
+    event_broker.publish(tournament_id, 'reset', {})
+
+@bp.route('/tournaments/<int:tournament_id>/export', methods=['POST'])
+def export_tournament(tournament_id):
+    """Queue a CSV export of the tournament's results and show it on the jobs page."""
+    db.session.query(Tournament.tournament_id).filter_by(tournament_id=tournament_id).first_or_404()
+    job = enqueue_job('export_results', key=f'export_results:{tournament_id}', tournament_id=tournament_id)
+    db.session.commit()
+    flash(f'Export queued as job {job.id}; the download link appears here when it is ready.')
+    return redirect(url_for('main.jobs_page'))
+
+@bp.route('/jobs')
+def jobs_page():
+    """Queued, running and recent background jobs, optionally filtered by status."""
+    status_filter = request.args.get('status')
+    statuses = [status.value for status in JobStatus]
+    if status_filter and status_filter not in statuses:
+        return render_template('error.html', error=f"Unknown job status '{status_filter}'")
+    counts = dict.fromkeys(statuses, 0)
+    counts.update(db.session.query(Job.status, db.func.count(Job.id)).group_by(Job.status).all())
+    query = Job.query.order_by(Job.id.desc())
+    if status_filter:
+        query = query.filter_by(status=status_filter)
+    return render_template('jobs.html', counts=counts, jobs=query.limit(JOB_PAGE_SIZE).all(),
+                           status_filter=status_filter)
+
+@bp.route('/jobs/<int:job_id>/retry', methods=['POST'])
+def retry_job(job_id):
+    """Queue a failed job again, with a fresh set of attempts."""
+    job = db.get_or_404(Job, job_id)
+    if job.status == JobStatus.FAILED.value:
+        job.status = JobStatus.QUEUED.value
+        job.attempts = 0
+        job.run_at = datetime.now()
+        job.finished_at = None
+        db.session.commit()
+    return redirect(url_for('main.jobs_page'))
+
+@bp.route('/jobs/<int:job_id>/download')
+def download_export(job_id):
+    job = db.get_or_404(Job, job_id)
+    outcome = job.outcome if job.status == JobStatus.DONE.value else None
+    if not outcome or 'file' not in outcome:
+        abort(404)
+    return send_from_directory(export_dir(), outcome['file'], as_attachment=True, mimetype='text/csv')
+
+@bp.route('/tournaments/<int:tournament_id>/events')
+def tournament_events(tournament_id):
+    """Server-Sent Events stream of live results, withdrawals and round changes."""
+    db.session.query(Tournament.tournament_id).filter_by(tournament_id=tournament_id).first_or_404()
+    last_event_id = request.headers.get('Last-Event-ID', request.args.get('last_event_id'))
+    try:
+        last_event_id = int(last_event_id) if last_event_id else None
+    except ValueError:
+        last_event_id = None
+    
+    # Each stream holds a server thread; past the limit the page works without
+    # live updates (204 tells EventSource not to reconnect)
+    max_streams = current_app.config.get('SSE_MAX_STREAMS')
+    if max_streams is not None and event_broker.subscriber_count() >= max_streams:
+        return Response(status=204)
+    
+    subscription = event_broker.subscribe(tournament_id, last_event_id)
+    return Response(
+        subscription.stream(),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
 
-@app.route('/tournaments/<int:tournament_id>/bracket')
+@bp.route('/tournaments/<int:tournament_id>/bracket')
+@conditional_tournament_page
 def bracket(tournament_id):
+    # Read before the data, so an event published meanwhile is replayed rather than missed
+    last_event_id = event_broker.last_event_id(tournament_id)
     tournament = Tournament.query.filter_by(tournament_id=tournament_id).first_or_404()
-    matches = MatchResult.query.filter_by(tournament_id=tournament_id).order_by(MatchResult.round_number).all()
-    
-    # Query to get the maximum round number
-    max_round_number = db.session.query(db.func.max(MatchResult.round_number)).filter_by(tournament_id=tournament_id).scalar()
+    # Keyed on the revision, which every write moves, whichever process makes it
+    view = bracket_cache.get(tournament_id, tournament.revision)
+    if view is None:
+        matches = MatchResult.query.filter_by(tournament_id=tournament_id).order_by(MatchResult.round_number, MatchResult.id).all()
+        
+        # Query for player scores if the tournament is not elimination format
+        if not tournament.is_elimination_format:
+            player_scores = {player.player: player.score for player in Contestant.standings(tournament_id)}
+            bracket = names = None
+        else:
+            player_scores = None  # No scores needed for elimination format
+            bracket, names = bracket_for_view(tournament)
+        
+        view = build_bracket_view(tournament, matches, player_scores, bracket=bracket, names=names)
+        bracket_cache.store(tournament_id, tournament.revision, view)
+    # Rendered per request: the page shows this session's flash messages
+    return render_template('bracket.html', tournament=tournament, view=view, last_event_id=last_event_id)
+
+# Read-only JSON API. Every endpoint serializes column tuples, accepts
+# ?fields=a,b to trim the payload and shares the pages' ETag handling, so
+# overlays polling once a second mostly get 304s.
+API_PLAYER_FIELDS = {
+    'id': Contestant.id,
+    'player': Contestant.player,
+    'seed': Contestant.seed,
+    'rating': Contestant.rating,
+    'status': Contestant.status,
+    'active': Contestant.active,
+    'score': Contestant.score,
+    'matches_played': Contestant.matches_played,
+    'matches_won': Contestant.matches_won,
+    'matches_drawn': Contestant.matches_drawn
+}
+
+API_STANDINGS_FIELDS = {
+    'player': Contestant.player,
+    'score': Contestant.score,
+    'buchholz': Contestant.buchholz,
+    'sonneborn_berger': Contestant.sonneborn_berger,
+    'matches_played': Contestant.matches_played,
+    'matches_won': Contestant.matches_won,
+    'matches_drawn': Contestant.matches_drawn,
+    'status': Contestant.status,
+    'active': Contestant.active
+}
+
+API_MATCH_FIELDS = {
+    'id': MatchResult.id,
+    'round_number': MatchResult.round_number,
+    **MATCH_NAME_COLUMNS,
+    'score': MatchResult.score,
+    'is_draw': MatchResult.is_draw,
+    'status': MatchResult.status,
+    'completion_time': MatchResult.completion_time
+}
+
+def api_error(message, status=400):
+    return json_response({'error': message}, status)
+
+def api_page(tournament_id, data, **pagination):
+    return {'tournament_id': tournament_id, 'data': data, **pagination}
+
+@bp.app_errorhandler(404)
+def not_found(e):
+    if request.path.startswith('/api/'):
+        return api_error('Not found', 404)
+    return e
+
+API_JOB_FIELDS = {
+    'id': Job.id,
+    'name': Job.name,
+    'status': Job.status,
+    'attempts': Job.attempts,
+    'run_at': Job.run_at,
+    'created_at': Job.created_at,
+    'started_at': Job.started_at,
+    'finished_at': Job.finished_at,
+    'error': Job.error,
+    'result': Job.result,
+}
+
+def job_rows(query, fields):
+    rows = [dict(zip(fields, row)) for row in query]
+    for row in rows:
+        if row.get('result'):
+            row['result'] = json.loads(row['result'])
+    return rows
+
+@bp.route('/api/v1/jobs')
+def api_jobs():
+    """Job counts by status and the most recent jobs; supports fields, limit and status."""
+    try:
+        fields = select_fields(API_JOB_FIELDS, request.args.get('fields'))
+        limit, _ = parse_page(request.args, default_limit=JOB_PAGE_SIZE)
+    except ValueError as e:
+        return api_error(str(e))
+    query = db.session.query(*(API_JOB_FIELDS[field] for field in fields))
+    if request.args.get('status'):
+        query = query.filter(Job.status == request.args['status'])
+    counts = dict.fromkeys((status.value for status in JobStatus), 0)
+    counts.update(db.session.query(Job.status, db.func.count(Job.id)).group_by(Job.status).all())
+    return json_response({'counts': counts, 'data': job_rows(query.order_by(Job.id.desc()).limit(limit), fields)})
+
+@bp.route('/api/v1/jobs/<int:job_id>')
+def api_job(job_id):
+    """One job, e.g. to poll an export until it is done."""
+    fields = list(API_JOB_FIELDS)
+    rows = job_rows(db.session.query(*API_JOB_FIELDS.values()).filter(Job.id == job_id), fields)
+    if not rows:
+        return api_error('Not found', 404)
+    return json_response(rows[0])
+
+@bp.route('/api/v1/players')
+def api_player_search():
+    """Registered players whose name starts with ?q= (case-insensitive), for typeahead.
+
+    Supports limit (default 10) and exclude_tournament=<id> to leave out
+    players already entered in that tournament.
+    """
+    prefix = request.args.get('q', '').strip()
+    try:
+        limit = min(int(request.args.get('limit', PLAYER_SEARCH_LIMIT)), RETURNING_PLAYERS_LIMIT)
+        exclude = int(request.args['exclude_tournament']) if request.args.get('exclude_tournament') else None
+    except ValueError:
+        return api_error('limit and exclude_tournament must be integers')
+    if not prefix or limit < 1:
+        return json_response({'data': []})
+    players = search_players(prefix, limit=limit, exclude_tournament=exclude)
+    return json_response({'data': [{'id': player.id, 'name': player.name} for player in players]})
+
+@bp.route('/api/v1/tournaments/<int:tournament_id>/standings')
+@conditional_tournament_page
+def api_standings(tournament_id):
+    """Standings, leader first. Supports fields, limit, offset and active=1."""
+    try:
+        fields = select_fields(API_STANDINGS_FIELDS, request.args.get('fields'))
+        limit, offset = parse_page(request.args)
+    except ValueError as e:
+        return api_error(str(e))
+    query = Contestant.standings(tournament_id, active_only=parse_flag(request.args.get('active'))).with_entities(
+        *(API_STANDINGS_FIELDS[field] for field in fields)
+    )
+    rows, has_more = paged_rows(query, fields, limit, offset)
+    return json_response(api_page(tournament_id, rows, next_offset=offset + limit if has_more else None))
+
+@bp.route('/api/v1/tournaments/<int:tournament_id>/players')
+@conditional_tournament_page
+def api_players(tournament_id):
+    """Contestants by name. Supports fields, limit, offset and active=1."""
+    try:
+        fields = select_fields(API_PLAYER_FIELDS, request.args.get('fields'))
+        limit, offset = parse_page(request.args)
+    except ValueError as e:
+        return api_error(str(e))
+    query = db.session.query(*(API_PLAYER_FIELDS[field] for field in fields)).filter(
+        Contestant.tournament_id == tournament_id
+    )
+    if parse_flag(request.args.get('active')):
+        query = query.filter(Contestant.active == True)
+    query = query.order_by(db.func.lower(Contestant.player), Contestant.id)
+    rows, has_more = paged_rows(query, fields, limit, offset)
+    return json_response(api_page(tournament_id, rows, next_offset=offset + limit if has_more else None))
+
+@bp.route('/api/v1/tournaments/<int:tournament_id>/matches')
+@conditional_tournament_page
+def api_matches(tournament_id):
+    """Matches in the order they were recorded.
+
+    Supports fields, limit, round=N and after=<match id>; pass the returned
+    next_after back as after to page, or the last id seen to poll for new results.
+    """
+    try:
+        fields = select_fields(API_MATCH_FIELDS, request.args.get('fields'))
+        limit, _ = parse_page(request.args)
+    except ValueError as e:
+        return api_error(str(e))
+    try:
+        after = int(request.args.get('after', 0))
+        round_number = int(request.args['round']) if request.args.get('round') else None
+    except ValueError:
+        return api_error('after and round must be integers')
+    # The id is always read for the cursor, even when not selected
+    query = with_match_players(
+        db.session.query(MatchResult.id, *(API_MATCH_FIELDS[field] for field in fields))
+    ).filter(
+        MatchResult.tournament_id == tournament_id,
+        MatchResult.id > after
+    )
+    if round_number is not None:
+        query = query.filter(MatchResult.round_number == round_number)
+    rows = query.order_by(MatchResult.id).limit(limit + 1).all()
     
-    # Query for player scores if the tournament is not elimination format
-    if not tournament.is_elimination_format:
-        players = Contestant.query.filter_by(tournament_id=tournament_id).all()
-        player_scores = {player.player: player.score for player in players}
-    else:
-        player_scores = None  # No scores needed for elimination format
+    next_after = rows[limit - 1][0] if len(rows) > limit else None
+    data = [dict(zip(fields, row[1:])) for row in rows[:limit]]
+    return json_response(api_page(tournament_id, data, next_after=next_after))
+
+@bp.route('/api/v1/tournaments/<int:tournament_id>/bracket')
+@conditional_tournament_page
+def api_bracket(tournament_id):
+    """The bracket view model the bracket page renders: rounds for elimination formats, scores otherwise."""
+    tournament = Tournament.query.filter_by(tournament_id=tournament_id).first_or_404()
+    view = bracket_cache.get(tournament_id, tournament.revision)
+    if view is None:
+        matches = with_match_players(db.session.query(
+            MatchResult.round_number, MATCH_NAME_COLUMNS['player1'], MATCH_NAME_COLUMNS['player2'],
+            MATCH_NAME_COLUMNS['winner'], MatchResult.is_draw, MatchResult.score
+        )).filter(MatchResult.tournament_id == tournament_id).order_by(MatchResult.round_number, MatchResult.id).all()
+        player_scores = bracket = names = None
+        if not tournament.is_elimination_format:
+            player_scores = dict(Contestant.standings(tournament_id).with_entities(Contestant.player, Contestant.score))
+        else:
+            bracket, names = bracket_for_view(tournament)
+        view = build_bracket_view(tournament, matches, player_scores, bracket=bracket, names=names)
     
-    return render_template('bracket.html', tournament=tournament, matches=matches, player_scores=player_scores, max_round_number=max_round_number)
-@app.cli.command('reset_db')
+    return json_response({
+        'tournament_id': tournament_id,
+        'name': tournament.name,
+        'format': tournament.tFormat,
+        'status': tournament.status,
+        'current_round': tournament.current_round,
+        # Scores go out as a list so the standings order survives any JSON parser
+        **{key: value for key, value in view.items() if key != 'player_scores'},
+        'player_scores': [
+            {'player': player, 'score': score} for player, score in view['player_scores'].items()
+        ] if view['player_scores'] is not None else None
+    })
+
+@bp.cli.command('reset_db')
 def reset_db():
     """Reset the database."""
     db.drop_all()
     db.create_all()
+    migrations.stamp(db.engine)
     print('Database reset successfully.')
 
+@bp.cli.command('rebuild_standings')
+@click.argument('tournament_id', type=int, required=False)
+def rebuild_standings(tournament_id):
+    """Recompute tiebreaks from match history (one tournament, or all)."""
+    if tournament_id is None:
+        tournament_ids = [t for (t,) in db.session.query(Tournament.tournament_id)]
+    else:
+        tournament_ids = [tournament_id]
+    for tid in tournament_ids:
+        recompute_standings(tid)
+    Tournament.query.filter(Tournament.tournament_id.in_(tournament_ids)).update(
+        {'revision': Tournament.revision + 1, 'updated_at': datetime.now()}, synchronize_session=False
+    )
+    db.session.commit()
+    for tid in tournament_ids:
+        bracket_cache.bump(tid)
+    print(f'Rebuilt standings for {len(tournament_ids)} tournament(s).')
+
+@bp.cli.command('update_statuses')
+def update_statuses():
+    """Store date-based status changes (Pending -> Active -> Completed) for open tournaments."""
+    changed = refresh_tournament_statuses()
+    print(f'Updated the status of {len(changed)} tournament(s).')
+
+@bp.cli.command('run_jobs')
+@click.option('--worker', is_flag=True, help='Keep running, with the periodic schedule, until interrupted.')
+def run_jobs(worker):
+    """Run queued background jobs until none is due (for JOB_WORKERS = 0 setups and cron)."""
+    if not worker:
+        print(f'Ran {run_due_jobs()} job(s).')
+        return
+    app = current_app._get_current_object()
+    app.config['JOB_WORKERS'] = max(1, app.config['JOB_WORKERS'])
+    runner = start_job_runner(app)
+    print(f"Working the job queue with {app.config['JOB_WORKERS']} thread(s); press Ctrl+C to stop.")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        runner.stop()
+
+@bp.cli.command('rebuild_ratings')
+def rebuild_ratings_command():
+    """Recompute every player's rating from the match history, e.g. after deleting matches."""
+    started = time.perf_counter()
+    count = rebuild_ratings()
+    print(f'Replayed {count} matches in {time.perf_counter() - started:.1f}s.')
+
+@bp.cli.command('check_rounds')
+@click.argument('tournament_id', type=int, required=False)
+@click.option('--fix', is_flag=True, help='Rewrite wrong counters and advance rounds that turn out to be complete.')
+def check_rounds(tournament_id, fix):
+    """Compare the stored round counters with the match history (one tournament, or all)."""
+    query = Tournament.query.filter(
+        ~Tournament.tFormat.in_([TournamentFormat.SINGLE_ELIMINATION.value, TournamentFormat.DOUBLE_ELIMINATION.value])
+    )
+    if tournament_id is not None:
+        query = query.filter_by(tournament_id=tournament_id)
+    mismatches = 0
+    for tournament in query.all():
+        counted = count_round_progress(tournament.tournament_id, tournament.current_round)
+        stored = (tournament.round_expected, tournament.round_reported)
+        if counted == stored:
+            continue
+        mismatches += 1
+        print(f'Tournament {tournament.tournament_id} round {tournament.current_round}: '
+              f'stored {stored[1]}/{stored[0]} reported, history says {counted[1]}/{counted[0]}')
+        if fix:
+            check_round_completion(tournament.tournament_id)
+    if mismatches and not fix:
+        raise SystemExit(1)
+    print(f'{mismatches} tournament(s) out of sync' + (' (fixed).' if fix and mismatches else '.'))
+
+@bp.cli.command('upgrade_db')
+def upgrade_db():
+    """Create missing tables and apply pending schema migrations."""
+    applied = migrations.upgrade(db.engine, db.metadata)
+    for description in applied:
+        print(f'Applied: {description}')
+    print('Database is up to date.')
+
+def read_pages(tournament_id, player_name):
+    """The read pages whose queries must use an index, as (name, url, allowed scans).
+
+    The allowed scans are full table scans that are expected on that page.
+    """
+    tournament = f'/tournaments/{tournament_id}'
+    api = f'/api/v1/tournaments/{tournament_id}'
+    return [
+        # Both show status counts, which cover every tournament and are cached
+        ('index', '/', {'SCAN tournament'}),
+        ('tournaments', '/tournaments', {'SCAN tournament'}),
+        ('tournament_details', tournament, set()),
+        ('add_players', f'{tournament}/add_players', set()),
+        ('add_players.search', f'{tournament}/add_players?q={player_name[:3]}', set()),
+        ('player_list', f'{tournament}/players', set()),
+        ('match_management', f'{tournament}/match_management', set()),
+        ('recent_matches', f'{tournament}/recent_matches', set()),
+        ('bracket', f'{tournament}/bracket', set()),
+        ('player_stats', f'/player/{player_name}', set()),
+        # Newest first walks the rowid and stops at the page size
+        ('jobs', '/jobs', {'SCAN job'}),
+        ('api_player_search', f'/api/v1/players?q={player_name[:3]}', set()),
+        ('api_standings', f'{api}/standings', set()),
+        ('api_players', f'{api}/players', set()),
+        ('api_matches', f'{api}/matches', set()),
+        ('api_bracket', f'{api}/bracket', set()),
+    ]
+
+def request_statements(client, method, url, **kwargs):
+    """Send a request with a test client; returns the response and the SELECTs it ran, with their parameters."""
+    with count_queries() as queries:
+        response = client.open(url, method=method, **kwargs)
+    selects = [
+        (statement, parameters) for statement, parameters in queries.statements
+        if statement.lstrip().upper().startswith(('SELECT', 'WITH'))
+    ]
+    return response, selects
+
+def statement_plan(statement, parameters=()):
+    """The EXPLAIN QUERY PLAN steps of an SQL statement, as SQLite describes them (SQLite only)."""
+    rows = db.session.connection().exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, parameters)
+    return [row[-1] for row in rows]
+
+def full_scans(steps):
+    """The query plan steps that scan a whole table, rather than an index or a subquery's rows."""
+    subqueries = {step.split()[1] for step in steps if step.startswith(('CO-ROUTINE ', 'MATERIALIZE '))}
+    return [
+        step for step in steps
+        if step.startswith('SCAN ') and ' USING ' not in step
+        and step.split()[1] not in subqueries and not step.startswith(('SCAN (', 'SCAN CONSTANT ROW'))
+    ]
+
+@bp.cli.command('check_query_plans')
+@click.argument('tournament_id', type=int, required=False)
+def check_query_plans(tournament_id):
+    """Fail if a read page runs a query that scans a whole table (SQLite only).
+
+    Requests each page for a tournament (the most recent by default) and one
+    of its players, and asks SQLite how it ran every SELECT.
+    """
+    if db.engine.dialect.name != 'sqlite':
+        print('Query plan checks only run against SQLite.')
+        return
+    query = db.session.query(Tournament.tournament_id, Contestant.player).join(
+        Contestant, Contestant.tournament_id == Tournament.tournament_id
+    )
+    if tournament_id is not None:
+        query = query.filter(Tournament.tournament_id == tournament_id)
+    row = query.order_by(Tournament.start_date.desc(), Tournament.id.desc()).first()
+    if row is None:
+        print('Query plan checks need a tournament with players.')
+        raise SystemExit(1)
+    client = current_app.test_client()
+    failures = 0
+    try:
+        for name, url, allowed in read_pages(*row):
+            clear_caches()
+            response, statements = request_statements(client, 'GET', url)
+            scans = [
+                scan for statement in statements for scan in full_scans(statement_plan(*statement))
+                if scan not in allowed
+            ]
+            if response.status_code != 200:
+                failures += 1
+                print(f'FAIL {name}: {url} answered {response.status_code}')
+            elif scans:
+                failures += 1
+                print(f'FAIL {name}: ' + '; '.join(scans))
+            else:
+                print(f'ok   {name}')
+    finally:
+        db.session.remove()
+    if failures:
+        raise SystemExit(1)
+
+@bp.cli.command('import-results')
+@click.argument('tournament_id', type=int)
+@click.argument('csv_file', type=click.File('r'))
+@click.option('--round', 'expected_round', type=int, default=None, help='Fail unless the tournament is in this round.')
+def import_results(tournament_id, csv_file, expected_round):
+    """Import a round of results from a CSV file (player1,player2,score,is_draw)."""
+    try:
+        matches = record_results(tournament_id, read_results_csv(csv_file), expected_round=expected_round)
+    except ResultValidationError as e:
+        for error in e.errors:
+            print(error)
+        raise SystemExit(1)
+    tournament = Tournament.query.filter_by(tournament_id=tournament_id).first()
+    print(f'Imported {len(matches)} result(s). Tournament is now in round {tournament.current_round} ({tournament.status}).')
+
+@bp.cli.command('serve')
+@click.option('--dev', is_flag=True, help="Use Flask's debugging server with auto-reload instead of waitress.")
+@click.option('--host', default=server.DEFAULT_HOST)
+@click.option('--port', type=int, default=server.DEFAULT_PORT)
+@click.option('--threads', type=int, default=None, help='Worker threads for the production server.')
+def serve(dev, host, port, threads):
+    """Upgrade the database and run the web server with its background job workers."""
+    migrations.upgrade(db.engine, db.metadata)
+    app = current_app._get_current_object()
+    if not server.is_reloader_watcher(production=not dev):
+        start_job_runner(app)
+    server.serve(app, production=not dev, host=host, port=port, threads=threads)
+
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000, debug=True)
+    args = server.parse_args()
+    app = create_app()
+    with app.app_context():
+        migrations.upgrade(db.engine, db.metadata)
+    if not server.is_reloader_watcher(production=not args.dev):
+        start_job_runner(app)
+    server.serve(app, production=not args.dev, host=args.host, port=args.port, threads=args.threads)
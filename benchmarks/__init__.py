@@ -0,0 +1,9 @@
+"""Benchmarks for the hot paths, run against synthetic tournament databases.
+
+    python -m benchmarks.generate --preset small      # build benchmarks/data/small.db
+    python -m benchmarks.run --preset small           # time it, compare with baseline.json
+    python -m benchmarks.run --preset small --save-baseline
+
+Run from the repository root. ``run`` generates the database on first use and
+works on a copy, so every run starts from the same data.
+"""
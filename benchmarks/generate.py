@@ -0,0 +1,299 @@
+"""Generate a synthetic tournament database.
+
+Tournaments of every format are simulated in memory (random results, real
+Swiss scoring, Berger-table round robins, brackets from elimination.build)
+and bulk-inserted, so even the large preset (10k tournaments, about a million
+match results) builds in a few minutes. Players are drawn from a shared pool,
+so player pages have history across many tournaments.
+
+Besides the history, every preset adds one in-progress "fixture" tournament
+per format and fixture size, named ``bench <format> <size>``, for the
+benchmarks to target.
+"""
+import argparse
+import os
+import random
+import time
+from datetime import datetime, timedelta
+
+import elimination
+import migrations
+from app import (
+    BracketMatch, Contestant, MatchEntry, MatchResult, Player, PlayerStatus, Tournament, TournamentFormat,
+    TournamentStatus, create_app, db, player_key, rebuild_ratings
+)
+from schedule import round_pairings, rounds_per_cycle
+from standings import compute_tiebreaks
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+PRESETS = {
+    'small': {
+        'tournaments': 300,
+        'players': 2000,
+        'sizes': {16: 50, 32: 25, 64: 15, 128: 6, 256: 4},
+        'fixture_sizes': (16, 256),
+    },
+    'large': {
+        'tournaments': 10000,
+        'players': 50000,
+        'sizes': {16: 55, 32: 25, 64: 12, 128: 5, 256: 2, 512: 0.6, 1024: 0.25, 2048: 0.1, 4096: 0.05},
+        'fixture_sizes': (16, 256, 4096),
+    },
+}
+
+# Nobody plays a 4096-player round robin to the end; cap the rounds simulated
+MAX_ROUND_ROBIN_ROUNDS = 12
+CHUNK_SIZE = 20000
+
+
+def database_path(preset):
+    return os.path.join(DATA_DIR, f'{preset}.db')
+
+
+def fixture_name(tournament_format, size):
+    return f'bench {tournament_format} {size}'
+
+
+class Generator:
+    """Accumulates rows for every table and inserts them in chunks."""
+
+    def __init__(self, seed=0):
+        self.random = random.Random(seed)
+        self.now = datetime.now()
+        self.next_ids = {'player': 1, 'tournament': 1, 'contestant': 1, 'match': 1}
+        self.rows = {Player: [], Tournament: [], Contestant: [], MatchResult: [], MatchEntry: [], BracketMatch: []}
+        self.player_ids = {}
+        self.totals = dict.fromkeys(self.rows, 0)
+
+    def _id(self, kind):
+        value = self.next_ids[kind]
+        self.next_ids[kind] += 1
+        return value
+
+    def flush(self, force=False):
+        # Parents first so foreign keys always resolve
+        for model in (Player, Tournament, Contestant, MatchResult, MatchEntry, BracketMatch):
+            rows = self.rows[model]
+            if rows and (force or len(rows) >= CHUNK_SIZE):
+                db.session.execute(model.__table__.insert(), rows)
+                self.totals[model] += len(rows)
+                rows.clear()
+        db.session.commit()
+
+    def players(self, names):
+        """Register the shared player pool."""
+        for name in names:
+            player_id = self.player_ids[name] = self._id('player')
+            self.rows[Player].append({'id': player_id, 'name': name, 'name_key': player_key(name), 'created_at': self.now})
+
+    def tournament(self, players, tournament_format, name=None, rounds=None):
+        """Simulate one tournament, playing ``rounds`` rounds (a random share of them if None)."""
+        tournament_id = self._id('tournament')
+        start_date = self.now - timedelta(days=self.random.randint(0, 3 * 365))
+        contestants = {
+            player: {
+                'id': self._id('contestant'), 'player': player, 'player_id': self.player_ids[player], 'seed': seed,
+                'tournament_id': tournament_id, 'score': 0.0, 'matches_played': 0,
+                'matches_won': 0, 'matches_drawn': 0, 'losses': 0, 'buchholz': 0.0,
+                'sonneborn_berger': 0.0, 'active': True, 'position': None,
+                'status': PlayerStatus.WINNERS_BRACKET.value
+                if tournament_format == TournamentFormat.DOUBLE_ELIMINATION.value else PlayerStatus.ACTIVE.value,
+            }
+            for seed, player in enumerate(players, start=1)
+        }
+        tournament = {
+            'tournament_id': tournament_id, 'name': name or f'Synthetic {tournament_id}',
+            'tFormat': tournament_format, 'status': TournamentStatus.ACTIVE.value,
+            'start_date': start_date, 'end_date': start_date + timedelta(days=2),
+            'current_round': 1, 'revision': 0, 'updated_at': start_date,
+            'round_expected': 0, 'round_reported': 0,
+        }
+        # Mostly finished events, some under way and a few not started
+        progress = self.random.choice((0.0, self.random.random(), 1.0, 1.0))
+        if tournament_format in (TournamentFormat.SINGLE_ELIMINATION.value, TournamentFormat.DOUBLE_ELIMINATION.value):
+            self._bracket(tournament, contestants, progress, rounds)
+        else:
+            self._league(tournament, contestants, progress, rounds)
+        self.rows[Tournament].append(tournament)
+        self.rows[Contestant].extend(contestants.values())
+        self.flush()
+        return tournament_id
+
+    def _match(self, tournament, contestants, round_number, player1, player2, winner, is_draw, played_at):
+        match = {
+            'id': self._id('match'), 'tournament_id': tournament['tournament_id'],
+            'round_number': round_number,
+            'player1_id': contestants[player1]['id'],
+            'player2_id': contestants[player2]['id'] if player2 is not None else None,
+            'winner_side': None if is_draw else (1 if winner == player1 else 2), 'is_draw': is_draw,
+            'score': None if player2 is None else ('1-1' if is_draw else ('2-1' if winner == player1 else '1-2')),
+            'status': 'BYE' if player2 is None else 'COMPLETED',
+            'completion_time': played_at,
+        }
+        self.rows[MatchResult].append(match)
+        for player in (player1, player2):
+            if player is None:
+                continue
+            self.rows[MatchEntry].append({
+                'match_id': match['id'], 'contestant_id': contestants[player]['id'],
+                'tournament_id': match['tournament_id'], 'round_number': round_number,
+            })
+            stats = contestants[player]
+            stats['matches_played'] += 1
+            if is_draw:
+                stats['matches_drawn'] += 1
+                stats['score'] += 0.5
+            elif player == winner:
+                stats['matches_won'] += 1
+                stats['score'] += 1.0
+            else:
+                stats['losses'] += 1
+        return match
+
+    def _league(self, tournament, contestants, progress, rounds):
+        players = list(contestants)
+        tournament_format = tournament['tFormat']
+        if tournament_format == TournamentFormat.SWISS.value:
+            total = max(1, (len(players) - 1).bit_length())
+        else:
+            double = tournament_format == TournamentFormat.DOUBLE_ROUND_ROBIN.value
+            total = rounds_per_cycle(len(players)) * (2 if double else 1)
+        played = round(total * progress) if rounds is None else rounds
+        if tournament_format != TournamentFormat.SWISS.value:
+            played = min(played, MAX_ROUND_ROBIN_ROUNDS)
+
+        if played:
+            # Paired in seed order from the first round on
+            for position, player in enumerate(players, start=1):
+                contestants[player]['position'] = position
+
+        history = []
+        for round_number in range(1, played + 1):
+            if tournament_format == TournamentFormat.SWISS.value:
+                # Random pairing within the standings order, the last player gets the bye
+                order = sorted(players, key=lambda p: (-contestants[p]['score'], self.random.random()))
+                pairs = [(order[i], order[i + 1] if i + 1 < len(order) else None) for i in range(0, len(order), 2)]
+            else:
+                pairs = [
+                    (players[home], players[away] if away is not None else None)
+                    for home, away in round_pairings(len(players), round_number, double=double)
+                ]
+            played_at = tournament['start_date'] + timedelta(minutes=30 * round_number)
+            for player1, player2 in pairs:
+                if player2 is None:
+                    self._match(tournament, contestants, round_number, player1, None, player1, False, played_at)
+                    history.append((player1, None, player1, False))
+                    continue
+                is_draw = self.random.random() < 0.1
+                winner = None if is_draw else self.random.choice((player1, player2))
+                self._match(tournament, contestants, round_number, player1, player2, winner, is_draw, played_at)
+                history.append((player1, player2, winner, is_draw))
+
+        tiebreaks = compute_tiebreaks({p: c['score'] for p, c in contestants.items()}, history)
+        for player, (buchholz, sonneborn_berger) in tiebreaks.items():
+            contestants[player]['buchholz'] = buchholz
+            contestants[player]['sonneborn_berger'] = sonneborn_berger
+
+        if played >= total:
+            tournament['status'] = TournamentStatus.COMPLETED.value
+            tournament['current_round'] = total
+            leader = max(contestants.values(), key=lambda c: (c['score'], c['buchholz'], c['sonneborn_berger']))
+            for contestant in contestants.values():
+                contestant['status'] = PlayerStatus.WON.value if contestant is leader else PlayerStatus.LOST.value
+        else:
+            tournament['current_round'] = played + 1
+            tournament['round_expected'] = len(players)
+
+    def _bracket(self, tournament, contestants, progress, rounds):
+        double = tournament['tFormat'] == TournamentFormat.DOUBLE_ELIMINATION.value
+        # The bracket holds contestant ids, like the app's
+        names = {contestant['id']: player for player, contestant in contestants.items()}
+        bracket = elimination.build(list(names), double=double)
+        last_stage = max(match.stage for match in bracket)
+        target = round(last_stage * progress) if rounds is None else rounds
+        results = {}
+        while True:
+            stage = elimination.current_stage(bracket)
+            if stage is None or stage > target:
+                break
+            for match in [m for m in bracket if m.stage == stage and elimination.is_ready(m)]:
+                winner = self.random.choice((match.player1, match.player2))
+                loser = match.player2 if winner == match.player1 else match.player1
+                played_at = tournament['start_date'] + timedelta(minutes=30 * stage)
+                row = self._match(tournament, contestants, stage, names[match.player1], names[match.player2],
+                                  names[winner], False, played_at)
+                results[match.position] = row['id']
+                _, eliminated = elimination.record(bracket, match, winner, row['score'])
+                contestants[names[loser]]['status'] = (
+                    PlayerStatus.ELIMINATED.value if eliminated else PlayerStatus.LOSERS_BRACKET.value
+                )
+                contestants[names[loser]]['active'] = not eliminated
+
+        if results:
+            self.rows[BracketMatch].extend(
+                dict(match.as_dict(), tournament_id=tournament['tournament_id'],
+                     match_result_id=results.get(match.position))
+                for match in bracket
+            )
+        stage = elimination.current_stage(bracket)
+        if stage is None:
+            contestants[names[elimination.champion(bracket)]]['status'] = PlayerStatus.WON.value
+            tournament['status'] = TournamentStatus.COMPLETED.value
+            tournament['current_round'] = last_stage
+        else:
+            tournament['current_round'] = stage
+
+
+def generate(path, preset='small', seed=0):
+    """Build a fresh database at ``path``; returns row counts per table."""
+    settings = PRESETS[preset]
+    if os.path.exists(path):
+        os.remove(path)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    app = create_app({'SQLALCHEMY_DATABASE_URI': f'sqlite:///{os.path.abspath(path)}', 'SECRET_KEY': 'benchmark'})
+    generator = Generator(seed)
+    pool = [f'player{i:05d}' for i in range(settings['players'])]
+    sizes, weights = zip(*settings['sizes'].items())
+    formats = [f.value for f in TournamentFormat]
+
+    with app.app_context():
+        db.create_all()
+        migrations.stamp(db.engine)
+        generator.players(pool)
+        for _ in range(settings['tournaments']):
+            size = generator.random.choices(sizes, weights)[0]
+            generator.tournament(
+                generator.random.sample(pool, min(size, len(pool))),
+                generator.random.choice(formats)
+            )
+        for tournament_format in formats:
+            for size in settings['fixture_sizes']:
+                # One round played, so pairings have history and results are due
+                generator.tournament(
+                    generator.random.sample(pool, size), tournament_format,
+                    name=fixture_name(tournament_format, size), rounds=1
+                )
+        generator.flush(force=True)
+        rebuild_ratings()
+        db.session.execute(db.text('ANALYZE'))
+        db.session.commit()
+    return {model.__tablename__: count for model, count in generator.totals.items()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate a synthetic tournament database for benchmarks.')
+    parser.add_argument('--preset', choices=sorted(PRESETS), default='small')
+    parser.add_argument('--output', help='Database file (default benchmarks/data/<preset>.db).')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    path = args.output or database_path(args.preset)
+    started = time.perf_counter()
+    counts = generate(path, args.preset, args.seed)
+    print(f'Wrote {path} in {time.perf_counter() - started:.1f}s: '
+          + ', '.join(f'{count} {table}' for table, count in counts.items()))
+
+
+if __name__ == '__main__':
+    main()
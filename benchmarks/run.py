@@ -0,0 +1,285 @@
+"""Time the hot paths against a generated database and compare with a baseline.
+
+Each benchmark runs a warm-up call and then ``--iterations`` timed samples.
+The report gives latency percentiles and the median number of SQL statements
+per call (counted with instrumentation.count_queries). The in-memory caches
+are cleared before every sample, so timings are for the uncached path: the
+cost of the first request after a write.
+
+``--save-baseline`` writes the results to ``baseline.json``. Without it, the
+run fails (exit status 1) if any benchmark issues more SQL statements than
+the baseline, or if its median latency exceeds the baseline by more than
+``--tolerance``. Timings are only compared when the baseline was recorded
+with the same preset; record baselines on the machine that checks them.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+from app import (
+    BracketMatch, Contestant, MatchResult, Tournament, TournamentFormat, check_round_completion, create_app, db,
+    load_round_state, rebuild_ratings
+)
+from instrumentation import count_queries
+
+from benchmarks.generate import PRESETS, database_path, fixture_name, generate
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+DEFAULT_TOLERANCE = 0.5
+
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    """Register ``func(context)``, which returns the callable to time.
+
+    It may instead return ``(prepare, run)``: ``prepare()`` is called untimed
+    before each sample and its result passed to ``run``.
+    """
+    def register(func):
+        BENCHMARKS[name] = func
+        return func
+    return register
+
+
+def percentile(samples, fraction):
+    """Nearest-rank percentile of a list of numbers."""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(fraction * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+class Context:
+    """The app, a test client and the fixture tournaments of one benchmark run."""
+
+    def __init__(self, app, preset):
+        self.app = app
+        self.client = app.test_client()
+        self.size = max(PRESETS[preset]['fixture_sizes'])
+
+    def fixture(self, tournament_format, size=None):
+        name = fixture_name(tournament_format.value, size or self.size)
+        return db.session.query(Tournament.tournament_id).filter_by(name=name).scalar()
+
+    def reset_caches(self):
+        state = self.app.extensions['tourneyman']
+        state['bracket_cache'].clear()
+        state['player_stats_cache'].clear()
+        state['opponent_indexes'].clear()
+        state['tournament_summary'].clear()
+        db.session.expire_all()
+
+    def get(self, url):
+        response = self.client.get(url)
+        if response.status_code != 200:
+            raise RuntimeError(f'GET {url} returned {response.status_code}')
+        return response
+
+
+def _tournament(tournament_id):
+    return Tournament.query.filter_by(tournament_id=tournament_id).one()
+
+
+@benchmark('swiss_pairings')
+def swiss_pairings(context):
+    tournament_id = context.fixture(TournamentFormat.SWISS)
+    return lambda: _tournament(tournament_id).get_swiss_pairings()
+
+
+@benchmark('round_robin_pairings')
+def round_robin_pairings(context):
+    tournament_id = context.fixture(TournamentFormat.ROUND_ROBIN)
+    return lambda: _tournament(tournament_id).get_round_robin_pairings()
+
+
+def _submit_result(context, tournament_id, next_pair):
+    def run(pair):
+        player1, player2 = pair
+        response = context.client.post(
+            f'/tournaments/{tournament_id}/submit_result',
+            data={'player1': player1, 'player2': player2, 'score': '2-1'}
+        )
+        if response.status_code != 302:
+            raise RuntimeError(f'submit_result failed: {response.get_data(as_text=True)[:200]}')
+    return next_pair, run
+
+
+@benchmark('submit_result_swiss')
+def submit_result_swiss(context):
+    tournament_id = context.fixture(TournamentFormat.SWISS)
+    pending = []
+
+    def next_pair():
+        # Pair the next round whenever this one runs out
+        if not pending:
+            _, _, reported = load_round_state(tournament_id)
+            pending.extend(
+                (player1.player, player2.player)
+                for player1, player2 in _tournament(tournament_id).get_swiss_pairings()
+                if player2 is not None and player1.player not in reported and player2.player not in reported
+            )
+        return pending.pop()
+    return _submit_result(context, tournament_id, next_pair)
+
+
+@benchmark('submit_result_elimination')
+def submit_result_elimination(context):
+    tournament_id = context.fixture(TournamentFormat.DOUBLE_ELIMINATION)
+
+    def next_pair():
+        # Inner joins skip byes and undecided slots
+        player1, player2 = db.aliased(Contestant), db.aliased(Contestant)
+        match = db.session.query(player1.player, player2.player).select_from(BracketMatch).join(
+            player1, player1.id == BracketMatch.player1
+        ).join(
+            player2, player2.id == BracketMatch.player2
+        ).filter(
+            BracketMatch.tournament_id == tournament_id,
+            BracketMatch.state == 'PENDING'
+        ).order_by(BracketMatch.stage, BracketMatch.position).first()
+        return tuple(match)
+    return _submit_result(context, tournament_id, next_pair)
+
+
+@benchmark('check_round_completion')
+def check_round_completion_benchmark(context):
+    tournament_id = context.fixture(TournamentFormat.ROUND_ROBIN)
+    return lambda: check_round_completion(tournament_id)
+
+
+@benchmark('rebuild_ratings')
+def rebuild_ratings_benchmark(context):
+    # Replays every match in the database
+    return rebuild_ratings
+
+
+@benchmark('bracket')
+def bracket_page(context):
+    tournament_id = context.fixture(TournamentFormat.DOUBLE_ELIMINATION)
+    return lambda: context.get(f'/tournaments/{tournament_id}/bracket')
+
+
+@benchmark('player_stats')
+def player_stats_page(context):
+    # The player with the longest history
+    player = db.session.query(Contestant.player).join(
+        MatchResult, MatchResult.player1_id == Contestant.id
+    ).group_by(Contestant.player).order_by(db.func.count().desc()).limit(1).scalar()
+    return lambda: context.get(f'/player/{player}')
+
+
+@benchmark('index')
+def index_page(context):
+    return lambda: context.get('/')
+
+
+@benchmark('tournaments')
+def tournaments_page(context):
+    return lambda: context.get('/tournaments')
+
+
+def run_benchmark(context, name, iterations):
+    with context.app.app_context():
+        spec = BENCHMARKS[name](context)
+        prepare, run = spec if isinstance(spec, tuple) else (None, spec)
+        timings, queries = [], []
+        # The first call is a warm-up: imports, template compilation, first connection
+        for sample in range(iterations + 1):
+            context.reset_caches()
+            args = (prepare(),) if prepare else ()
+            with count_queries() as counter:
+                started = time.perf_counter()
+                run(*args)
+                elapsed = (time.perf_counter() - started) * 1000
+            if sample:
+                timings.append(elapsed)
+                queries.append(counter.count)
+        db.session.remove()
+    return {
+        'p50_ms': round(percentile(timings, 0.5), 3),
+        'p90_ms': round(percentile(timings, 0.9), 3),
+        'p99_ms': round(percentile(timings, 0.99), 3),
+        'max_ms': round(max(timings), 3),
+        'queries': statistics.median_low(queries),
+    }
+
+
+def compare(results, baseline, preset, tolerance):
+    """Regression messages for ``results`` against a saved baseline."""
+    failures = []
+    same_preset = baseline.get('preset') == preset
+    for name, result in results.items():
+        expected = baseline.get('results', {}).get(name)
+        if expected is None:
+            continue
+        if result['queries'] > expected['queries']:
+            failures.append(f"{name}: {result['queries']} SQL statements, baseline {expected['queries']}")
+        if same_preset and result['p50_ms'] > expected['p50_ms'] * (1 + tolerance):
+            failures.append(f"{name}: median {result['p50_ms']:.2f} ms, baseline {expected['p50_ms']:.2f} ms")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the hot paths against a synthetic database.')
+    parser.add_argument('--preset', choices=sorted(PRESETS), default='small')
+    parser.add_argument('--db', help='Generated database to use (default benchmarks/data/<preset>.db, built if missing).')
+    parser.add_argument('--iterations', type=int, default=30)
+    parser.add_argument('--only', action='append', choices=sorted(BENCHMARKS), help='Run only these benchmarks.')
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true', help='Record this run as the new baseline.')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help=f'Allowed median slowdown before failing (default {DEFAULT_TOLERANCE:.0%}).')
+    args = parser.parse_args(argv)
+
+    source = args.db or database_path(args.preset)
+    if not os.path.exists(source):
+        print(f'Generating {source} ...')
+        generate(source, args.preset)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        # Benchmarks write results, so work on a copy
+        path = os.path.join(workdir, 'benchmark.db')
+        shutil.copyfile(source, path)
+        app = create_app({'SQLALCHEMY_DATABASE_URI': f'sqlite:///{path}', 'SECRET_KEY': 'benchmark'})
+        context = Context(app, args.preset)
+        print(f"{'benchmark':<28}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}{'queries':>9}")
+        for name in args.only or BENCHMARKS:
+            result = results[name] = run_benchmark(context, name, args.iterations)
+            print(f"{name:<28}{result['p50_ms']:>10.2f}{result['p90_ms']:>10.2f}"
+                  f"{result['p99_ms']:>10.2f}{result['max_ms']:>10.2f}{result['queries']:>9}")
+        with app.app_context():
+            db.engine.dispose()
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump({
+                'preset': args.preset,
+                'iterations': args.iterations,
+                'python': platform.python_version(),
+                'results': results,
+            }, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f'Saved baseline to {args.baseline}')
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print('No baseline to compare with; run with --save-baseline to record one.')
+        return 0
+    with open(args.baseline) as f:
+        failures = compare(results, json.load(f), args.preset, args.tolerance)
+    for failure in failures:
+        print(f'REGRESSION {failure}')
+    if not failures:
+        print('No regressions against the baseline.')
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
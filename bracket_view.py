@@ -0,0 +1,211 @@
+import threading
+from collections import defaultdict
+
+import elimination
+
+
+def _split_score(match):
+    """Split a stored 'X-Y' score into its two halves, '-' when there is none."""
+    if not match.score:
+        return '-', '-'
+    parts = match.score.split('-')
+    if match.player2 is None or len(parts) != 2:
+        return parts[0], '-'
+    return parts[0], parts[1]
+
+
+def match_entry(match):
+    """Flatten a MatchResult into a plain dict so it can outlive the session."""
+    score1, score2 = _split_score(match)
+    return {
+        'round_number': match.round_number,
+        'player1': match.player1,
+        'player2': match.player2,
+        'winner': match.winner,
+        'is_draw': bool(match.is_draw),
+        'score1': score1,
+        'score2': score2,
+    }
+
+
+def _single_elimination_title(round_number, max_round):
+    if round_number == max_round:
+        return 'Finals'
+    if round_number == max_round - 1:
+        return 'Semi-Finals'
+    return f'Round {round_number}'
+
+
+def _display(player, names):
+    """Slot label: None is an undecided slot and elimination.BYE a bye; players are looked up in ``names``."""
+    if player is None:
+        return 'TBD'
+    if player == elimination.BYE:
+        return 'BYE'
+    return names[player]
+
+
+def bracket_entry(match, names):
+    """Flatten a bracket match (elimination.py) into a plain dict for templates and JSON.
+
+    ``names`` maps the contestant ids in the match to player names.
+    """
+    score1, score2 = _split_score(match)
+    return {
+        'position': match.position,
+        'bracket': match.bracket,
+        'round_number': match.round_number,
+        'stage': match.stage,
+        'state': match.state,
+        'player1': _display(match.player1, names),
+        'player2': _display(match.player2, names),
+        'winner': _display(match.winner, names) if match.winner is not None else None,
+        'is_draw': False,
+        'score1': score1,
+        'score2': score2,
+    }
+
+
+def _bracket_rounds(matches, names, title):
+    by_round = defaultdict(list)
+    for match in matches:
+        if match.state != elimination.SKIPPED:
+            by_round[match.round_number].append(bracket_entry(match, names))
+    last = max(by_round) if by_round else 0
+    return [
+        {'number': number, 'title': title(number, last), 'matches': by_round[number]}
+        for number in sorted(by_round)
+    ]
+
+
+def _winners_title(round_number, last):
+    return 'Winners Finals' if round_number == last else f'Winners Round {round_number}'
+
+
+def _losers_title(round_number, last):
+    return 'Losers Finals' if round_number == last else f'Losers Round {round_number}'
+
+
+def _finals_title(round_number, last):
+    return 'Grand Finals' if round_number == 1 else 'Grand Finals Reset'
+
+
+def _result_rounds(matches, title):
+    """Played matches grouped by round; ``title(round_number)`` gives the heading and None skips the round."""
+    by_round = defaultdict(list)
+    for match in matches:
+        by_round[match.round_number].append(dict(match_entry(match), player2=match.player2 or 'BYE'))
+    rounds = []
+    for number in sorted(by_round):
+        heading = title(number)
+        if heading is not None:
+            rounds.append({'number': number, 'title': heading, 'matches': by_round[number]})
+    return rounds
+
+
+def _legacy_rounds(tournament, matches, max_round):
+    """Rounds of an elimination event without a saved bracket, drawn from its results as before.
+
+    Double elimination alternated winners (odd) and losers (even) rounds.
+    """
+    if not tournament.is_double_elimination:
+        return {'rounds': _result_rounds(
+            matches, lambda number: _single_elimination_title(number, max_round)
+        )}
+    return {
+        'winners_rounds': _result_rounds(
+            matches, lambda number: f'Winners Round {number // 2 + 1}' if number % 2 else None
+        ),
+        'losers_rounds': _result_rounds(
+            matches, lambda number: None if number % 2 else f'Losers Round {number // 2}'
+        ),
+    }
+
+
+def build_bracket_view(tournament, matches, player_scores=None, bracket=None, names=None):
+    """Build the view model for the bracket page in a single pass.
+
+    Elimination formats are drawn from ``bracket``, the laid-out bracket
+    matches (see elimination.py) with ``names`` mapping their contestant ids
+    to player names, so rounds still to be played show up with their known
+    players. Elimination events played before brackets were saved have no
+    ``bracket`` and are drawn from ``matches``. Other formats show
+    ``player_scores``. Returns a plain dict the template can walk without
+    re-scanning anything.
+    """
+    max_round = max((match.round_number for match in matches), default=0)
+    view = {
+        'max_round_number': max_round,
+        'rounds': [],
+        'winners_rounds': [],
+        'losers_rounds': [],
+        'finals_rounds': [],
+        'player_scores': player_scores,
+    }
+    if not tournament.is_elimination_format:
+        return view
+    if not bracket:
+        view.update(_legacy_rounds(tournament, matches, max_round))
+        return view
+
+    sides = defaultdict(list)
+    for match in bracket:
+        sides[match.bracket].append(match)
+    if tournament.is_double_elimination:
+        view['winners_rounds'] = _bracket_rounds(sides[elimination.WINNERS], names, _winners_title)
+        view['losers_rounds'] = _bracket_rounds(sides[elimination.LOSERS], names, _losers_title)
+        view['finals_rounds'] = _bracket_rounds(sides[elimination.FINALS], names, _finals_title)
+    else:
+        view['rounds'] = _bracket_rounds(sides[elimination.WINNERS], names, _single_elimination_title)
+    return view
+
+
+class BracketCache:
+    """Per-tournament cache of bracket view models.
+
+    Entries are keyed by tournament and the ``Tournament.revision`` they were
+    built at, so a write from any process makes them miss. Writes in this
+    process also call ``bump``, which drops the entry and moves the version
+    and ``generation`` counters for caches that follow this process's writes.
+    Only the view model is kept: rendered pages carry per-session content
+    such as flash messages.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._versions = {}
+        self._entries = {}
+        self._generation = 0
+
+    def generation(self):
+        with self._lock:
+            return self._generation
+
+    def version(self, tournament_id):
+        with self._lock:
+            return self._versions.get(tournament_id, 0)
+
+    def bump(self, tournament_id):
+        with self._lock:
+            self._versions[tournament_id] = self._versions.get(tournament_id, 0) + 1
+            self._entries.pop(tournament_id, None)
+            self._generation += 1
+
+    def get(self, tournament_id, revision):
+        """Return the view cached at this revision of the tournament, else None."""
+        with self._lock:
+            entry = self._entries.get(tournament_id)
+            if entry is None or entry[0] != revision:
+                return None
+            return entry[1]
+
+    def store(self, tournament_id, revision, view):
+        """Cache a view built from the tournament at ``revision``."""
+        with self._lock:
+            self._entries[tournament_id] = (revision, view)
+
+    def clear(self):
+        with self._lock:
+            self._versions.clear()
+            self._entries.clear()
+            self._generation += 1
@@ -0,0 +1,254 @@
+"""Single- and double-elimination brackets laid out as a flat array of matches.
+
+The whole bracket is built once from the seeded player list: players are
+placed by standard seeding (1 v 16, 8 v 9, ...), byes go to the top seeds,
+and every match records where its winner goes and, in double elimination,
+where its loser drops to in the losers bracket. Recording a result then only
+touches that match and the one or two matches it feeds, so advancing is O(1).
+
+Each match carries:
+
+- ``position``: index in the array
+- ``bracket``: ``WINNERS``, ``LOSERS`` or ``FINALS`` (grand final and reset)
+- ``round_number``: round within its bracket
+- ``stage``: the earliest tournament round it can be played in, one more than
+  the latest match feeding it; the tournament's current round is the lowest
+  stage with a match still to play
+- ``player1``/``player2``: a player (any non-zero id, the app uses contestant
+  ids), None while undecided, or ``BYE``
+- ``winner``/``loser``/``score`` and ``state`` (``PENDING``, ``PLAYED``,
+  ``BYE`` for walkovers, ``SKIPPED`` for an unneeded grand final reset)
+- ``winner_to``/``winner_slot`` and ``loser_to``/``loser_slot``: where the
+  players go next (slot 1 or 2), None when they leave the bracket
+
+Functions work on any objects with these attributes, so the app can use its
+``BracketMatch`` rows directly and SQLAlchemy writes back only what changed.
+"""
+WINNERS = 'W'
+LOSERS = 'L'
+FINALS = 'F'
+
+PENDING = 'PENDING'
+PLAYED = 'PLAYED'
+BYE_STATE = 'BYE'
+SKIPPED = 'SKIPPED'
+
+BYE = 0  # Slot value for "no opponent"; None means not decided yet
+
+FIELDS = (
+    'position', 'bracket', 'round_number', 'stage', 'player1', 'player2',
+    'winner', 'loser', 'score', 'state', 'winner_to', 'winner_slot', 'loser_to', 'loser_slot'
+)
+
+
+class BracketSlotMatch:
+    """In-memory match used while building a bracket."""
+    __slots__ = FIELDS
+
+    def __init__(self, position, bracket, round_number):
+        self.position = position
+        self.bracket = bracket
+        self.round_number = round_number
+        self.stage = 1
+        self.player1 = self.player2 = None
+        self.winner = self.loser = self.score = None
+        self.state = PENDING
+        self.winner_to = self.winner_slot = None
+        self.loser_to = self.loser_slot = None
+
+    def as_dict(self):
+        return {field: getattr(self, field) for field in FIELDS}
+
+
+def bracket_size(player_count):
+    """Smallest power of two holding every player (at least 2)."""
+    return 1 << max(1, (player_count - 1).bit_length())
+
+
+def seeding_order(size):
+    """Seed numbers in bracket order, so seeds 1 and 2 can only meet in the final."""
+    order = [1]
+    while len(order) < size:
+        total = len(order) * 2 + 1
+        order = [seed for top in order for seed in (top, total - top)]
+    return order
+
+
+def stage_count(player_count, double=False):
+    """Number of tournament rounds a bracket for ``player_count`` players takes at most."""
+    rounds = bracket_size(player_count).bit_length() - 1
+    # Double elimination: winners final, losers bracket, grand final and reset
+    return 2 * rounds + 1 if double else rounds
+
+
+def _link(matches, source, target, slot, loser=False):
+    if loser:
+        matches[source].loser_to, matches[source].loser_slot = target, slot
+    else:
+        matches[source].winner_to, matches[source].winner_slot = target, slot
+    matches[target].stage = max(matches[target].stage, matches[source].stage + 1)
+
+
+def build(players, double=False):
+    """Lay out the bracket for ``players`` (best seed first) and play out the byes.
+
+    Returns the list of matches, indexed by position.
+    """
+    if len(players) < 2:
+        raise ValueError('An elimination bracket needs at least 2 players')
+    size = bracket_size(len(players))
+    rounds = size.bit_length() - 1
+    matches = []
+
+    def add(bracket, round_number, count):
+        start = len(matches)
+        matches.extend(BracketSlotMatch(start + i, bracket, round_number) for i in range(count))
+        return list(range(start, start + count))
+
+    winners = [add(WINNERS, r, size >> r) for r in range(1, rounds + 1)]
+    for r in range(rounds - 1):
+        for i, position in enumerate(winners[r]):
+            _link(matches, position, winners[r + 1][i // 2], i % 2 + 1)
+
+    if double:
+        losers = []
+        for l in range(1, 2 * (rounds - 1) + 1):
+            losers.append(add(LOSERS, l, size >> ((l + 1) // 2 + 1)))
+        if losers:
+            # First-round losers pair up
+            for i, position in enumerate(winners[0]):
+                _link(matches, position, losers[0][i // 2], i % 2 + 1, loser=True)
+            for l in range(1, len(losers) + 1):
+                current = losers[l - 1]
+                if l % 2 == 0:
+                    # Losers dropping from winners round l/2 + 1 meet this round's
+                    # survivors; alternate the order so early rematches are avoided
+                    dropping = winners[l // 2]
+                    order = dropping[::-1] if (l // 2) % 2 == 1 else dropping
+                    for i, position in enumerate(order):
+                        _link(matches, position, current[i], 2, loser=True)
+                if l < len(losers):
+                    following = losers[l]
+                    for i, position in enumerate(current):
+                        if l % 2 == 1:
+                            _link(matches, position, following[i], 1)
+                        else:
+                            _link(matches, position, following[i // 2], i % 2 + 1)
+        grand_final, reset = add(FINALS, 1, 1)[0], add(FINALS, 2, 1)[0]
+        _link(matches, winners[-1][0], grand_final, 1)
+        if losers:
+            _link(matches, losers[-1][0], grand_final, 2)
+        else:
+            _link(matches, winners[-1][0], grand_final, 2, loser=True)
+        # The reset is only played if the losers bracket champion wins the grand final
+        matches[reset].stage = matches[grand_final].stage + 1
+
+    changed = set()
+    order = seeding_order(size)
+    for i, position in enumerate(winners[0]):
+        for slot, seed in ((1, order[2 * i]), (2, order[2 * i + 1])):
+            _place(matches, position, slot, players[seed - 1] if seed <= len(players) else BYE, changed)
+    return matches
+
+
+def _place(matches, position, slot, player, changed):
+    match = matches[position]
+    setattr(match, f'player{slot}', player)
+    changed.add(position)
+    _settle(matches, match, changed)
+
+
+def _settle(matches, match, changed):
+    """Advance a player past a bye once both sides of a match are known."""
+    if match.state != PENDING or match.player1 is None or match.player2 is None:
+        return
+    if match.player1 != BYE and match.player2 != BYE:
+        return
+    winner = match.player2 if match.player1 == BYE else match.player1
+    _finish(matches, match, winner, BYE, BYE_STATE, changed)
+
+
+def _finish(matches, match, winner, loser, state, changed):
+    match.winner, match.loser, match.state = winner, loser, state
+    changed.add(match.position)
+    if match.bracket == FINALS and match.round_number == 1:
+        reset = matches[match.position + 1]
+        if winner == match.player2 and loser != BYE:
+            # Both players now have one loss: play the reset
+            reset.player1, reset.player2 = match.player1, match.player2
+        else:
+            reset.state = SKIPPED
+        changed.add(reset.position)
+        return
+    if match.winner_to is not None:
+        _place(matches, match.winner_to, match.winner_slot, winner, changed)
+    if match.loser_to is not None:
+        _place(matches, match.loser_to, match.loser_slot, loser, changed)
+
+
+def player_index(matches):
+    """Map each player to the match they are waiting for or due to play."""
+    index = {}
+    for match in matches:
+        if match.state == PENDING:
+            for player in (match.player1, match.player2):
+                if player:
+                    index[player] = match
+    return index
+
+
+def is_ready(match):
+    """Both players are known and the match has not been played."""
+    return match.state == PENDING and bool(match.player1) and bool(match.player2)
+
+
+def record(matches, match, winner, score=None):
+    """Record ``winner`` of a ready match and move both players on.
+
+    Returns (positions changed, whether the loser is out of the tournament).
+    """
+    if not is_ready(match):
+        raise ValueError('This match is not ready to be played')
+    if winner not in (match.player1, match.player2):
+        raise ValueError(f'{winner} is not playing in this match')
+    loser = match.player2 if winner == match.player1 else match.player1
+    match.score = score
+    changed = set()
+    _finish(matches, match, winner, loser, PLAYED, changed)
+    # A grand final loss by the winners bracket champion only forces the reset
+    eliminated = match.loser_to is None and not (
+        match.bracket == FINALS and match.round_number == 1 and loser == match.player1
+    )
+    return changed, eliminated
+
+
+def withdraw(matches, player):
+    """Replace a withdrawn player with a bye in their current match. Returns positions changed."""
+    match = player_index(matches).get(player)
+    changed = set()
+    if match is None:
+        return changed
+    slot = 1 if match.player1 == player else 2
+    if match.bracket == FINALS and match.round_number == 2:
+        # Withdrawing from the reset hands the title to the opponent
+        opponent = match.player2 if slot == 1 else match.player1
+        _finish(matches, match, opponent, BYE, BYE_STATE, changed)
+        return changed
+    _place(matches, match.position, slot, BYE, changed)
+    return changed
+
+
+def current_stage(matches):
+    """The lowest stage with a match still to be played, or None once the bracket is decided."""
+    stages = [match.stage for match in matches if match.state == PENDING]
+    return min(stages) if stages else None
+
+
+def champion(matches):
+    """The bracket winner, or None while matches remain."""
+    if current_stage(matches) is not None:
+        return None
+    last = matches[-1]
+    if last.bracket == FINALS and last.state == SKIPPED:
+        last = matches[-2]
+    return last.winner or None
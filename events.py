@@ -0,0 +1,125 @@
+"""In-process publish/subscribe for live tournament updates over Server-Sent Events.
+
+Writes publish small JSON deltas per tournament; each open
+``/tournaments/<id>/events`` stream holds a subscription and relays them, so
+one write fans out to every spectator instead of each of them polling the
+full page. The broker lives in process memory: with several worker processes
+a client only sees events published by the worker it is connected to.
+
+Every event gets a per-tournament sequence number used as the SSE ``id``.
+Pages embed the latest one when they render and open their stream from it,
+and a reconnecting client sends it back as ``Last-Event-ID``; either way the
+client is replayed what it missed from a short backlog; if the gap is larger than the backlog, or the
+client falls too far behind, it gets a ``reset`` event and reloads the page.
+"""
+import json
+import queue
+import threading
+from collections import deque
+
+BACKLOG_SIZE = 100
+SUBSCRIBER_QUEUE_SIZE = 256
+HEARTBEAT_SECONDS = 15
+
+
+def format_sse(event, data, event_id=None):
+    """Encode one event in the text/event-stream wire format."""
+    lines = []
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    lines.append(f'event: {event}')
+    payload = json.dumps(data, separators=(',', ':'), default=str)
+    lines.extend(f'data: {line}' for line in payload.splitlines())
+    return '\n'.join(lines) + '\n\n'
+
+
+class Subscription:
+    """One client's queue of encoded events."""
+
+    def __init__(self, broker, tournament_id):
+        self.broker = broker
+        self.tournament_id = tournament_id
+        self.queue = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.overflowed = False
+
+    def put(self, message):
+        try:
+            self.queue.put_nowait(message)
+        except queue.Full:
+            # Too slow to keep up; it will be told to reload instead
+            self.overflowed = True
+
+    def stream(self, heartbeat=HEARTBEAT_SECONDS):
+        """Yield encoded events until the client goes away, with periodic keep-alives."""
+        try:
+            while not self.overflowed:
+                try:
+                    yield self.queue.get(timeout=heartbeat)
+                except queue.Empty:
+                    yield ': keep-alive\n\n'
+            yield format_sse('reset', {})
+        finally:
+            self.broker.unsubscribe(self)
+
+
+class EventBroker:
+    """Fan tournament events out to every open subscription for that tournament."""
+
+    def __init__(self, backlog_size=BACKLOG_SIZE):
+        self._lock = threading.Lock()
+        self._backlog_size = backlog_size
+        self._subscribers = {}
+        self._sequences = {}
+        self._backlogs = {}
+
+    def publish(self, tournament_id, event, data):
+        """Send ``data`` as ``event`` to every subscriber of the tournament; return its id."""
+        with self._lock:
+            event_id = self._sequences.get(tournament_id, 0) + 1
+            self._sequences[tournament_id] = event_id
+            message = format_sse(event, data, event_id)
+            backlog = self._backlogs.setdefault(tournament_id, deque(maxlen=self._backlog_size))
+            backlog.append((event_id, message))
+            subscribers = list(self._subscribers.get(tournament_id, ()))
+        for subscription in subscribers:
+            subscription.put(message)
+        return event_id
+
+    def last_event_id(self, tournament_id):
+        """Id of the tournament's latest event; a page rendered now has seen everything up to it."""
+        with self._lock:
+            return self._sequences.get(tournament_id, 0)
+
+    def subscribe(self, tournament_id, last_event_id=None):
+        """Open a subscription, first queueing anything missed since ``last_event_id``."""
+        subscription = Subscription(self, tournament_id)
+        with self._lock:
+            self._subscribers.setdefault(tournament_id, set()).add(subscription)
+            current = self._sequences.get(tournament_id, 0)
+            if last_event_id is not None and last_event_id < current:
+                backlog = self._backlogs.get(tournament_id, ())
+                missed = [message for event_id, message in backlog if event_id > last_event_id]
+                if len(missed) == current - last_event_id:
+                    for message in missed:
+                        subscription.put(message)
+                else:
+                    subscription.put(format_sse('reset', {}))
+            elif last_event_id is not None and last_event_id > current:
+                # The server restarted since the client last heard from it
+                subscription.put(format_sse('reset', {}))
+            subscription.put(format_sse('hello', {'last_event_id': current}))
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.tournament_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.tournament_id]
+
+    def subscriber_count(self, tournament_id=None):
+        with self._lock:
+            if tournament_id is not None:
+                return len(self._subscribers.get(tournament_id, ()))
+            return sum(len(subscribers) for subscribers in self._subscribers.values())
@@ -0,0 +1,314 @@
+"""Request-level SQL statement counting, timing metrics and on-demand profiling.
+
+Statements executed on the engine are counted and timed by whichever
+counters are active on the current thread: one per request while
+``INSTRUMENTATION`` or ``QUERY_COUNT_HEADER`` is on (installed by
+``install_query_counter``), plus any opened with ``count_queries()``, which
+also keeps each statement and its parameters, e.g.
+
+    with count_queries() as queries:
+        client.get('/')
+    assert queries.count <= 4, queries.statements
+
+``install_instrumentation`` adds the opt-in parts, each off by default so a
+normal server does no extra work per request:
+
+- ``INSTRUMENTATION``: per-request wall time, statement count and database
+  time as a ``Server-Timing`` header (shown in the browser's network panel),
+  and ``/metrics`` in the Prometheus text format.
+- ``PROFILE_REQUESTS``: profile any request sent with ``?profile=1`` from an
+  address in ``PROFILE_ADDRESSES`` (this machine by default, as every
+  profile is a file written to disk); ``PROFILE_ENDPOINTS`` lists endpoints
+  (e.g. ``main.bracket``) to profile on every request. Profiles are written
+  to ``PROFILE_DIR`` with cProfile, or pyinstrument if
+  ``PROFILER = 'pyinstrument'`` and it is installed.
+"""
+import cProfile
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from flask import Response, current_app, g, request
+from sqlalchemy import event
+
+_local = threading.local()
+_ENVIRON_KEY = 'tourneyman.query_counter'
+
+DEFAULTS = {
+    'INSTRUMENTATION': False,
+    'PROFILE_REQUESTS': False,
+    'PROFILE_ENDPOINTS': (),
+    'PROFILE_ADDRESSES': ('127.0.0.1', '::1'),  # Clients allowed to ask for ?profile=1
+    'PROFILE_DIR': None,  # Default: <instance folder>/profiles
+    'PROFILER': 'cprofile',  # or 'pyinstrument'
+}
+
+# Request duration histogram buckets, in seconds
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class QueryCounter:
+    def __init__(self, collect_statements=False):
+        self.count = 0
+        self.duration = 0.0  # Seconds spent executing statements
+        self.statements = [] if collect_statements else None
+
+    def record(self, statement, parameters):
+        self.count += 1
+        if self.statements is not None:
+            self.statements.append((statement, parameters))
+
+
+def _active_counters():
+    counters = getattr(_local, 'counters', None)
+    if counters is None:
+        counters = _local.counters = []
+    return counters
+
+
+@contextmanager
+def count_queries():
+    """Count and collect the SQL statements (with their parameters) executed on this thread inside the block."""
+    counter = QueryCounter(collect_statements=True)
+    _active_counters().append(counter)
+    try:
+        yield counter
+    finally:
+        _active_counters().remove(counter)
+
+
+def current_request_queries():
+    """The counter for the request being handled, or None outside a request."""
+    return request.environ.get(_ENVIRON_KEY)
+
+
+def install_query_counter(app, engine):
+    """Count statements per request while ``INSTRUMENTATION`` or ``QUERY_COUNT_HEADER`` is on.
+
+    ``QUERY_COUNT_HEADER`` exposes the count as X-Query-Count.
+    """
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def record_statement(conn, cursor, statement, parameters, context, executemany):
+        counters = _active_counters()
+        for counter in counters:
+            counter.record(statement, parameters)
+        if counters:
+            conn.info['tourneyman.query_started'] = time.perf_counter()
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def record_duration(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.pop('tourneyman.query_started', None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        for counter in _active_counters():
+            counter.duration += elapsed
+
+    @app.before_request
+    def start_request_counter():
+        if not (app.config.get('INSTRUMENTATION') or app.config.get('QUERY_COUNT_HEADER')):
+            return
+        counter = QueryCounter()
+        request.environ[_ENVIRON_KEY] = counter
+        _active_counters().append(counter)
+
+    @app.after_request
+    def report_request_counter(response):
+        counter = current_request_queries()
+        if counter is not None and app.config.get('QUERY_COUNT_HEADER'):
+            response.headers['X-Query-Count'] = str(counter.count)
+        return response
+
+    @app.teardown_request
+    def stop_request_counter(exc):
+        counter = request.environ.pop(_ENVIRON_KEY, None)
+        if counter is not None and counter in _active_counters():
+            _active_counters().remove(counter)
+
+
+def _escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(**labels):
+    return '{' + ','.join(f'{key}="{_escape_label(value)}"' for key, value in labels.items()) + '}'
+
+
+class RequestMetrics:
+    """Per-endpoint request counts, latency histograms, SQL statements and database time."""
+
+    def __init__(self, buckets=DURATION_BUCKETS):
+        self._lock = threading.Lock()
+        self._buckets = buckets
+        self._requests = {}  # (endpoint, method, status) -> count
+        self._endpoints = {}  # endpoint -> [bucket counts, count, seconds, statements, db seconds]
+        self._gauges = []
+
+    def gauge(self, name, description, read):
+        """Report ``read()`` as a gauge on every scrape."""
+        self._gauges.append((name, description, read))
+
+    def observe(self, endpoint, method, status, seconds, statements, db_seconds):
+        with self._lock:
+            key = (endpoint, method, status)
+            self._requests[key] = self._requests.get(key, 0) + 1
+            totals = self._endpoints.get(endpoint)
+            if totals is None:
+                totals = self._endpoints[endpoint] = [[0] * len(self._buckets), 0, 0.0, 0, 0.0]
+            for i, bound in enumerate(self._buckets):
+                if seconds <= bound:
+                    totals[0][i] += 1
+            totals[1] += 1
+            totals[2] += seconds
+            totals[3] += statements
+            totals[4] += db_seconds
+
+    def render(self):
+        """The metrics in the Prometheus text exposition format."""
+        with self._lock:
+            requests = sorted(self._requests.items())
+            endpoints = sorted((name, [list(t[0])] + t[1:]) for name, t in self._endpoints.items())
+        lines = [
+            '# HELP tourneyman_requests_total Requests handled, by endpoint, method and status.',
+            '# TYPE tourneyman_requests_total counter',
+        ]
+        lines.extend(
+            f'tourneyman_requests_total{_labels(endpoint=e, method=m, status=s)} {count}'
+            for (e, m, s), count in requests
+        )
+        lines += [
+            '# HELP tourneyman_request_duration_seconds Wall time spent handling requests.',
+            '# TYPE tourneyman_request_duration_seconds histogram',
+        ]
+        for endpoint, (buckets, count, seconds, _, _) in endpoints:
+            for bound, observed in zip(self._buckets, buckets):
+                lines.append(f'tourneyman_request_duration_seconds_bucket{_labels(endpoint=endpoint, le=bound)} {observed}')
+            lines.append(f'tourneyman_request_duration_seconds_bucket{_labels(endpoint=endpoint, le="+Inf")} {count}')
+            lines.append(f'tourneyman_request_duration_seconds_sum{_labels(endpoint=endpoint)} {seconds:.6f}')
+            lines.append(f'tourneyman_request_duration_seconds_count{_labels(endpoint=endpoint)} {count}')
+        lines += [
+            '# HELP tourneyman_sql_statements_total SQL statements executed while handling requests.',
+            '# TYPE tourneyman_sql_statements_total counter',
+        ]
+        lines.extend(f'tourneyman_sql_statements_total{_labels(endpoint=e)} {t[3]}' for e, t in endpoints)
+        lines += [
+            '# HELP tourneyman_db_seconds_total Time spent executing SQL statements while handling requests.',
+            '# TYPE tourneyman_db_seconds_total counter',
+        ]
+        lines.extend(f'tourneyman_db_seconds_total{_labels(endpoint=e)} {t[4]:.6f}' for e, t in endpoints)
+        for name, description, read in self._gauges:
+            lines += [f'# HELP {name} {description}', f'# TYPE {name} gauge', f'{name} {read()}']
+        return '\n'.join(lines) + '\n'
+
+
+def _profile_path(app, endpoint, extension):
+    directory = app.config['PROFILE_DIR'] or os.path.join(app.instance_path, 'profiles')
+    os.makedirs(directory, exist_ok=True)
+    stamp = time.strftime('%Y%m%d-%H%M%S')
+    return os.path.join(directory, f"{endpoint or 'unknown'}-{stamp}-{os.getpid()}-{threading.get_ident()}.{extension}")
+
+
+class _Profile:
+    """A running cProfile or pyinstrument profile of one request."""
+
+    def __init__(self, kind):
+        self.kind = kind
+        if kind == 'pyinstrument':
+            from pyinstrument import Profiler
+            self.profiler = Profiler()
+            self.profiler.start()
+        else:
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+
+    def save(self, app, endpoint):
+        """Stop profiling and write the result; returns the file name."""
+        if self.kind == 'pyinstrument':
+            self.profiler.stop()
+            path = _profile_path(app, endpoint, 'html')
+            with open(path, 'w') as f:
+                f.write(self.profiler.output_html())
+        else:
+            self.profiler.disable()
+            path = _profile_path(app, endpoint, 'prof')  # Open with snakeviz or pstats
+            self.profiler.dump_stats(path)
+        return os.path.basename(path)
+
+
+def install_instrumentation(app, metrics_gauges=()):
+    """Install whichever of timing metrics and profiling are enabled in ``app.config``.
+
+    ``metrics_gauges`` is a list of (name, description, read) added to /metrics.
+    Call after ``install_query_counter``; does nothing when both are off.
+    """
+    for key, value in DEFAULTS.items():
+        app.config.setdefault(key, value)
+    timing = bool(app.config['INSTRUMENTATION'])
+    profile_endpoints = set(app.config['PROFILE_ENDPOINTS'] or ())
+    profile_addresses = set(app.config['PROFILE_ADDRESSES'] or ())
+    profiling = bool(app.config['PROFILE_REQUESTS']) or bool(profile_endpoints)
+    if not timing and not profiling:
+        return None
+
+    profiler_kind = app.config['PROFILER']
+    if profiler_kind == 'pyinstrument':
+        try:
+            import pyinstrument  # noqa: F401
+        except ImportError:
+            app.logger.warning('pyinstrument is not installed; profiling with cProfile instead')
+            profiler_kind = 'cprofile'
+
+    metrics = RequestMetrics() if timing else None
+    for gauge in metrics_gauges if timing else ():
+        metrics.gauge(*gauge)
+
+    @app.before_request
+    def start_instrumentation():
+        g.instrumentation_started = time.perf_counter()
+        if profiling and (
+            request.endpoint in profile_endpoints
+            or (app.config['PROFILE_REQUESTS'] and request.args.get('profile') == '1'
+                and request.remote_addr in profile_addresses)
+        ):
+            g.instrumentation_profile = _Profile(profiler_kind)
+
+    @app.after_request
+    def finish_instrumentation(response):
+        started = g.pop('instrumentation_started', None)
+        if started is None:
+            return response
+        profile = g.pop('instrumentation_profile', None)
+        if profile is not None:
+            response.headers['X-Profile'] = profile.save(app, request.endpoint)
+        if metrics is None:
+            return response
+        elapsed = time.perf_counter() - started
+        counter = current_request_queries()
+        statements = counter.count if counter is not None else 0
+        db_seconds = counter.duration if counter is not None else 0.0
+        response.headers.add(
+            'Server-Timing',
+            f'app;dur={elapsed * 1000:.1f}, db;dur={db_seconds * 1000:.1f};desc="{statements} SQL"'
+        )
+        if request.endpoint != 'metrics':
+            metrics.observe(request.endpoint or 'unknown', request.method, response.status_code,
+                            elapsed, statements, db_seconds)
+        return response
+
+    if profiling:
+        @app.teardown_request
+        def stop_unfinished_profile(exc):
+            # after_request is skipped when the view raises; keep what was recorded
+            profile = g.pop('instrumentation_profile', None)
+            if profile is not None:
+                profile.save(app, request.endpoint)
+
+    if metrics is not None:
+        def metrics_view():
+            return Response(current_app.extensions['tourneyman.metrics'].render(),
+                            mimetype='text/plain; version=0.0.4')
+        app.extensions['tourneyman.metrics'] = metrics
+        app.add_url_rule('/metrics', 'metrics', metrics_view)
+    return metrics
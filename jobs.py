@@ -0,0 +1,112 @@
+"""Background jobs: a queue table in the app's database worked by in-process threads.
+
+A write that triggers follow-up work, such as clearing a cancelled
+tournament's matches, replaying ratings or building an export, records a job
+row in its own transaction and returns straight away, so the request costs
+the same however much work follows. Because the queue is a table, queued jobs
+survive restarts and any number of processes can share it: a worker claims a
+job with one ``UPDATE ... RETURNING``, so each attempt runs exactly once.
+
+``JobRunner`` runs ``JOB_WORKERS`` worker threads plus a scheduler thread
+that enqueues the periodic jobs in ``JOB_SCHEDULE`` (name -> seconds). Jobs
+with a key are coalesced: enqueueing one while an identical job is still
+queued does nothing, so a burst of writes or several processes scheduling
+the same job leave a single queued job.
+
+A job that raises is retried with exponential backoff until it has been tried
+``JOB_MAX_ATTEMPTS`` times, then marked failed. A job still running after
+``JOB_TIMEOUT`` seconds is assumed to have lost its worker and is requeued.
+Either way a job can run more than once, so every job must be idempotent.
+"""
+import os
+import socket
+import threading
+import time
+
+DEFAULTS = {
+    'JOB_WORKERS': 1,  # 0 leaves the queue to `flask --app app run_jobs`
+    'JOB_POLL_SECONDS': 1.0,  # How often an idle worker checks for due jobs
+    'JOB_MAX_ATTEMPTS': 5,
+    'JOB_RETRY_SECONDS': 10,  # Delay before the first retry; doubles each time
+    'JOB_TIMEOUT': 600,
+    'JOB_RETENTION_DAYS': 7,  # Finished jobs are kept this long for the jobs page
+    'JOB_SCHEDULE': {
+        'update_statuses': 60,
+        'clean_up_jobs': 3600,
+    },
+}
+
+
+def retry_delay(attempts, base):
+    """Seconds to wait before the next try of a job that has failed ``attempts`` times."""
+    return base * 2 ** (attempts - 1)
+
+
+def worker_name():
+    return f'{socket.gethostname()}:{os.getpid()}:{threading.current_thread().name}'
+
+
+class JobRunner:
+    """Worker threads that run due jobs, and a scheduler that enqueues periodic ones.
+
+    ``run_next(worker)`` claims and runs one due job inside an app context,
+    returning False when none is due; ``enqueue(name)`` queues a periodic job
+    (coalesced) and commits.
+    """
+
+    def __init__(self, app, run_next, enqueue):
+        self.app = app
+        self._run_next = run_next
+        self._enqueue = enqueue
+        self._stop = threading.Event()
+        self._threads = []
+
+    def start(self):
+        config = self.app.config
+        for number in range(config['JOB_WORKERS']):
+            self._spawn(self._work, f'job-worker-{number + 1}')
+        if config['JOB_SCHEDULE']:
+            self._spawn(self._schedule, 'job-scheduler')
+
+    def _spawn(self, target, name):
+        thread = threading.Thread(target=target, name=name, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def stop(self, timeout=5.0):
+        """Ask the threads to finish; a job already running completes first."""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _work(self):
+        poll = self.app.config['JOB_POLL_SECONDS']
+        worker = worker_name()
+        while not self._stop.is_set():
+            try:
+                with self.app.app_context():
+                    ran = self._run_next(worker)
+            except Exception:
+                # E.g. the database is locked for longer than the busy timeout
+                self.app.logger.exception('Job worker error')
+                ran = False
+            if not ran:
+                self._stop.wait(poll)
+
+    def _schedule(self):
+        schedule = self.app.config['JOB_SCHEDULE']
+        # Everything is due at startup, e.g. statuses that changed while the server was down
+        next_due = dict.fromkeys(schedule, 0.0)
+        while not self._stop.is_set():
+            now = time.monotonic()
+            for name, interval in schedule.items():
+                if now < next_due[name]:
+                    continue
+                try:
+                    with self.app.app_context():
+                        self._enqueue(name)
+                except Exception:
+                    self.app.logger.exception('Could not schedule job %s', name)
+                next_due[name] = now + interval
+            self._stop.wait(max(0.0, min(next_due.values()) - time.monotonic()))
@@ -0,0 +1,73 @@
+"""Helpers for the read-only JSON API: encoding, field selection and paging.
+
+Endpoints query plain column tuples and turn them into dicts here, so no ORM
+objects are built for a response. Encoding uses orjson when it is installed
+and falls back to the standard library otherwise.
+"""
+import json
+from datetime import date, datetime
+
+from flask import Response
+
+try:
+    import orjson
+except ImportError:  # optional, noticeably faster on large pages
+    orjson = None
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+
+def _default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+def dumps(payload):
+    """Encode ``payload`` as compact JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(payload, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(payload, separators=(',', ':'), default=_default).encode('utf-8')
+
+
+def json_response(payload, status=200):
+    return Response(dumps(payload), status=status, mimetype='application/json')
+
+
+def select_fields(available, requested):
+    """Pick the columns named in a ``fields=a,b`` parameter, in that order.
+
+    ``available`` maps field names to columns. With no request every field is
+    returned; unknown names raise ValueError.
+    """
+    if not requested:
+        return list(available)
+    names = [name.strip() for name in requested.split(',') if name.strip()]
+    unknown = [name for name in names if name not in available]
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(unknown)}. Available: {', '.join(available)}")
+    return list(dict.fromkeys(names))
+
+
+def parse_page(args, default_limit=DEFAULT_PAGE_SIZE, max_limit=MAX_PAGE_SIZE):
+    """Read ``limit`` and ``offset`` query parameters; raises ValueError when invalid."""
+    try:
+        limit = int(args.get('limit', default_limit))
+        offset = int(args.get('offset', 0))
+    except ValueError:
+        raise ValueError('limit and offset must be integers')
+    if limit < 1 or offset < 0:
+        raise ValueError('limit must be positive and offset must not be negative')
+    return min(limit, max_limit), offset
+
+
+def paged_rows(query, fields, limit, offset=0):
+    """Run ``query`` for one page; return (list of dicts, whether more rows follow).
+
+    One extra row is fetched to tell whether there is a next page, which avoids
+    a separate COUNT query.
+    """
+    rows = query.limit(limit + 1).offset(offset).all()
+    has_more = len(rows) > limit
+    return [dict(zip(fields, row)) for row in rows[:limit]], has_more
@@ -1,14 +1,26 @@
+import os
 import subprocess
-import time
+import sys
 import webbrowser
 import tkinter as tk
 from tkinter import font
 from threading import Thread
 import socket
 
-def start_flask():
-    global flask_process   
-    flask_process = subprocess.Popen(['python', 'app.py'])
+import server
+
+HEALTH_POLL_MS = 3000  # How often the window checks that the server is still up
+
+flask_process = None
+
+def start_flask(args):
+    global flask_process
+    command = [sys.executable, 'app.py', '--host', args.host, '--port', str(args.port)]
+    if args.dev:
+        command.append('--dev')
+    if args.threads:
+        command.extend(['--threads', str(args.threads)])
+    flask_process = subprocess.Popen(command, cwd=os.path.dirname(os.path.abspath(__file__)))
 
 def stop_flask():
     global flask_process
@@ -29,7 +41,7 @@ def get_local_ip():
         s.close()
     return IP
 
-def display_url(url):
+def display_url(url, health_url):
     root = tk.Tk()
     root.title("tourneyman")
     root.geometry("800x450")  # Set initial window size
@@ -65,27 +77,52 @@ def display_url(url):
     disclaimer_label = tk.Label(root, text="Please keep this window open.\n\nThis application is in development.\nPlease report any bugs.", font=disclaimer_font)
     disclaimer_label.pack(pady=10)
 
+    # Server status, refreshed from the health endpoint
+    status_label = tk.Label(root, text="Server running", font=disclaimer_font, fg="green")
+    status_label.pack(pady=5)
+
+    def show_status(healthy):
+        if healthy:
+            status_label.config(text="Server running", fg="green")
+        elif flask_process is not None and flask_process.poll() is not None:
+            status_label.config(text="Server stopped. Please restart tourneyman.", fg="red")
+        else:
+            status_label.config(text="Server not responding...", fg="red")
+
+    # The check runs off the UI thread so a slow response never freezes the
+    # window; the result is shown on the next tick
+    last_check = {'healthy': True}
+
+    def check_health():
+        last_check['healthy'] = server.is_healthy(health_url)
+
+    def poll_health():
+        show_status(last_check['healthy'])
+        Thread(target=check_health, daemon=True).start()
+        root.after(HEALTH_POLL_MS, poll_health)
+
+    root.after(HEALTH_POLL_MS, poll_health)
     root.mainloop()
 
 def main():
-    # Start the Flask server in a separate thread
-    flask_thread = Thread(target=start_flask)
-    flask_thread.start()
+    args = server.parse_args()
 
-    # Give Flask some time to start up
-    time.sleep(2)
+    # Start the server and wait until it actually answers
+    start_flask(args)
+    health_url = server.health_url(args.port, args.host)
+    if not server.wait_until_ready(health_url, process=flask_process):
+        print("The tourneyman server failed to start. See the output above for details.")
+        stop_flask()
+        sys.exit(1)
 
     # Get the local IP address of the device
     local_ip = get_local_ip()
 
-    # Define the port on which Flask is running
-    port = 5000
-
     # Construct the URL
-    url = f"http://{local_ip}:{port}"
+    url = f"http://{local_ip}:{args.port}"
 
     # Display the URL in a GUI
-    display_url(url)
+    display_url(url, health_url)
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,406 @@
+"""Lightweight, ordered schema migrations.
+
+Each migration is a function registered with ``@migration(version, description)``
+that receives an open connection and the application's metadata. Applied
+versions are recorded in the ``schema_migrations`` table, so ``upgrade`` only
+runs what an existing database is missing. Migrations should be idempotent so
+that a database created fresh by ``create_all`` can simply be stamped.
+"""
+from sqlalchemy import Column, Integer, MetaData, String, Table, inspect, select, text
+
+MIGRATIONS = []
+
+_version_metadata = MetaData()
+schema_migrations = Table(
+    'schema_migrations', _version_metadata,
+    Column('version', Integer, primary_key=True),
+    Column('description', String(200), nullable=False),
+)
+
+
+def migration(version, description):
+    def register(func):
+        MIGRATIONS.append((version, description, func))
+        MIGRATIONS.sort(key=lambda m: m[0])
+        return func
+    return register
+
+
+def applied_versions(connection):
+    schema_migrations.create(connection, checkfirst=True)
+    return {row[0] for row in connection.execute(select(schema_migrations.c.version))}
+
+
+def upgrade(engine, metadata):
+    """Create missing tables and apply pending migrations. Returns the descriptions applied."""
+    applied = []
+    with engine.begin() as connection:
+        metadata.create_all(connection, checkfirst=True)
+        done = applied_versions(connection)
+        for version, description, func in MIGRATIONS:
+            if version in done:
+                continue
+            func(connection, metadata)
+            connection.execute(schema_migrations.insert().values(version=version, description=description))
+            applied.append(description)
+    return applied
+
+
+def stamp(engine):
+    """Mark every migration as applied (for databases created from scratch)."""
+    with engine.begin() as connection:
+        done = applied_versions(connection)
+        for version, description, _ in MIGRATIONS:
+            if version not in done:
+                connection.execute(schema_migrations.insert().values(version=version, description=description))
+
+
+def create_indexes(connection, metadata, names):
+    """Create the named indexes from ``metadata`` unless they already exist."""
+    inspector = inspect(connection)
+    for table in metadata.sorted_tables:
+        existing = {index['name'] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name in names and index.name not in existing:
+                index.create(connection)
+
+
+@migration(1, 'Add indexes for tournament, contestant and match lookups')
+def add_lookup_indexes(connection, metadata):
+    create_indexes(connection, metadata, {
+        'ix_tournament_start_date',
+        'ix_contestant_tournament_active',
+        'ix_contestant_tournament_status',
+        'ix_contestant_player',
+        'ix_match_result_tournament_round',
+        'ix_match_result_player1',
+        'ix_match_result_player2',
+    })
+
+
+def add_column(connection, metadata, table_name, column_name, default=None):
+    """Add a column defined in ``metadata`` to an existing table unless it is already there."""
+    existing = {column['name'] for column in inspect(connection).get_columns(table_name)}
+    if column_name in existing:
+        return
+    column = metadata.tables[table_name].c[column_name]
+    ddl = f'ALTER TABLE {table_name} ADD COLUMN {column_name} {column.type.compile(connection.dialect)}'
+    if default is not None:
+        ddl += f' DEFAULT {default}'
+    connection.execute(text(ddl))
+
+
+def match_names(connection):
+    """(tournament_id, round_number, player1, player2, winner, is_draw) of every match, by player name.
+
+    Reads the name columns of databases from before migration 5 and the
+    contestant ids after it, so earlier backfills work on either.
+    """
+    if 'player1' in {column['name'] for column in inspect(connection).get_columns('match_result')}:
+        sql = 'SELECT tournament_id, round_number, player1, player2, winner, is_draw FROM match_result'
+    else:
+        sql = (
+            'SELECT m.tournament_id, m.round_number, c1.player, c2.player, '
+            'CASE m.winner_side WHEN 1 THEN c1.player WHEN 2 THEN c2.player END, m.is_draw '
+            'FROM match_result m JOIN contestant c1 ON c1.id = m.player1_id '
+            'LEFT JOIN contestant c2 ON c2.id = m.player2_id'
+        )
+    return connection.execute(text(sql)).all()
+
+
+@migration(2, 'Add Buchholz and Sonneborn-Berger tiebreaks to contestants')
+def add_standings_tiebreaks(connection, metadata):
+    from standings import compute_tiebreaks
+
+    add_column(connection, metadata, 'contestant', 'buchholz', default=0)
+    add_column(connection, metadata, 'contestant', 'sonneborn_berger', default=0)
+    create_indexes(connection, metadata, {'ix_contestant_standings'})
+
+    # Backfill from existing match history
+    scores = {}
+    for contestant_id, tournament_id, player, score in connection.execute(
+        text('SELECT id, tournament_id, player, score FROM contestant')
+    ):
+        scores.setdefault(tournament_id, {})[player] = (contestant_id, score or 0.0)
+    matches = {}
+    for tournament_id, _, player1, player2, winner, is_draw in match_names(connection):
+        matches.setdefault(tournament_id, []).append((player1, player2, winner, bool(is_draw)))
+    for tournament_id, players in scores.items():
+        tiebreaks = compute_tiebreaks(
+            {player: score for player, (_, score) in players.items()},
+            matches.get(tournament_id, [])
+        )
+        for player, (contestant_id, _) in players.items():
+            buchholz, sonneborn_berger = tiebreaks.get(player, (0.0, 0.0))
+            connection.execute(
+                text('UPDATE contestant SET buchholz = :b, sonneborn_berger = :s WHERE id = :id'),
+                {'b': buchholz, 's': sonneborn_berger, 'id': contestant_id}
+            )
+
+
+@migration(3, 'Add a change revision to tournaments for conditional GETs')
+def add_tournament_revision(connection, metadata):
+    add_column(connection, metadata, 'tournament', 'revision', default=0)
+    add_column(connection, metadata, 'tournament', 'updated_at')
+
+
+@migration(4, 'Track current-round progress on tournaments')
+def add_round_progress(connection, metadata):
+    add_column(connection, metadata, 'tournament', 'round_expected', default=0)
+    add_column(connection, metadata, 'tournament', 'round_reported', default=0)
+
+    # Backfill: expected is the active players plus anyone with a result this
+    # round, reported is everyone with a result this round
+    rounds = dict(connection.execute(text('SELECT tournament_id, current_round FROM tournament')).all())
+    players = {tournament_id: set() for tournament_id in rounds}
+    for tournament_id, player in connection.execute(
+        text('SELECT tournament_id, player FROM contestant WHERE active')
+    ):
+        players.setdefault(tournament_id, set()).add(player)
+    reported = {tournament_id: set() for tournament_id in rounds}
+    for tournament_id, round_number, player1, player2, _, _ in match_names(connection):
+        if tournament_id in rounds and round_number == rounds[tournament_id]:
+            reported[tournament_id].update(p for p in (player1, player2) if p is not None)
+    for tournament_id in rounds:
+        connection.execute(
+            text('UPDATE tournament SET round_expected = :e, round_reported = :r WHERE tournament_id = :t'),
+            {'e': len(players[tournament_id] | reported[tournament_id]), 'r': len(reported[tournament_id]), 't': tournament_id}
+        )
+
+
+@migration(5, 'Store match players and winners as contestant ids instead of names')
+def match_contestant_ids(connection, metadata):
+    if 'player1' not in {column['name'] for column in inspect(connection).get_columns('match_result')}:
+        return
+
+    # Older rows may only have names; look their contestants up first
+    for side in ('player1', 'player2'):
+        connection.execute(text(
+            f'UPDATE match_result SET {side}_id = (SELECT c.id FROM contestant c '
+            f'WHERE c.tournament_id = match_result.tournament_id AND c.player = match_result.{side}) '
+            f'WHERE {side}_id IS NULL AND {side} IS NOT NULL'
+        ))
+
+    # SQLite cannot drop columns used by a CHECK constraint or index, so
+    # rebuild the table: copy into a new one, drop the old and rename
+    for index in inspect(connection).get_indexes('match_result'):
+        connection.execute(text(f'DROP INDEX IF EXISTS {index["name"]}'))
+    scratch = MetaData()
+    for name in ('tournament', 'contestant'):
+        metadata.tables[name].to_metadata(scratch)  # So the new table's foreign keys resolve
+    table = metadata.tables['match_result'].to_metadata(scratch, name='match_result_new')
+    table.create(connection)
+    connection.execute(text(
+        'INSERT INTO match_result_new (id, tournament_id, round_number, player1_id, player2_id, winner_side, '
+        'score, is_draw, status, scheduled_time, completion_time) '
+        'SELECT id, tournament_id, round_number, player1_id, player2_id, '
+        'CASE WHEN player2 IS NULL THEN 1 WHEN winner = player1 THEN 1 WHEN winner = player2 THEN 2 END, '
+        'score, is_draw, status, scheduled_time, completion_time FROM match_result'
+    ))
+    connection.execute(text('DROP TABLE match_result'))
+    connection.execute(text('ALTER TABLE match_result_new RENAME TO match_result'))
+
+
+@migration(6, 'Add a player registry shared by all tournaments')
+def add_player_registry(connection, metadata):
+    add_column(connection, metadata, 'contestant', 'player_id')
+
+    # One player per distinct contestant name
+    registered = {name for (name,) in connection.execute(text('SELECT name FROM player'))}
+    names = {name for (name,) in connection.execute(text('SELECT DISTINCT player FROM contestant'))} - registered
+    if names:
+        connection.execute(metadata.tables['player'].insert(), [
+            {'name': name, 'name_key': name.strip().casefold()}  # app.player_key
+            for name in sorted(names)
+        ])
+    connection.execute(text(
+        'UPDATE contestant SET player_id = (SELECT id FROM player WHERE player.name = contestant.player) '
+        'WHERE player_id IS NULL'
+    ))
+    create_indexes(connection, metadata, {'ix_contestant_player_id'})
+
+
+@migration(7, 'Add Elo ratings to players and seeding ratings to contestants')
+def add_ratings(connection, metadata):
+    import ratings
+
+    add_column(connection, metadata, 'player', 'rating', default=ratings.DEFAULT_RATING)
+    add_column(connection, metadata, 'player', 'rated_matches', default=0)
+    add_column(connection, metadata, 'contestant', 'rating')
+    # The add player form used to store an empty seed as ''
+    connection.execute(text("UPDATE contestant SET seed = NULL WHERE seed = ''"))
+
+    # Rate everyone from the existing history; contestants keep no seeding
+    # rating so tournaments under way keep their order
+    rated = ratings.recompute(
+        (player1, player2, 0.5 if is_draw else (1.0 if winner_side == 1 else 0.0))
+        for player1, player2, winner_side, is_draw in connection.execute(text(
+            'SELECT c1.player_id, c2.player_id, m.winner_side, m.is_draw FROM match_result m '
+            'JOIN contestant c1 ON c1.id = m.player1_id JOIN contestant c2 ON c2.id = m.player2_id '
+            'ORDER BY m.completion_time, m.id'
+        ))
+    )
+    for player_id, (rating, count) in rated.items():
+        connection.execute(
+            text('UPDATE player SET rating = :rating, rated_matches = :count WHERE id = :id'),
+            {'rating': rating, 'count': count, 'id': player_id}
+        )
+
+
+@migration(8, 'Allow each player one match per round')
+def add_match_entries(connection, metadata):
+    # One entry per player per match. Should two concurrent submissions
+    # already have given a player two matches in a round, the first keeps
+    # the entry; the database refuses any more from now on.
+    connection.execute(metadata.tables['match_entry'].delete())
+    connection.execute(text(
+        'INSERT INTO match_entry (match_id, contestant_id, tournament_id, round_number) '
+        'SELECT MIN(id), contestant_id, tournament_id, round_number FROM ('
+        'SELECT id, player1_id AS contestant_id, tournament_id, round_number FROM match_result '
+        'UNION ALL '
+        'SELECT id, player2_id, tournament_id, round_number FROM match_result WHERE player2_id IS NOT NULL'
+        ') AS players GROUP BY tournament_id, round_number, contestant_id'
+    ))
+
+
+@migration(9, 'Fix each contestant\'s place in the round robin and Swiss pairing order')
+def add_contestant_positions(connection, metadata):
+    add_column(connection, metadata, 'contestant', 'position')
+
+    # Events already under way keep the order they have been paired in so
+    # far, which was registration order
+    started = {tournament_id for (tournament_id,) in connection.execute(text(
+        "SELECT DISTINCT m.tournament_id FROM match_result m JOIN tournament t "
+        "ON t.tournament_id = m.tournament_id WHERE t.\"tFormat\" NOT IN ('Single Elimination', 'Double Elimination')"
+    ))}
+    positions = {}
+    for contestant_id, tournament_id in connection.execute(text(
+        'SELECT id, tournament_id FROM contestant WHERE position IS NULL ORDER BY tournament_id, id'
+    )):
+        if tournament_id in started:
+            positions[tournament_id] = positions.get(tournament_id, 0) + 1
+            connection.execute(
+                text('UPDATE contestant SET position = :position WHERE id = :id'),
+                {'position': positions[tournament_id], 'id': contestant_id}
+            )
+
+
+@migration(10, 'Store bracket players and winners as contestant ids instead of names')
+def bracket_contestant_ids(connection, metadata):
+    columns = {column['name']: column['type'] for column in inspect(connection).get_columns('bracket_match')}
+    if isinstance(columns['player1'], Integer):
+        return
+
+    # Rebuild the table as in migration 5; '' was a bye, now 0 (elimination.BYE)
+    def contestant_id(column):
+        return (
+            f"CASE WHEN b.{column} IS NULL THEN NULL WHEN b.{column} = '' THEN 0 ELSE "
+            f"(SELECT c.id FROM contestant c WHERE c.tournament_id = b.tournament_id AND c.player = b.{column}) END"
+        )
+    for index in inspect(connection).get_indexes('bracket_match'):
+        connection.execute(text(f'DROP INDEX IF EXISTS {index["name"]}'))
+    scratch = MetaData()
+    for name in ('tournament', 'contestant', 'match_result'):
+        metadata.tables[name].to_metadata(scratch)
+    table = metadata.tables['bracket_match'].to_metadata(scratch, name='bracket_match_new')
+    table.create(connection)
+    connection.execute(text(
+        'INSERT INTO bracket_match_new (id, tournament_id, position, bracket, round_number, stage, '
+        'player1, player2, winner, loser, score, state, winner_to, winner_slot, loser_to, loser_slot, '
+        'match_result_id) '
+        f'SELECT b.id, b.tournament_id, b.position, b.bracket, b.round_number, b.stage, '
+        f'{contestant_id("player1")}, {contestant_id("player2")}, {contestant_id("winner")}, '
+        f'{contestant_id("loser")}, b.score, b.state, b.winner_to, b.winner_slot, b.loser_to, '
+        f'b.loser_slot, b.match_result_id FROM bracket_match b'
+    ))
+    connection.execute(text('DROP TABLE bracket_match'))
+    connection.execute(text('ALTER TABLE bracket_match_new RENAME TO bracket_match'))
+
+
+def replay_bracket(contestants, matches, double):
+    """Lay out a bracket for an event played without one and replay its results on it.
+
+    ``contestants`` are (id, seed, rating, active, status) rows and
+    ``matches`` (id, player1_id, player2_id, winner_side, score) rows in the
+    order played. Returns the bracket and {position: match id}, or None if
+    any result is not a match the bracket would have had, or if the players
+    knocked out differ from the bracket's.
+    """
+    import elimination
+
+    if len(contestants) < 2 or any(status == 'Withdrawn' for *_, status in contestants):
+        return None  # When a player withdrew is not recorded
+    # As app.seeding_key
+    seeded = sorted(contestants, key=lambda c: (c[1] is None, c[1] or 0, c[2] is None, -(c[2] or 0), c[0]))
+    bracket = elimination.build([c[0] for c in seeded], double=double)
+    results, knocked_out = {}, set()
+    for match_id, player1, player2, winner_side, score in matches:
+        if player2 is None:
+            # A bye entered by hand only fits if the bracket gave them one
+            match = next((m for m in bracket if m.state == elimination.BYE_STATE and m.winner == player1
+                          and m.position not in results), None)
+            if match is None:
+                return None
+            results[match.position] = match_id
+            continue
+        match = elimination.player_index(bracket).get(player1)
+        if match is None or not elimination.is_ready(match) or player2 not in (match.player1, match.player2):
+            return None
+        winner, loser = (player1, player2) if winner_side == 1 else (player2, player1)
+        _, eliminated = elimination.record(bracket, match, winner, score)
+        if eliminated:
+            knocked_out.add(loser)
+        results[match.position] = match_id
+    if knocked_out != {c[0] for c in contestants if not c[3]}:
+        return None
+    return bracket, results
+
+
+@migration(11, 'Rebuild the brackets of elimination events played before brackets were saved')
+def rebuild_legacy_brackets(connection, metadata):
+    # Events whose history does not fit a bracket keep running from their
+    # match history (see app.is_legacy_bracket)
+    import elimination
+
+    legacy = connection.execute(text(
+        "SELECT t.tournament_id, t.\"tFormat\" FROM tournament t "
+        "WHERE t.\"tFormat\" IN ('Single Elimination', 'Double Elimination') "
+        "AND EXISTS (SELECT 1 FROM match_result m WHERE m.tournament_id = t.tournament_id) "
+        "AND NOT EXISTS (SELECT 1 FROM bracket_match b WHERE b.tournament_id = t.tournament_id)"
+    )).all()
+    for tournament_id, tournament_format in legacy:
+        contestants = connection.execute(
+            text('SELECT id, seed, rating, active, status FROM contestant WHERE tournament_id = :t ORDER BY id'),
+            {'t': tournament_id}
+        ).all()
+        matches = connection.execute(
+            text('SELECT id, player1_id, player2_id, winner_side, score FROM match_result '
+                 'WHERE tournament_id = :t ORDER BY round_number, id'),
+            {'t': tournament_id}
+        ).all()
+        replayed = replay_bracket(contestants, matches, double=tournament_format == 'Double Elimination')
+        if replayed is None:
+            # Rounds will be counted as in the other formats, which elimination
+            # events never kept up to date: due are the active players and
+            # anyone with a result this round
+            connection.execute(text(
+                'UPDATE tournament SET '
+                'round_reported = (SELECT COUNT(*) FROM match_entry e WHERE e.tournament_id = :t '
+                'AND e.round_number = tournament.current_round), '
+                'round_expected = (SELECT COUNT(*) FROM contestant c WHERE c.tournament_id = :t AND (c.active '
+                'OR EXISTS (SELECT 1 FROM match_entry e WHERE e.contestant_id = c.id '
+                'AND e.round_number = tournament.current_round))) '
+                'WHERE tournament_id = :t'
+            ), {'t': tournament_id})
+            continue
+        bracket, results = replayed
+        connection.execute(metadata.tables['bracket_match'].insert(), [
+            dict(match.as_dict(), tournament_id=tournament_id, match_result_id=results.get(match.position))
+            for match in bracket
+        ])
+        stage = elimination.current_stage(bracket)
+        if stage is not None:
+            connection.execute(
+                text('UPDATE tournament SET current_round = :stage WHERE tournament_id = :t'),
+                {'stage': stage, 't': tournament_id}
+            )
@@ -0,0 +1,177 @@
+from collections import defaultdict
+
+from matching import max_weight_matching
+
+# Pairing costs. A rematch is only ever chosen when no rematch-free pairing
+# of the remaining players exists, so it outweighs every other penalty.
+REMATCH_PENALTY = 1_000_000
+SCORE_DIFF_PENALTY = 1_000
+FLOAT_PENALTY = 10
+
+
+def build_opponent_index(match_rows):
+    """Build a ``{player: frozenset(opponents)}`` index and per-player bye counts.
+
+    ``match_rows`` is an iterable of ``(player1, player2)`` pairs where
+    ``player2`` is None for a bye.
+    """
+    opponents = defaultdict(set)
+    byes = defaultdict(int)
+    for player1, player2 in match_rows:
+        if player2 is None:
+            byes[player1] += 1
+        else:
+            opponents[player1].add(player2)
+            opponents[player2].add(player1)
+    return {player: frozenset(faced) for player, faced in opponents.items()}, dict(byes)
+
+
+class SwissPairer:
+    """Pair one Swiss round from score groups using minimum-cost matching.
+
+    Players are ``(key, score, seed)`` tuples. Score groups are paired top
+    down with the usual fold (top half against bottom half); a group whose
+    fold would force a rematch is solved exactly with a weighted matching,
+    and a group that cannot be paired cleanly is merged into the next one.
+    """
+
+    def __init__(self, players, opponents=None, byes=None):
+        self.players = sorted(
+            players,
+            key=lambda p: (-p[1], p[2] if p[2] is not None else float('inf'))
+        )
+        self.opponents = opponents or {}
+        self.byes = byes or {}
+        self.rank = {p[0]: i for i, p in enumerate(self.players)}
+        self.score = {p[0]: p[1] for p in self.players}
+
+    def have_played(self, a, b):
+        return b in self.opponents.get(a, ())
+
+    def choose_bye(self, keys):
+        """Give the bye to the lowest-ranked player with the fewest byes so far."""
+        return min(reversed(keys), key=lambda k: self.byes.get(k, 0))
+
+    def pair_cost(self, a, b):
+        cost = SCORE_DIFF_PENALTY * int(abs(self.score[a] - self.score[b]) * 2)
+        cost += abs(self.rank[a] - self.rank[b])
+        if self.have_played(a, b):
+            cost += REMATCH_PENALTY
+        return cost
+
+    def fold(self, keys):
+        """Dutch fold of an even-sized group; None if it would need a rematch."""
+        half = len(keys) // 2
+        top, bottom = keys[:half], list(keys[half:])
+        pairs = []
+        for a in top:
+            for i, b in enumerate(bottom):
+                if not self.have_played(a, b):
+                    pairs.append((a, bottom.pop(i)))
+                    break
+            else:
+                if not self._exchange(a, bottom, pairs):
+                    return None
+        return pairs
+
+    def _exchange(self, a, bottom, pairs):
+        """Swap opponents with an earlier pair so ``a`` avoids a rematch."""
+        for i, b in enumerate(bottom):
+            for k in range(len(pairs) - 1, -1, -1):
+                a2, b2 = pairs[k]
+                if not self.have_played(a, b2) and not self.have_played(a2, b):
+                    pairs[k] = (a2, bottom.pop(i))
+                    pairs.append((a, b2))
+                    return True
+        return False
+
+    def solve(self, keys, allow_float):
+        """Minimum-cost pairing of ``keys``.
+
+        With ``allow_float`` and an odd group, one player is left over to
+        float down into the next group; lower-ranked players float first.
+        Returns ``(pairs, floater, rematches)``.
+        """
+        n = len(keys)
+        edges = []
+        top = n * n + REMATCH_PENALTY + SCORE_DIFF_PENALTY * 100
+        for i in range(n):
+            for j in range(i + 1, n):
+                edges.append((i, j, top - self.pair_cost(keys[i], keys[j])))
+        if allow_float and n % 2 == 1:
+            # A dummy vertex absorbs the floater; its weight favours the
+            # lowest-ranked player in the group.
+            for i in range(n):
+                edges.append((i, n, top - FLOAT_PENALTY * (n - i)))
+        mate = max_weight_matching(edges, maxcardinality=True)
+
+        pairs, floater, rematches = [], None, 0
+        for i in range(n):
+            j = mate[i] if i < len(mate) else -1
+            if j == n or j == -1:
+                floater = keys[i]
+            elif j > i:
+                pairs.append((keys[i], keys[j]))
+                if self.have_played(keys[i], keys[j]):
+                    rematches += 1
+        return pairs, floater, rematches
+
+    def pair_group(self, keys, last):
+        if len(keys) % 2 == 1 and not last:
+            for idx in range(len(keys) - 1, -1, -1):
+                pairs = self.fold(keys[:idx] + keys[idx + 1:])
+                if pairs is not None:
+                    return pairs, keys[idx], 0
+                if len(keys) - idx > 2:
+                    break
+            return self.solve(keys, allow_float=True)
+        pairs = self.fold(keys)
+        if pairs is not None:
+            return pairs, None, 0
+        return self.solve(keys, allow_float=False)
+
+    def pairings(self):
+        keys = [p[0] for p in self.players]
+        bye = None
+        if len(keys) % 2 == 1:
+            bye = self.choose_bye(keys)
+            keys.remove(bye)
+
+        groups = []
+        for key in keys:
+            if groups and self.score[groups[-1][0]] == self.score[key]:
+                groups[-1].append(key)
+            else:
+                groups.append([key])
+
+        accepted = []  # (group members, pairs) so the last group can pull back
+        carry = []
+        for index, group in enumerate(groups):
+            pool = carry + group
+            last = index == len(groups) - 1
+            pairs, floater, rematches = self.pair_group(pool, last)
+            if rematches and not last:
+                carry = pool
+                continue
+            while rematches and accepted:
+                # The bottom of the field is stuck; reopen the group above it.
+                members, _ = accepted.pop()
+                pool = members + pool
+                pairs, floater, rematches = self.pair_group(pool, last=True)
+            accepted.append((pool if floater is None else [k for k in pool if k != floater], pairs))
+            carry = [floater] if floater is not None else []
+
+        result = [pair for _, pairs in accepted for pair in pairs]
+        result.sort(key=lambda pair: min(self.rank[pair[0]], self.rank[pair[1]]))
+        result = [
+            (a, b) if self.rank[a] <= self.rank[b] else (b, a)
+            for a, b in result
+        ]
+        if bye is not None:
+            result.append((bye, None))
+        return result
+
+
+def swiss_pairings(players, opponents=None, byes=None):
+    """Pair a Swiss round. See ``SwissPairer`` for the input format."""
+    return SwissPairer(players, opponents, byes).pairings()
@@ -0,0 +1,106 @@
+"""Closed-form round-robin (Berger table) scheduling.
+
+Players are numbered ``0..n-1`` in their pairing order, which the app fixes
+when the first result comes in (``Contestant.position``). With an odd number of
+players a phantom slot ``n`` is added and whoever draws it has a bye, which
+is reported as ``None``. Every round is computed directly from its number,
+so asking for round r costs O(n) regardless of r.
+"""
+from array import array
+
+BYE = -1
+
+
+def slot_count(player_count):
+    """Number of circle positions, including the bye slot for odd fields."""
+    return player_count + player_count % 2
+
+
+def rounds_per_cycle(player_count):
+    """Rounds needed for everyone to meet everyone once."""
+    return max(slot_count(player_count) - 1, 0)
+
+
+def _slot_player(slots, shift, position):
+    # Position 0 is fixed; the rest of the circle turns one step per round.
+    if position == 0:
+        return 0
+    return slots - 1 - ((position - 1 - shift) % (slots - 1))
+
+
+def _home_in_odd_field(player_count, a, b):
+    """Whether player ``a`` is at home against ``b`` when ``player_count`` is odd.
+
+    The turning slots hold players 1..n, the phantom being n, and each round
+    pairs players whose numbers have the same sum mod n. Giving the home game
+    to whoever is 1..(n-1)/2 steps behind their opponent (mod n) leaves each
+    of them (n-1)/2 home games, counting the one against the phantom. Player
+    0, in the fixed slot, stands in for the phantom: a player is at home
+    against 0 exactly when they would be against the phantom, so the game
+    the bye takes away is made up and everyone ends the cycle level.
+    """
+    n = player_count
+    if a == 0:
+        return not _home_in_odd_field(n, b, a)
+    if b == 0:
+        b = n
+    return 1 <= (b - a) % n <= (n - 1) // 2
+
+
+def round_pairings(player_count, round_number, double=False, balance=True):
+    """Return the ``(home, away)`` index pairs for a 1-based round number.
+
+    Byes are returned as ``(player, None)``. With ``double`` the second cycle
+    repeats the first with home and away swapped. With ``balance`` no
+    player's home and away counts differ by more than one per cycle:
+    colours alternate in even fields, and odd fields, where everyone plays an
+    even number of games, give everyone as many home games as away games.
+    Otherwise the raw circle orientation is kept.
+    """
+    slots = slot_count(player_count)
+    if slots < 2:
+        return []
+    cycle = slots - 1
+    shift = (round_number - 1) % cycle
+    second_leg = double and ((round_number - 1) // cycle) % 2 == 1
+
+    pairings = []
+    for i in range(slots // 2):
+        home = _slot_player(slots, shift, i)
+        away = _slot_player(slots, shift, slots - 1 - i)
+        if balance and player_count % 2 == 1:
+            if home < player_count and away < player_count and not _home_in_odd_field(player_count, home, away):
+                home, away = away, home
+        elif balance and ((i == 0 and shift % 2 == 1) or (i > 0 and i % 2 == 1)):
+            home, away = away, home
+        if second_leg:
+            home, away = away, home
+        if home >= player_count:
+            pairings.append((away, None))
+        elif away >= player_count:
+            pairings.append((home, None))
+        else:
+            pairings.append((home, away))
+    return pairings
+
+
+def iter_schedule(player_count, double=False, balance=True):
+    """Yield ``(round_number, pairings)`` for every round of the event."""
+    total = rounds_per_cycle(player_count) * (2 if double else 1)
+    for round_number in range(1, total + 1):
+        yield round_number, round_pairings(player_count, round_number, double, balance)
+
+
+def schedule_array(player_count, double=False, balance=True):
+    """The whole schedule as a flat ``array('i')``.
+
+    Each round occupies ``slot_count(player_count)`` entries laid out as
+    home, away, home, away, ...; a bye is stored as ``BYE`` in the away
+    position.
+    """
+    out = array('i')
+    for _, pairings in iter_schedule(player_count, double, balance):
+        for home, away in pairings:
+            out.append(home)
+            out.append(BYE if away is None else away)
+    return out
@@ -0,0 +1,96 @@
+"""Launching the web server and checking that it is up.
+
+``python app.py`` serves through waitress, a multi-threaded production WSGI
+server that also runs on Windows; ``--dev`` switches back to Flask's
+debugging server with the reloader. Everything runs in one process because
+live-update streams and the page caches are held in memory, so concurrency
+comes from threads. Each open live-update stream occupies a thread, which is
+why only part of the pool is given to them (see ``SSE_MAX_STREAMS``).
+
+``main.py`` starts the server as a subprocess and uses ``wait_until_ready``
+to poll ``/healthz`` instead of sleeping for a fixed time.
+"""
+import argparse
+import time
+import urllib.request
+
+from werkzeug.serving import is_running_from_reloader, run_simple
+
+DEFAULT_HOST = '0.0.0.0'
+DEFAULT_PORT = 5000
+DEFAULT_THREADS = 64
+HEALTH_PATH = '/healthz'
+
+
+# Addresses that listen on every interface; the health check connects over loopback instead
+WILDCARD_HOSTS = {'': '127.0.0.1', '0.0.0.0': '127.0.0.1', '::': '::1'}
+
+
+def health_url(port=DEFAULT_PORT, host=DEFAULT_HOST):
+    """URL of the health check of a server listening on ``host``."""
+    host = WILDCARD_HOSTS.get(host, host)
+    if ':' in host:
+        host = f'[{host}]'  # IPv6 literal
+    return f'http://{host}:{port}{HEALTH_PATH}'
+
+
+def is_healthy(url, timeout=1.0):
+    """True if the health endpoint at ``url`` answers 200."""
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            return response.status == 200
+    except (OSError, ValueError):
+        return False
+
+
+def wait_until_ready(url, timeout=30.0, interval=0.2, process=None):
+    """Poll ``url`` until the server is healthy; False on timeout or if ``process`` exits first."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            return False
+        if is_healthy(url):
+            return True
+        time.sleep(interval)
+    return False
+
+
+def is_reloader_watcher(production):
+    """True in the process the development server's reloader keeps only to restart the real server.
+
+    That process serves nothing, so it must not start background workers.
+    """
+    return not production and not is_running_from_reloader()
+
+
+def serve(app, production=True, host=DEFAULT_HOST, port=DEFAULT_PORT, threads=None):
+    """Serve ``app`` until interrupted."""
+    # run_simple rather than app.run, which does nothing under the flask command
+    if not production:
+        app.debug = True
+        run_simple(host, port, app, use_reloader=True, use_debugger=True, threaded=True)
+        return
+
+    threads = threads or app.config.get('SERVER_THREADS', DEFAULT_THREADS)
+    # Keep a quarter of the threads free for page loads and result submissions
+    app.config.setdefault('SSE_MAX_STREAMS', max(1, threads * 3 // 4))
+    try:
+        from waitress import serve as waitress_serve
+    except ImportError:
+        print('waitress is not installed (pip install -r requirements.txt); '
+              'falling back to the threaded development server.')
+        run_simple(host, port, app, threaded=True)
+        return
+    print(f'Serving on http://{host}:{port} with {threads} threads')
+    waitress_serve(app, host=host, port=port, threads=threads, ident='tourneyman')
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Run the tourneyman web server.')
+    parser.add_argument('--dev', action='store_true',
+                        help="Use Flask's debugging server with auto-reload instead of waitress.")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--threads', type=int, default=None,
+                        help=f'Worker threads for the production server (default {DEFAULT_THREADS}).')
+    return parser.parse_args(argv)
@@ -0,0 +1,74 @@
+"""Standings tiebreaks (Buchholz and Sonneborn-Berger), full and incremental.
+
+Buchholz is the sum of a player's opponents' scores. Sonneborn-Berger is the
+sum of the scores of opponents the player beat plus half the scores of
+opponents they drew. Both are stored on ``Contestant`` and kept up to date
+as results arrive, so standings pages can read them pre-sorted.
+
+Matches are ``(player1, player2, winner, is_draw)`` tuples; ``player2`` is
+None for a bye, which contributes nothing to either tiebreak.
+"""
+from collections import defaultdict
+
+
+def standing_key(contestant):
+    """Sort key placing the tournament leader first."""
+    return (
+        -(contestant.score or 0),
+        -(contestant.buchholz or 0),
+        -(contestant.sonneborn_berger or 0),
+        contestant.player.lower()
+    )
+
+
+def _credit(tiebreaks, player, opponent, opponent_score, winner, is_draw):
+    buchholz, sonneborn_berger = tiebreaks[player]
+    buchholz += opponent_score
+    if is_draw:
+        sonneborn_berger += opponent_score / 2
+    elif winner == player:
+        sonneborn_berger += opponent_score
+    tiebreaks[player] = [buchholz, sonneborn_berger]
+
+
+def compute_tiebreaks(scores, matches):
+    """Compute {player: (buchholz, sonneborn_berger)} from scratch."""
+    tiebreaks = defaultdict(lambda: [0.0, 0.0])
+    for player in scores:
+        tiebreaks[player]
+    for player1, player2, winner, is_draw in matches:
+        if player2 is None:
+            continue
+        _credit(tiebreaks, player1, player2, scores.get(player2, 0.0), winner, is_draw)
+        _credit(tiebreaks, player2, player1, scores.get(player1, 0.0), winner, is_draw)
+    return {player: tuple(values) for player, values in tiebreaks.items()}
+
+
+def tiebreak_deltas(score_deltas, new_scores, previous_matches, new_matches):
+    """Compute tiebreak changes caused by a batch of new results.
+
+    ``score_deltas`` maps each player whose score changed to the change,
+    ``new_scores`` maps players to their score after the batch,
+    ``previous_matches`` are the earlier matches of the players in
+    ``score_deltas`` and ``new_matches`` are the matches in the batch.
+    Returns {player: (buchholz delta, sonneborn_berger delta)}.
+    """
+    deltas = defaultdict(lambda: [0.0, 0.0])
+
+    # An earlier opponent's score moved: pass the change on to the player
+    for player1, player2, winner, is_draw in previous_matches:
+        if player2 is None:
+            continue
+        for player, opponent in ((player1, player2), (player2, player1)):
+            change = score_deltas.get(opponent)
+            if change:
+                _credit(deltas, player, opponent, change, winner, is_draw)
+
+    # A new opponent contributes their whole current score
+    for player1, player2, winner, is_draw in new_matches:
+        if player2 is None:
+            continue
+        _credit(deltas, player1, player2, new_scores[player2], winner, is_draw)
+        _credit(deltas, player2, player1, new_scores[player1], winner, is_draw)
+
+    return {player: tuple(values) for player, values in deltas.items()}
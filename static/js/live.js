@@ -0,0 +1,37 @@
+// Live tournament updates over Server-Sent Events.
+//
+// listenForUpdates(url, handlers, lastEventId) opens the stream and calls
+// handlers[eventName](data) for each event. lastEventId is the id the page
+// was rendered at (its data-last-event-id), so events published between
+// rendering and subscribing are replayed. A 'reset' event (the server
+// restarted, matches were deleted or this page fell too far behind) reloads
+// the page. EventSource reconnects on its own and sends Last-Event-ID, so
+// events missed while disconnected are replayed too.
+function listenForUpdates(url, handlers, lastEventId) {
+    if (!window.EventSource) {
+        return null;
+    }
+    if (lastEventId !== undefined && lastEventId !== null && lastEventId !== '') {
+        url += (url.indexOf('?') === -1 ? '?' : '&') + 'last_event_id=' + encodeURIComponent(lastEventId);
+    }
+    const source = new EventSource(url);
+    Object.keys(handlers).forEach(function(name) {
+        source.addEventListener(name, function(event) {
+            handlers[name](JSON.parse(event.data));
+        });
+    });
+    source.addEventListener('reset', function() {
+        source.close();
+        window.location.reload();
+    });
+    return source;
+}
+
+function liveCell(tag, text, className) {
+    const cell = document.createElement(tag);
+    cell.textContent = text === null || text === undefined ? '' : text;
+    if (className) {
+        cell.className = className;
+    }
+    return cell;
+}
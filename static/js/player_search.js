@@ -0,0 +1,39 @@
+// Typeahead for player name inputs.
+//
+// Inputs with a data-search-url fill their <datalist> with registered
+// players whose name starts with what has been typed so far, leaving out
+// anyone already in the tournament named by data-exclude-tournament.
+// Requests wait for a pause in typing and stale responses are ignored.
+document.querySelectorAll('input[data-search-url]').forEach(function(input) {
+    const list = document.getElementById(input.getAttribute('list'));
+    let timer = null;
+    let latest = 0;
+
+    input.addEventListener('input', function() {
+        clearTimeout(timer);
+        const prefix = input.value.trim();
+        if (!prefix) {
+            list.replaceChildren();
+            return;
+        }
+        timer = setTimeout(function() {
+            const request = ++latest;
+            const params = new URLSearchParams({q: prefix});
+            if (input.dataset.excludeTournament) {
+                params.set('exclude_tournament', input.dataset.excludeTournament);
+            }
+            fetch(input.dataset.searchUrl + '?' + params)
+                .then(function(response) { return response.json(); })
+                .then(function(body) {
+                    if (request !== latest) {
+                        return;
+                    }
+                    list.replaceChildren.apply(list, body.data.map(function(player) {
+                        const option = document.createElement('option');
+                        option.value = player.name;
+                        return option;
+                    }));
+                });
+        }, 150);
+    });
+});
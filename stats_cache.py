@@ -0,0 +1,63 @@
+import threading
+
+
+class PlayerStatsCache:
+    """Per-player cache of cross-tournament statistics.
+
+    An entry remembers the version of every tournament it was computed from
+    (as reported by ``tournament_version``) plus a per-player version, and is
+    served only while none of them has changed. Any result, status change or
+    withdrawal in one of the player's tournaments therefore invalidates it,
+    ``bump_player`` covers the player joining a new tournament, and
+    ``bump_all`` covers changes to every player at once, such as ratings
+    being replayed.
+    """
+
+    def __init__(self, tournament_version):
+        self._tournament_version = tournament_version
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._player_versions = {}
+        self._entries = {}
+
+    def bump_player(self, player_name):
+        with self._lock:
+            self._player_versions[player_name] = self._player_versions.get(player_name, 0) + 1
+            self._entries.pop(player_name, None)
+
+    def bump_all(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def _player_version(self, player_name):
+        return self._generation, self._player_versions.get(player_name, 0)
+
+    def player_version(self, player_name):
+        with self._lock:
+            return self._player_version(player_name)
+
+    def get(self, player_name):
+        with self._lock:
+            entry = self._entries.get(player_name)
+            if entry is None or entry[0] != self._player_version(player_name):
+                return None
+        player_version, tournament_versions, value = entry
+        for tournament_id, version in tournament_versions.items():
+            if self._tournament_version(tournament_id) != version:
+                return None
+        return value
+
+    def snapshot(self, tournament_ids):
+        """Current versions of the given tournaments; take this before computing a value."""
+        return {tid: self._tournament_version(tid) for tid in tournament_ids}
+
+    def store(self, player_name, player_version, tournament_versions, value):
+        with self._lock:
+            if player_version == self._player_version(player_name):
+                self._entries[player_name] = (player_version, tournament_versions, value)
+
+    def clear(self):
+        with self._lock:
+            self._player_versions.clear()
+            self._entries.clear()
@@ -0,0 +1,94 @@
+"""Database configuration: connection URI, pooling and SQLite tuning.
+
+Settings come from, in order of precedence: values passed to ``create_app``,
+``TOURNEYMAN_*`` environment variables (e.g. ``TOURNEYMAN_SQLALCHEMY_DATABASE_URI``),
+``instance/config.py`` and the defaults below, so a deployment can point at
+another SQLite file or a Postgres server without editing ``app.py``.
+"""
+import os
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+DEFAULTS = {
+    'SQLALCHEMY_DATABASE_URI': 'sqlite:///tournament.db',
+    # SQLite connection tuning, applied to every new connection
+    'SQLITE_JOURNAL_MODE': 'WAL',  # readers no longer block the writer
+    'SQLITE_SYNCHRONOUS': 'NORMAL',  # safe with WAL, one fsync per checkpoint
+    'SQLITE_BUSY_TIMEOUT': 5000,  # ms to wait for a lock instead of failing
+    'SQLITE_MMAP_SIZE': 256 * 1024 * 1024,
+    'SQLITE_CACHE_SIZE': -64000,  # negative means KiB, i.e. 64 MB
+    # Pool settings for file-backed SQLite and server databases
+    'DATABASE_POOL_SIZE': 10,
+    'DATABASE_MAX_OVERFLOW': 20,
+    'DATABASE_POOL_TIMEOUT': 30,
+    'DATABASE_POOL_RECYCLE': 1800,
+}
+
+
+def is_sqlite(uri):
+    return make_url(uri).get_backend_name() == 'sqlite'
+
+
+def is_memory_sqlite(uri):
+    url = make_url(uri)
+    return url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:')
+
+
+def load_config(app, overrides=None):
+    """Populate ``app.config`` with storage settings and SQLAlchemy engine options.
+
+    ``overrides`` (e.g. from ``create_app``) take precedence over everything else.
+    """
+    for key, value in DEFAULTS.items():
+        app.config.setdefault(key, value)
+    app.config.from_pyfile(os.path.join(app.instance_path, 'config.py'), silent=True)
+    app.config.from_prefixed_env('TOURNEYMAN')
+    if overrides:
+        app.config.update(overrides)
+
+    uri = app.config['SQLALCHEMY_DATABASE_URI']
+    options = dict(app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    if not is_memory_sqlite(uri):
+        # In-memory SQLite keeps its single shared connection; everything
+        # else gets a bounded pool that checks connections before use.
+        options.setdefault('pool_size', app.config['DATABASE_POOL_SIZE'])
+        options.setdefault('max_overflow', app.config['DATABASE_MAX_OVERFLOW'])
+        options.setdefault('pool_timeout', app.config['DATABASE_POOL_TIMEOUT'])
+        options.setdefault('pool_pre_ping', True)
+        if not is_sqlite(uri):
+            options.setdefault('pool_recycle', app.config['DATABASE_POOL_RECYCLE'])
+    if is_sqlite(uri):
+        connect_args = dict(options.get('connect_args') or {})
+        # The driver's own busy handler, in seconds, backs up the PRAGMA
+        connect_args.setdefault('timeout', app.config['SQLITE_BUSY_TIMEOUT'] / 1000)
+        connect_args.setdefault('check_same_thread', False)
+        options['connect_args'] = connect_args
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = options
+
+
+def sqlite_pragmas(config):
+    pragmas = [
+        ('journal_mode', config['SQLITE_JOURNAL_MODE']),
+        ('synchronous', config['SQLITE_SYNCHRONOUS']),
+        ('busy_timeout', config['SQLITE_BUSY_TIMEOUT']),
+        ('mmap_size', config['SQLITE_MMAP_SIZE']),
+        ('cache_size', config['SQLITE_CACHE_SIZE']),
+    ]
+    return [(name, value) for name, value in pragmas if value is not None]
+
+
+def install_sqlite_pragmas(engine, config):
+    """Run the configured PRAGMAs on every new SQLite connection."""
+    if engine.dialect.name != 'sqlite':
+        return
+    pragmas = sqlite_pragmas(config)
+
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas:
+                cursor.execute(f'PRAGMA {name}={value}')
+        finally:
+            cursor.close()
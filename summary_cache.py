@@ -0,0 +1,39 @@
+import threading
+import time
+
+
+class SummaryCache:
+    """One cached value shared by every request, e.g. the tournament overview.
+
+    An entry is served while ``generation()`` still returns the value it was
+    computed under and its expiry time has not passed. The generation covers
+    writes made by this process; the expiry covers everything else, such as a
+    tournament starting or ending, or writes from another process.
+    """
+
+    def __init__(self, generation, ttl):
+        self._generation = generation
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._entry = None
+
+    def generation(self):
+        return self._generation()
+
+    def get(self):
+        with self._lock:
+            entry = self._entry
+        if entry is None or entry[0] != self._generation() or time.time() >= entry[1]:
+            return None
+        return entry[2]
+
+    def store(self, generation, value, expires_at=None):
+        """Cache ``value`` computed under ``generation``, until ``expires_at`` (a Unix time) at the latest."""
+        expires_at = min(expires_at or float('inf'), time.time() + self._ttl)
+        with self._lock:
+            if generation == self._generation():
+                self._entry = (generation, expires_at, value)
+
+    def clear(self):
+        with self._lock:
+            self._entry = None
@@ -0,0 +1,95 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import (
+    Tournament, TournamentFormat, TournamentStatus, add_contestants, bracket_for_view, create_app, db,
+    load_round_state
+)
+
+
+def add_tournament(tournament_id, tournament_format, players):
+    """Add a started tournament with ``players`` entrants to the current app's database."""
+    db.session.add(Tournament(
+        tournament_id=tournament_id, name=f'Test {tournament_id}', tFormat=tournament_format.value,
+        status=TournamentStatus.ACTIVE.value, start_date=datetime.now() - timedelta(days=1),
+        end_date=datetime.now() + timedelta(days=1), current_round=1
+    ))
+    db.session.commit()
+    # One at a time, so registration order (the last seeding tiebreak) follows n
+    for n in range(1, players + 1):
+        add_contestants(tournament_id, [], [f'Player {tournament_id}-{n}'])
+    return tournament_id
+
+
+def pending_pairs(tournament_id):
+    """Name pairs due to play next, all of which can be submitted in turn."""
+    tournament = Tournament.query.filter_by(tournament_id=tournament_id).one()
+    if tournament.tFormat == TournamentFormat.SWISS.value:
+        _, _, reported = load_round_state(tournament_id)
+        return [
+            (player1.player, player2.player) for player1, player2 in tournament.get_swiss_pairings()
+            if player2 is not None and player1.player not in reported and player2.player not in reported
+        ]
+    # Laid out but not saved until the first result
+    bracket, names = bracket_for_view(tournament)
+    matches = sorted(
+        (match for match in bracket if match.state == 'PENDING' and match.player1 and match.player2),
+        key=lambda match: (match.stage, match.position)
+    )
+    return [(names[match.player1], names[match.player2]) for match in matches]
+
+
+def submit(client, tournament_id, pair):
+    response = client.post(f'/tournaments/{tournament_id}/submit_result',
+                           data={'player1': pair[0], 'player2': pair[1], 'score': '2-1'})
+    assert response.status_code == 302
+    db.session.expire_all()
+
+
+def play(client, tournament_id, results):
+    pairs = []
+    for _ in range(results):
+        pairs = pairs or pending_pairs(tournament_id)
+        submit(client, tournament_id, pairs.pop(0))
+
+
+@pytest.fixture
+def app():
+    """An isolated app on its own in-memory database, with the schema created."""
+    app = create_app({'SQLALCHEMY_DATABASE_URI': 'sqlite://', 'SECRET_KEY': 'test', 'TESTING': True})
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def make_tournament(app):
+    """Build a started tournament: ``make_tournament(format, players)`` returns its tournament_id."""
+    created = []
+
+    def make(tournament_format, players):
+        created.append(add_tournament(len(created) + 1, tournament_format, players))
+        return created[-1]
+    return make
+
+
+@pytest.fixture
+def shared_apps(tmp_path):
+    """Two apps on one SQLite file, standing in for two server processes."""
+    config = {
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'tournament.db'}", 'SECRET_KEY': 'test', 'TESTING': True
+    }
+    apps = create_app(config), create_app(config)
+    with apps[0].app_context():
+        db.create_all()
+    yield apps
+    for app in apps:
+        with app.app_context():
+            db.engine.dispose()
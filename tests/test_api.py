@@ -0,0 +1,88 @@
+from conftest import pending_pairs, play, submit
+
+from app import TournamentFormat, withdraw_player
+
+
+def test_standings_fields_and_paging(client, make_tournament):
+    tournament_id = make_tournament(TournamentFormat.SWISS, 5)
+    play(client, tournament_id, 2)
+    url = f'/api/v1/tournaments/{tournament_id}/standings'
+
+    body = client.get(url, query_string={'fields': 'score,player', 'limit': 2}).get_json()
+    assert body['tournament_id'] == tournament_id
+    assert body['next_offset'] == 2
+    assert [list(row) for row in body['data']] == [['score', 'player']] * 2
+    assert [row['score'] for row in body['data']] == [1, 1]
+
+    rest = client.get(url, query_string={'fields': 'player', 'offset': 2}).get_json()
+    assert rest['next_offset'] is None
+    names = [row['player'] for row in body['data'] + rest['data']]
+    assert sorted(names) == [f'Player {tournament_id}-{n}' for n in range(1, 6)]
+
+
+def test_players_leave_out_withdrawn_on_request(client, make_tournament):
+    tournament_id = make_tournament(TournamentFormat.SWISS, 4)
+    withdraw_player(tournament_id, f'Player {tournament_id}-2')
+    url = f'/api/v1/tournaments/{tournament_id}/players'
+
+    everyone = client.get(url, query_string={'fields': 'player,active'}).get_json()['data']
+    assert len(everyone) == 4
+    assert {row['player'] for row in everyone if not row['active']} == {f'Player {tournament_id}-2'}
+    active = client.get(url, query_string={'fields': 'player', 'active': 1}).get_json()['data']
+    assert f'Player {tournament_id}-2' not in {row['player'] for row in active}
+    assert len(active) == 3
+
+
+def test_matches_page_with_the_after_cursor(client, make_tournament):
+    tournament_id = make_tournament(TournamentFormat.SWISS, 4)
+    play(client, tournament_id, 2)
+    round_two = pending_pairs(tournament_id)
+    submit(client, tournament_id, round_two[0])
+    url = f'/api/v1/tournaments/{tournament_id}/matches'
+
+    first = client.get(url, query_string={'limit': 2}).get_json()
+    assert len(first['data']) == 2
+    second = client.get(url, query_string={'limit': 2, 'after': first['next_after']}).get_json()
+    assert second['next_after'] is None
+    ids = [row['id'] for row in first['data'] + second['data']]
+    assert ids == sorted(ids) and len(ids) == 3
+    assert {row['round_number'] for row in first['data']} == {1}
+    assert [row['round_number'] for row in client.get(url, query_string={'round': 2}).get_json()['data']] == [2]
+
+    # Polling with the last id seen only returns newer results
+    assert client.get(url, query_string={'after': ids[-1]}).get_json()['data'] == []
+    submit(client, tournament_id, round_two[1])
+    new = client.get(url, query_string={'after': ids[-1], 'fields': 'player1,player2'}).get_json()['data']
+    assert [(row['player1'], row['player2']) for row in new] == [round_two[1]]
+
+
+def test_bad_requests_are_json_errors(client, make_tournament):
+    tournament_id = make_tournament(TournamentFormat.SWISS, 4)
+    api = f'/api/v1/tournaments/{tournament_id}'
+    for url, query in [
+        (f'{api}/standings', {'fields': 'score,nope'}),
+        (f'{api}/players', {'limit': 0}),
+        (f'{api}/players', {'offset': 'x'}),
+        (f'{api}/matches', {'after': 'x'}),
+    ]:
+        response = client.get(url, query_string=query)
+        assert response.status_code == 400
+        assert 'error' in response.get_json()
+    missing = client.get('/api/v1/tournaments/999/standings')
+    assert missing.status_code == 404
+    assert missing.get_json() == {'error': 'Not found'}
+
+
+def test_unchanged_tournament_answers_not_modified(client, make_tournament):
+    tournament_id = make_tournament(TournamentFormat.SWISS, 4)
+    for endpoint in ('standings', 'players', 'matches', 'bracket'):
+        url = f'/api/v1/tournaments/{tournament_id}/{endpoint}'
+        etag = client.get(url).headers['ETag']
+        assert client.get(url, headers={'If-None-Match': etag}).status_code == 304
+
+    url = f'/api/v1/tournaments/{tournament_id}/standings'
+    etag = client.get(url).headers['ETag']
+    play(client, tournament_id, 1)
+    response = client.get(url, headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
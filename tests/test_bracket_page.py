@@ -0,0 +1,43 @@
+from conftest import add_tournament
+
+from app import TournamentFormat, record_result
+
+
+def flash_message(client, message):
+    with client.session_transaction() as session:
+        session['_flashes'] = [('message', message)]
+
+
+def test_flash_messages_stay_with_their_session(app, make_tournament):
+    tournament_id = make_tournament(TournamentFormat.SWISS, 4)
+    url = f'/tournaments/{tournament_id}/bracket'
+    first, second = app.test_client(), app.test_client()
+
+    # A message pending for one session is not shown to the next one
+    flash_message(first, 'Only for the first')
+    assert 'Only for the first' in first.get(url).get_data(as_text=True)
+    assert 'Only for the first' not in second.get(url).get_data(as_text=True)
+
+    # With the page already built, a new message is still shown, once
+    flash_message(second, 'Only for the second')
+    assert 'Only for the second' in second.get(url).get_data(as_text=True)
+    assert 'Only for the second' not in second.get(url).get_data(as_text=True)
+    assert 'Only for the second' not in first.get(url).get_data(as_text=True)
+
+
+def test_results_from_another_process_reach_the_bracket(shared_apps):
+    first, second = shared_apps
+    with first.app_context():
+        tournament_id = add_tournament(1, TournamentFormat.SWISS, 4)
+    client = first.test_client()
+    url = f'/api/v1/tournaments/{tournament_id}/bracket'
+    before = client.get(url)
+    assert client.get(f'/tournaments/{tournament_id}/bracket').status_code == 200
+
+    with second.app_context():
+        record_result(tournament_id, f'Player {tournament_id}-1', f'Player {tournament_id}-3', '2-1')
+
+    after = client.get(url)
+    assert after.headers['ETag'] != before.headers['ETag']
+    scores = {entry['player']: entry['score'] for entry in after.get_json()['player_scores']}
+    assert scores[f'Player {tournament_id}-1'] == 1
@@ -0,0 +1,77 @@
+from app import MatchResult, Tournament, TournamentFormat
+
+
+def round_one(tournament_id):
+    return [
+        {'player1': f'Player {tournament_id}-1', 'player2': f'Player {tournament_id}-3', 'score': '2-1'},
+        {'player1': f'Player {tournament_id}-2', 'player2': f'Player {tournament_id}-4', 'score': '1-1', 'is_draw': True},
+    ]
+
+
+def recorded(tournament_id):
+    return MatchResult.query.filter_by(tournament_id=tournament_id).count()
+
+
+def test_a_whole_round_is_recorded_at_once(make_tournament, client):
+    tournament_id = make_tournament(TournamentFormat.SWISS, 4)
+    response = client.post(f'/tournaments/{tournament_id}/results/bulk',
+                           json={'round': 1, 'results': round_one(tournament_id)})
+    assert response.status_code == 200
+    assert response.get_json() == {'recorded': 2, 'current_round': 2, 'status': 'Active'}
+    assert recorded(tournament_id) == 2
+
+
+def test_a_round_with_bad_results_is_refused_whole(make_tournament, client):
+    tournament_id = make_tournament(TournamentFormat.SWISS, 4)
+    results = round_one(tournament_id) + [
+        {'player1': f'Player {tournament_id}-3', 'player2': f'Player {tournament_id}-4', 'score': '2-0'},
+        {'player1': f'Player {tournament_id}-1', 'player2': 'Nobody', 'score': '2-0'},
+    ]
+    response = client.post(f'/tournaments/{tournament_id}/results/bulk', json={'results': results})
+    assert response.status_code == 400
+    # Every problem is listed, not just the first
+    assert response.get_json()['errors'] == [
+        f'Result 3: Player Player {tournament_id}-3 already has a match in round 1',
+        f'Result 3: Player Player {tournament_id}-4 already has a match in round 1',
+        'Result 4: Player Nobody not found in tournament',
+    ]
+    assert recorded(tournament_id) == 0
+
+    response = client.post(f'/tournaments/{tournament_id}/results/bulk',
+                           json={'round': 2, 'results': round_one(tournament_id)})
+    assert response.status_code == 400
+    assert recorded(tournament_id) == 0
+
+
+def test_csv_bodies_are_accepted(make_tournament, client):
+    tournament_id = make_tournament(TournamentFormat.SWISS, 4)
+    body = (
+        'player1,player2,score,is_draw\n'
+        f'Player {tournament_id}-1,Player {tournament_id}-3,2-1,\n'
+        f'Player {tournament_id}-2,Player {tournament_id}-4,1-1,true\n'
+    )
+    response = client.post(f'/tournaments/{tournament_id}/results/bulk?round=1', data=body, content_type='text/csv')
+    assert response.status_code == 200
+    assert recorded(tournament_id) == 2
+
+
+def test_import_results_command(app, make_tournament, tmp_path):
+    tournament_id = make_tournament(TournamentFormat.SWISS, 4)
+    bad = tmp_path / 'bad.csv'
+    bad.write_text(f'player1,player2,score\nPlayer {tournament_id}-1,Nobody,2-1\n')
+    runner = app.test_cli_runner()
+    result = runner.invoke(args=['import-results', str(tournament_id), str(bad)])
+    assert result.exit_code == 1
+    assert 'Nobody' in result.output
+    assert recorded(tournament_id) == 0
+
+    good = tmp_path / 'round1.csv'
+    good.write_text(
+        'player1,player2,score,is_draw\n'
+        f'Player {tournament_id}-1,Player {tournament_id}-3,2-1,\n'
+        f'Player {tournament_id}-2,Player {tournament_id}-4,2-0,\n'
+    )
+    result = runner.invoke(args=['import-results', str(tournament_id), str(good), '--round', '1'])
+    assert result.exit_code == 0, result.output
+    assert 'Imported 2 result(s). Tournament is now in round 2' in result.output
+    assert Tournament.query.filter_by(tournament_id=tournament_id).one().current_round == 2
@@ -0,0 +1,74 @@
+import pytest
+from conftest import add_tournament
+
+from app import (
+    Contestant, MatchEntry, MatchResult, ResultValidationError, Tournament, TournamentFormat, db, load_round_state,
+    record_result
+)
+
+
+def interleave(monkeypatch, other_app, write):
+    """Run ``write`` in ``other_app`` (another process) right after the next write has read its state."""
+    calls = []
+
+    def load_then_interleave(tournament_id):
+        state = load_round_state(tournament_id)
+        calls.append(tournament_id)
+        if len(calls) == 1:
+            with other_app.app_context():
+                write()
+        return state
+    monkeypatch.setattr('app.load_round_state', load_then_interleave)
+    return calls
+
+
+def test_a_write_that_lost_the_race_is_retried(shared_apps, monkeypatch):
+    first, second = shared_apps
+    with first.app_context():
+        tournament_id = add_tournament(1, TournamentFormat.SWISS, 4)
+        calls = interleave(monkeypatch, second, lambda: record_result(
+            tournament_id, f'Player {tournament_id}-2', f'Player {tournament_id}-4', '2-1'
+        ))
+        record_result(tournament_id, f'Player {tournament_id}-1', f'Player {tournament_id}-3', '2-1')
+
+        assert len(calls) == 3  # Ours, the other write's, then ours again after the conflict
+        assert MatchEntry.query.count() == 4
+        tournament = Tournament.query.filter_by(tournament_id=tournament_id).one()
+        # Both results counted, so the round moved on
+        assert (tournament.current_round, tournament.round_expected, tournament.round_reported) == (2, 4, 0)
+
+
+def test_a_retry_never_gives_a_player_two_matches_in_a_round(shared_apps, monkeypatch):
+    first, second = shared_apps
+    with first.app_context():
+        tournament_id = add_tournament(1, TournamentFormat.SWISS, 4)
+        interleave(monkeypatch, second, lambda: record_result(
+            tournament_id, f'Player {tournament_id}-1', f'Player {tournament_id}-3', '2-0'
+        ))
+        with pytest.raises(ResultValidationError, match='already has a match in round 1'):
+            record_result(tournament_id, f'Player {tournament_id}-1', f'Player {tournament_id}-3', '2-1')
+        assert MatchEntry.query.count() == 2
+
+
+def test_the_round_entry_constraint_catches_what_the_revision_misses(shared_apps, monkeypatch):
+    first, second = shared_apps
+
+    def insert_match_without_touching_the_tournament():
+        players = {c.player: c for c in Contestant.query.filter_by(tournament_id=tournament_id)}
+        player1, player2 = players[f'Player {tournament_id}-1'], players[f'Player {tournament_id}-3']
+        db.session.add(MatchResult(
+            tournament_id=tournament_id, round_number=1, player1_id=player1.id, player2_id=player2.id,
+            winner_side=1, score='2-0', status='COMPLETED', entries=[
+                MatchEntry(contestant_id=player.id, tournament_id=tournament_id, round_number=1)
+                for player in (player1, player2)
+            ]
+        ))
+        db.session.commit()
+
+    with first.app_context():
+        tournament_id = add_tournament(1, TournamentFormat.SWISS, 4)
+        interleave(monkeypatch, second, insert_match_without_touching_the_tournament)
+        # The insert fails on unique_round_entry; the retry then sees the match
+        with pytest.raises(ResultValidationError, match='already has a match in round 1'):
+            record_result(tournament_id, f'Player {tournament_id}-1', f'Player {tournament_id}-3', '2-1')
+        assert MatchEntry.query.count() == 2
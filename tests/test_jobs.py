@@ -0,0 +1,177 @@
+import csv
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from conftest import add_tournament, play
+
+import jobs
+from app import (
+    JOB_HANDLERS, Job, JobStatus, TournamentFormat, claim_job, clean_up_jobs, db, enqueue_job, run_due_jobs,
+    run_next_job, start_job_runner
+)
+
+
+@pytest.fixture
+def handlers(monkeypatch):
+    """Throwaway job handlers for one test: ``handlers[name] = func``."""
+    monkeypatch.setattr('app.JOB_HANDLERS', dict(JOB_HANDLERS))
+    return sys.modules['app'].JOB_HANDLERS
+
+
+def job(job_id):
+    db.session.expire_all()
+    return db.session.get(Job, job_id)
+
+
+def test_jobs_with_a_key_are_queued_once(app, handlers):
+    handlers['noop'] = lambda **payload: None
+    first = enqueue_job('noop', key='noop:1', value=1)
+    db.session.commit()
+    assert enqueue_job('noop', key='noop:1', value=2) is first
+    assert enqueue_job('noop', key='noop:2') is not first
+    assert enqueue_job('noop') is not first
+    db.session.commit()
+    assert Job.query.count() == 3
+    with pytest.raises(ValueError):
+        enqueue_job('no_such_job')
+
+
+def test_claim_takes_the_next_due_job_once(app, handlers):
+    handlers['noop'] = lambda **payload: None
+    later = enqueue_job('noop', delay=60)
+    first, second = enqueue_job('noop'), enqueue_job('noop')
+    db.session.commit()
+
+    claimed = claim_job('worker-a')
+    assert (claimed.id, claimed.attempts) == (first.id, 1)
+    assert (job(first.id).status, job(first.id).worker) == (JobStatus.RUNNING.value, 'worker-a')
+    assert claim_job('worker-b').id == second.id
+    # The delayed job is not due yet
+    assert claim_job('worker-a') is None
+    assert job(later.id).status == JobStatus.QUEUED.value
+
+
+def test_two_apps_never_claim_the_same_job(shared_apps):
+    first, second = shared_apps
+    with first.app_context():
+        for _ in range(4):
+            enqueue_job('update_statuses')
+        db.session.commit()
+    claimed = []
+    for turn in range(5):
+        with shared_apps[turn % 2].app_context():
+            row = claim_job(f'worker-{turn % 2}')
+            claimed.append(row.id if row else None)
+    assert claimed[-1] is None
+    assert sorted(claimed[:4]) == [1, 2, 3, 4]
+
+
+def test_a_finished_job_stores_its_result(app, handlers):
+    handlers['add'] = lambda a, b: {'sum': a + b}
+    queued = enqueue_job('add', a=2, b=3)
+    db.session.commit()
+    assert run_due_jobs() == 1
+    done = job(queued.id)
+    assert (done.status, done.outcome, done.error) == (JobStatus.DONE.value, {'sum': 5}, None)
+    assert done.finished_at is not None
+    assert run_next_job('worker') is False
+
+
+def test_a_failing_job_is_retried_with_backoff_then_failed(app, handlers):
+    app.config.update(JOB_MAX_ATTEMPTS=3, JOB_RETRY_SECONDS=10)
+
+    def fail():
+        raise RuntimeError('no luck')
+    handlers['fail'] = fail
+    queued = enqueue_job('fail')
+    db.session.commit()
+
+    for attempts in (1, 2):
+        started = datetime.now()
+        assert run_next_job('worker') is True
+        retry = job(queued.id)
+        assert (retry.status, retry.attempts) == (JobStatus.QUEUED.value, attempts)
+        assert retry.error == 'RuntimeError: no luck'
+        delay = jobs.retry_delay(attempts, 10)
+        assert started + timedelta(seconds=delay) <= retry.run_at <= datetime.now() + timedelta(seconds=delay)
+        # Not due again until the backoff has passed
+        assert run_next_job('worker') is False
+        retry.run_at = datetime.now()
+        db.session.commit()
+
+    assert run_next_job('worker') is True
+    failed = job(queued.id)
+    assert (failed.status, failed.attempts) == (JobStatus.FAILED.value, 3)
+    assert failed.finished_at is not None
+
+
+def test_clean_up_requeues_jobs_whose_worker_went_away(app, handlers):
+    app.config.update(JOB_TIMEOUT=60, JOB_MAX_ATTEMPTS=2, EXPORT_DIR=None)
+    handlers['noop'] = lambda **payload: None
+    stuck, hopeless = enqueue_job('noop'), enqueue_job('noop')
+    db.session.commit()
+    claim_job('gone')
+    claim_job('gone')
+    hopeless.attempts = 2
+    for running in (stuck, hopeless):
+        running.started_at = datetime.now() - timedelta(seconds=120)
+    db.session.commit()
+
+    clean_up_jobs()
+    assert (job(stuck.id).status, job(stuck.id).worker) == (JobStatus.QUEUED.value, None)
+    assert job(hopeless.id).status == JobStatus.FAILED.value
+    assert run_due_jobs() == 1
+
+
+def test_export_runs_in_the_background(app, client, make_tournament, tmp_path):
+    app.config['EXPORT_DIR'] = str(tmp_path)
+    tournament_id = make_tournament(TournamentFormat.SWISS, 4)
+    play(client, tournament_id, 2)
+
+    assert client.post(f'/tournaments/{tournament_id}/export').status_code == 302
+    assert client.post(f'/tournaments/{tournament_id}/export').status_code == 302
+    listing = client.get('/api/v1/jobs').get_json()
+    assert listing['counts'][JobStatus.QUEUED.value] == 1
+    job_id = listing['data'][0]['id']
+
+    assert run_due_jobs() == 1
+    body = client.get(f'/api/v1/jobs/{job_id}').get_json()
+    assert body['status'] == JobStatus.DONE.value
+    with open(os.path.join(tmp_path, body['result']['file']), newline='') as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ['round', 'player1', 'player2', 'score', 'is_draw']
+    assert len(rows) == 3
+    done = client.get('/api/v1/jobs', query_string={'status': JobStatus.DONE.value}).get_json()
+    assert [row['id'] for row in done['data']] == [job_id]
+    page = client.get('/jobs', query_string={'status': 'Nope'}).get_data(as_text=True)
+    assert 'Unknown job status &#39;Nope&#39;' in page
+
+
+def test_runner_threads_work_the_queue(shared_apps):
+    first, second = shared_apps
+    first.config.update(JOB_WORKERS=2, JOB_POLL_SECONDS=0.05, JOB_SCHEDULE={'update_statuses': 3600})
+    with second.app_context():
+        add_tournament(1, TournamentFormat.SWISS, 2)
+        queued = [enqueue_job('update_statuses') for _ in range(3)]
+        db.session.commit()
+        queued = [row.id for row in queued]
+
+    runner = start_job_runner(first)
+    try:
+        with second.app_context():
+            deadline = time.monotonic() + 10
+            while time.monotonic() < deadline:
+                statuses = [row.status for row in Job.query.order_by(Job.id)]
+                db.session.rollback()
+                # The three queued jobs, plus the scheduler's one at startup
+                if len(statuses) == 4 and set(statuses) == {JobStatus.DONE.value}:
+                    break
+                time.sleep(0.05)
+            done = Job.query.filter(Job.id.in_(queued)).all()
+            assert [row.status for row in done] == [JobStatus.DONE.value] * 3
+            assert Job.query.count() == 4
+    finally:
+        runner.stop()
@@ -0,0 +1,83 @@
+"""Elimination events played before brackets were saved (see app.is_legacy_bracket)."""
+import migrations
+from app import (
+    BracketMatch, Contestant, MatchEntry, MatchResult, PlayerStatus, Tournament, TournamentFormat, db,
+    is_legacy_bracket, record_result
+)
+
+
+def contestants(tournament_id):
+    return {c.player: c for c in Contestant.query.filter_by(tournament_id=tournament_id)}
+
+
+def play_legacy(tournament_id, round_number, winner, loser):
+    """Record a result the way the app did before brackets were saved."""
+    players = contestants(tournament_id)
+    db.session.add(MatchResult(
+        tournament_id=tournament_id, round_number=round_number,
+        player1_id=players[winner].id, player2_id=players[loser].id, winner_side=1, score='2-0',
+        status='COMPLETED',
+        entries=[
+            MatchEntry(contestant_id=players[name].id, tournament_id=tournament_id, round_number=round_number)
+            for name in (winner, loser)
+        ]
+    ))
+    players[winner].matches_played += 1
+    players[loser].matches_played += 1
+    players[loser].losses += 1
+    players[loser].status = PlayerStatus.ELIMINATED.value
+    players[loser].active = False
+    db.session.commit()
+
+
+def rebuild_legacy_brackets():
+    with db.engine.begin() as connection:
+        migrations.rebuild_legacy_brackets(connection, db.metadata)
+    db.session.expire_all()
+
+
+def test_history_that_fits_gets_its_bracket(make_tournament):
+    tournament_id = make_tournament(TournamentFormat.SINGLE_ELIMINATION, 4)
+    # Seeds 1 v 4 and 2 v 3, as the bracket pairs them
+    play_legacy(tournament_id, 1, f'Player {tournament_id}-1', f'Player {tournament_id}-4')
+    play_legacy(tournament_id, 1, f'Player {tournament_id}-2', f'Player {tournament_id}-3')
+    tournament = Tournament.query.filter_by(tournament_id=tournament_id).one()
+    assert is_legacy_bracket(tournament)
+
+    rebuild_legacy_brackets()
+    tournament = Tournament.query.filter_by(tournament_id=tournament_id).one()
+    assert not is_legacy_bracket(tournament)
+    assert BracketMatch.query.filter_by(tournament_id=tournament_id).count() == 3
+    assert tournament.current_round == 2
+
+    record_result(tournament_id, f'Player {tournament_id}-1', f'Player {tournament_id}-2', '2-1')
+    assert Tournament.query.filter_by(tournament_id=tournament_id).one().status == 'Completed'
+
+
+def test_history_that_does_not_fit_runs_as_before(make_tournament, client):
+    tournament_id = make_tournament(TournamentFormat.SINGLE_ELIMINATION, 4)
+    # 1 v 2 in the first round is not a pairing the bracket would make
+    play_legacy(tournament_id, 1, f'Player {tournament_id}-1', f'Player {tournament_id}-2')
+    play_legacy(tournament_id, 1, f'Player {tournament_id}-3', f'Player {tournament_id}-4')
+    Tournament.query.filter_by(tournament_id=tournament_id).one().current_round = 2
+    db.session.commit()
+
+    rebuild_legacy_brackets()
+    tournament = Tournament.query.filter_by(tournament_id=tournament_id).one()
+    assert is_legacy_bracket(tournament)
+    assert tournament.current_round == 2
+    assert (tournament.round_expected, tournament.round_reported) == (2, 0)
+
+    # The page shows the results rather than an empty or made-up bracket
+    view = client.get(f'/api/v1/tournaments/{tournament_id}/bracket').get_json()
+    assert [(match['player1'], match['player2']) for match in view['rounds'][0]['matches']] == [
+        (f'Player {tournament_id}-1', f'Player {tournament_id}-2'),
+        (f'Player {tournament_id}-3', f'Player {tournament_id}-4'),
+    ]
+
+    # New results are recorded without laying out a bracket
+    record_result(tournament_id, f'Player {tournament_id}-3', f'Player {tournament_id}-1', '2-1')
+    tournament = Tournament.query.filter_by(tournament_id=tournament_id).one()
+    assert BracketMatch.query.filter_by(tournament_id=tournament_id).count() == 0
+    assert tournament.status == 'Completed'
+    assert contestants(tournament_id)[f'Player {tournament_id}-3'].status == PlayerStatus.WON.value
@@ -0,0 +1,45 @@
+import json
+import re
+
+from app import Contestant, TournamentFormat, event_broker, record_result
+
+
+def events(subscription):
+    """The (event, data) pairs queued for a subscription so far."""
+    messages = []
+    while not subscription.queue.empty():
+        fields = dict(line.split(': ', 1) for line in subscription.queue.get_nowait().splitlines() if line)
+        messages.append((fields['event'], json.loads(fields['data'])))
+    return messages
+
+
+def test_pages_resume_their_stream_from_where_they_were_rendered(make_tournament, client):
+    tournament_id = make_tournament(TournamentFormat.SWISS, 4)
+    record_result(tournament_id, f'Player {tournament_id}-1', f'Player {tournament_id}-3', '2-1')
+    for page in ('bracket', 'recent_matches'):
+        html = client.get(f'/tournaments/{tournament_id}/{page}').get_data(as_text=True)
+        assert re.search(r'data-last-event-id="(\d+)"', html).group(1) == '1'
+
+    # A result published between rendering and subscribing is not lost
+    record_result(tournament_id, f'Player {tournament_id}-2', f'Player {tournament_id}-4', '2-1')
+    response = client.get(f'/tournaments/{tournament_id}/events?last_event_id=1', buffered=False)
+    first = next(response.response).decode()
+    assert 'event: results' in first and 'id: 2' in first
+    response.close()
+
+
+def test_standings_updates_carry_the_tiebreak_order(make_tournament):
+    tournament_id = make_tournament(TournamentFormat.SWISS, 4)
+    subscription = event_broker.subscribe(tournament_id)
+    # Everyone ends the round on one point or none, so tiebreaks decide the order
+    record_result(tournament_id, f'Player {tournament_id}-1', f'Player {tournament_id}-3', '2-1')
+    record_result(tournament_id, f'Player {tournament_id}-4', f'Player {tournament_id}-2', '2-1')
+    record_result(tournament_id, f'Player {tournament_id}-1', f'Player {tournament_id}-4', '2-1')
+
+    ranks = {}
+    for event, data in events(subscription):
+        if event == 'results':
+            ranks.update((standing['player'], standing['rank']) for standing in data['standings'])
+    expected = [c.player for c in Contestant.standings(tournament_id)]
+    assert sorted(ranks, key=ranks.get) == expected
+    subscription.broker.unsubscribe(subscription)
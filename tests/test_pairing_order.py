@@ -0,0 +1,31 @@
+from app import Contestant, Tournament, TournamentFormat, db, record_result
+
+
+def round_robin_pairs(tournament_id):
+    tournament = Tournament.query.filter_by(tournament_id=tournament_id).one()
+    return [(home.player, away and away.player) for home, away in tournament.get_round_robin_pairings()]
+
+
+def test_seeds_order_the_schedule_until_play_begins(make_tournament):
+    tournament_id = make_tournament(TournamentFormat.ROUND_ROBIN, 4)
+    before = round_robin_pairs(tournament_id)
+    last = Contestant.query.filter_by(tournament_id=tournament_id, player=f'Player {tournament_id}-4').one()
+    last.seed = 1
+    db.session.commit()
+    assert round_robin_pairs(tournament_id) != before
+
+
+def test_schedule_is_fixed_once_play_begins(make_tournament):
+    tournament_id = make_tournament(TournamentFormat.ROUND_ROBIN, 4)
+    home, away = round_robin_pairs(tournament_id)[0]
+    record_result(tournament_id, home, away, '2-1')
+    db.session.expire_all()
+    pairs = round_robin_pairs(tournament_id)
+    positions = [c.position for c in Contestant.query.filter_by(tournament_id=tournament_id).order_by(Contestant.id)]
+    assert positions == [1, 2, 3, 4]
+
+    # Re-seeding someone mid-event must not reshuffle the rounds still to play
+    last = Contestant.query.filter_by(tournament_id=tournament_id, player=f'Player {tournament_id}-4').one()
+    last.seed = 1
+    db.session.commit()
+    assert round_robin_pairs(tournament_id) == pairs
@@ -0,0 +1,74 @@
+from app import (
+    Contestant, Player, TournamentFormat, add_contestants, register_players, returning_players, search_players
+)
+from instrumentation import count_queries
+
+
+def names(players):
+    return [player.name for player in players]
+
+
+def test_entering_again_reuses_the_player(make_tournament):
+    first = make_tournament(TournamentFormat.SWISS, 2)
+    second = make_tournament(TournamentFormat.SWISS, 0)
+    add_contestants(second, [], [f'Player {first}-1', 'Newcomer'])
+
+    assert Player.query.count() == 3
+    profile = Player.query.filter_by(name=f'Player {first}-1').one()
+    assert {entry.tournament_id for entry in profile.entries} == {first, second}
+    assert register_players([profile.name, 'Newcomer'])[profile.name].id == profile.id
+    assert Player.query.count() == 3
+
+
+def test_search_is_a_case_insensitive_prefix_match(make_tournament):
+    tournament_id = make_tournament(TournamentFormat.SWISS, 0)
+    add_contestants(tournament_id, [], ['alice', 'Albert'])
+    register_players(['ALAN', 'Bob', 'Malcolm'])
+
+    assert names(search_players('al')) == ['ALAN', 'Albert', 'alice']
+    assert names(search_players('AL', limit=2)) == ['ALAN', 'Albert']
+    assert names(search_players('Al', exclude_tournament=tournament_id)) == ['ALAN']
+    assert search_players('z') == []
+
+
+def test_search_endpoint(client, make_tournament):
+    tournament_id = make_tournament(TournamentFormat.SWISS, 0)
+    add_contestants(tournament_id, [], ['alice'])
+    register_players(['Albert', 'Bob'])
+
+    body = client.get('/api/v1/players', query_string={'q': 'AL'}).get_json()
+    assert [player['name'] for player in body['data']] == ['Albert', 'alice']
+    assert all(isinstance(player['id'], int) for player in body['data'])
+    excluded = client.get('/api/v1/players', query_string={'q': 'al', 'exclude_tournament': tournament_id}).get_json()
+    assert [player['name'] for player in excluded['data']] == ['Albert']
+    assert client.get('/api/v1/players').get_json() == {'data': []}
+    assert client.get('/api/v1/players', query_string={'q': 'al', 'limit': 'x'}).status_code == 400
+
+
+def test_returning_players_leave_out_this_tournaments_entrants(make_tournament):
+    earlier = make_tournament(TournamentFormat.SWISS, 3)
+    current = make_tournament(TournamentFormat.SWISS, 0)
+    add_contestants(current, [], [f'Player {earlier}-2'])
+
+    assert set(names(returning_players(current))) == {f'Player {earlier}-1', f'Player {earlier}-3'}
+    assert names(returning_players(current, limit=1)) in ([f'Player {earlier}-1'], [f'Player {earlier}-3'])
+
+
+def test_returning_players_are_entered_in_one_statement(client, make_tournament):
+    earlier = make_tournament(TournamentFormat.SWISS, 0)
+    add_contestants(earlier, [], [f'Returning {n}' for n in range(150)])
+    current = make_tournament(TournamentFormat.SWISS, 0)
+    player_ids = [player.id for player in returning_players(current)]
+    assert len(player_ids) == 150
+
+    with count_queries() as queries:
+        response = client.post(f'/tournaments/{current}/add_players', data={
+            'player_ids': [str(player_id) for player_id in player_ids], 'names': 'Newcomer\nReturning 1\n'
+        })
+    assert response.status_code == 302
+    inserts = [statement for statement, _ in queries.statements if statement.lstrip().upper().startswith('INSERT')]
+    assert len(inserts) == 2  # The new player, then every entry at once
+    assert Contestant.query.filter_by(tournament_id=current).count() == 151
+
+    # Entering the same players again adds nobody
+    assert add_contestants(current, player_ids, ['Newcomer']) == []
@@ -0,0 +1,63 @@
+"""SQL statement budgets for the hot pages.
+
+Each page is measured on a small and a larger tournament: the count must stay
+within its budget and must not grow with the number of players or matches.
+"""
+import pytest
+from conftest import pending_pairs, play, submit
+
+from app import TournamentFormat, db
+from instrumentation import count_queries
+
+FORMATS = [TournamentFormat.SWISS, TournamentFormat.DOUBLE_ELIMINATION]
+SIZES = (8, 32)
+
+
+def page_queries(client, url):
+    db.session.expire_all()
+    with count_queries() as queries:
+        assert client.get(url).status_code == 200
+    return queries.count
+
+
+def played_tournament(make_tournament, client, tournament_format, players):
+    """A tournament a round and a half in."""
+    tournament_id = make_tournament(tournament_format, players)
+    play(client, tournament_id, players // 2 + players // 4)
+    return tournament_id
+
+
+# Page: (url for a tournament and one of its players, statement budget)
+PAGES = {
+    'details': (lambda tournament_id, player: f'/tournaments/{tournament_id}', 4),
+    'bracket': (lambda tournament_id, player: f'/tournaments/{tournament_id}/bracket', 4),
+    'player_stats': (lambda tournament_id, player: f'/player/{player}', 3),
+}
+# Brackets also save the advanced bracket matches
+SUBMIT_BUDGETS = {TournamentFormat.SWISS: 10, TournamentFormat.DOUBLE_ELIMINATION: 12}
+
+
+@pytest.mark.parametrize('tournament_format', FORMATS, ids=lambda f: f.name.lower())
+@pytest.mark.parametrize('page', sorted(PAGES))
+def test_page_query_budget(make_tournament, client, page, tournament_format):
+    url, budget = PAGES[page]
+    counts = []
+    for players in SIZES:
+        tournament_id = played_tournament(make_tournament, client, tournament_format, players)
+        player = pending_pairs(tournament_id)[0][0]
+        counts.append(page_queries(client, url(tournament_id, player)))
+    assert counts[0] == counts[1]
+    assert counts[0] <= budget
+
+
+@pytest.mark.parametrize('tournament_format', FORMATS, ids=lambda f: f.name.lower())
+def test_submit_result_query_budget(make_tournament, client, tournament_format):
+    counts = []
+    for players in SIZES:
+        tournament_id = played_tournament(make_tournament, client, tournament_format, players)
+        pair = pending_pairs(tournament_id)[0]
+        with count_queries() as queries:
+            submit(client, tournament_id, pair)
+        counts.append(queries.count)
+    assert counts[0] == counts[1]
+    assert counts[0] <= SUBMIT_BUDGETS[tournament_format]
@@ -0,0 +1,98 @@
+"""Query plans of the statements the pages and result submission actually run."""
+import pytest
+from conftest import pending_pairs, play
+from sqlalchemy import inspect, text
+
+import migrations
+from app import TournamentFormat, clear_caches, db, full_scans, read_pages, request_statements, statement_plan
+
+FORMATS = [TournamentFormat.SWISS, TournamentFormat.DOUBLE_ELIMINATION]
+PAGES = [name for name, _, _ in read_pages(0, '')]
+
+# Indexes each page has to use, by read_pages name
+EXPECTED_INDEXES = {
+    'index': ['ix_tournament_start_date'],
+    'tournaments': ['ix_tournament_start_date'],
+    'tournament_details': ['ix_match_result_tournament_round'],
+    'add_players.search': ['ix_player_name_key'],
+    'match_management': ['ix_contestant_tournament_active'],
+    'recent_matches': ['ix_match_result_tournament_round'],
+    'bracket': ['ix_match_result_tournament_round'],
+    'player_stats': ['ix_contestant_player_id', 'ix_match_result_player1', 'ix_match_result_player2'],
+    'api_player_search': ['ix_player_name_key'],
+    'api_matches': ['ix_match_result_tournament_round'],
+}
+
+LOOKUP_INDEXES = {
+    'ix_contestant_tournament_active',
+    'ix_contestant_tournament_status',
+    'ix_match_result_tournament_round',
+    'ix_match_result_player1',
+    'ix_match_result_player2',
+}
+
+
+def plans(statements):
+    return [step for statement in statements for step in statement_plan(*statement)]
+
+
+def indexes_used(steps):
+    return {step.split(' INDEX ')[1].split()[0] for step in steps if ' INDEX ' in step}
+
+
+def page_plans(client, tournament_id, page):
+    """Plan steps of every SELECT the page runs, with the full scans it is allowed."""
+    name, url, allowed = next(entry for entry in read_pages(tournament_id, f'Player {tournament_id}-1') if entry[0] == page)
+    clear_caches()
+    response, statements = request_statements(client, 'GET', url)
+    assert response.status_code == 200
+    return plans(statements), allowed
+
+
+@pytest.fixture
+def played(make_tournament, client):
+    """A Swiss and a double elimination tournament, each a round and a half in."""
+    tournaments = {}
+    for tournament_format in FORMATS:
+        tournaments[tournament_format] = make_tournament(tournament_format, 8)
+        play(client, tournaments[tournament_format], 6)
+    return tournaments
+
+
+@pytest.mark.parametrize('tournament_format', FORMATS, ids=lambda f: f.name.lower())
+@pytest.mark.parametrize('page', PAGES)
+def test_page_queries_use_indexes(played, client, page, tournament_format):
+    steps, allowed = page_plans(client, played[tournament_format], page)
+    assert [scan for scan in full_scans(steps) if scan not in allowed] == []
+    assert set(EXPECTED_INDEXES.get(page, [])) <= indexes_used(steps)
+
+
+@pytest.mark.parametrize('tournament_format', FORMATS, ids=lambda f: f.name.lower())
+def test_submitting_a_result_uses_indexes(played, client, tournament_format):
+    tournament_id = played[tournament_format]
+    player1, player2 = pending_pairs(tournament_id)[0]
+    response, statements = request_statements(
+        client, 'POST', f'/tournaments/{tournament_id}/submit_result',
+        data={'player1': player1, 'player2': player2, 'score': '2-1'}
+    )
+    assert response.status_code == 302
+    steps = plans(statements)
+    assert full_scans(steps) == []
+    assert 'ix_match_result_tournament_round' in indexes_used(steps)
+
+
+def test_upgrade_adds_missing_indexes(played, client):
+    tournament_id = played[TournamentFormat.SWISS]
+    # A database from before the indexes existed
+    for index in LOOKUP_INDEXES:
+        db.session.execute(text(f'DROP INDEX {index}'))
+    db.session.commit()
+    assert full_scans(page_plans(client, tournament_id, 'recent_matches')[0])
+
+    migrations.upgrade(db.engine, db.metadata)
+    inspector = inspect(db.engine)
+    existing = {
+        index['name'] for table in ('contestant', 'match_result') for index in inspector.get_indexes(table)
+    }
+    assert LOOKUP_INDEXES <= existing
+    assert not full_scans(page_plans(client, tournament_id, 'recent_matches')[0])
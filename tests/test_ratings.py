@@ -0,0 +1,25 @@
+import re
+
+import ratings
+from app import MatchEntry, MatchResult, Player, TournamentFormat, db, rebuild_ratings, record_result
+
+
+def shown_rating(client, player_name):
+    page = client.get(f'/player/{player_name}').get_data(as_text=True)
+    return float(re.search(r'<h3>Rating</h3>\s*<p>([^<]*)</p>', page).group(1))
+
+
+def test_replayed_ratings_reach_the_player_page(make_tournament, client):
+    tournament_id = make_tournament(TournamentFormat.SWISS, 4)
+    winner = f'Player {tournament_id}-1'
+    record_result(tournament_id, winner, f'Player {tournament_id}-3', '2-1')
+    rating = Player.query.filter_by(name=winner).one().rating
+    assert rating > ratings.DEFAULT_RATING
+    assert shown_rating(client, winner) == round(rating)
+
+    # History changed without touching the tournament, e.g. another one cleared
+    MatchEntry.query.delete()
+    MatchResult.query.delete()
+    db.session.commit()
+    assert rebuild_ratings() == 0
+    assert shown_rating(client, winner) == ratings.DEFAULT_RATING
@@ -0,0 +1,49 @@
+import pytest
+from sqlalchemy import event
+
+from app import Contestant, MatchResult, ResultValidationError, Tournament, TournamentFormat, db, record_results
+
+
+def contestant(tournament_id, player):
+    return Contestant.query.filter_by(tournament_id=tournament_id, player=player).one()
+
+
+def test_each_result_is_written_in_one_commit(make_tournament, client):
+    tournament_id = make_tournament(TournamentFormat.SWISS, 4)
+    commits = []
+
+    def count_commit(connection):
+        commits.append(connection)
+    event.listen(db.engine, 'commit', count_commit)
+    try:
+        # The second result also completes the round
+        for player1, player2 in ((1, 3), (2, 4)):
+            response = client.post(f'/tournaments/{tournament_id}/submit_result', data={
+                'player1': f'Player {tournament_id}-{player1}', 'player2': f'Player {tournament_id}-{player2}',
+                'score': '2-1'
+            })
+            assert response.status_code == 302
+    finally:
+        event.remove(db.engine, 'commit', count_commit)
+    assert len(commits) == 2
+    assert Tournament.query.filter_by(tournament_id=tournament_id).one().current_round == 2
+
+    winner = contestant(tournament_id, f'Player {tournament_id}-1')
+    loser = contestant(tournament_id, f'Player {tournament_id}-3')
+    assert (winner.score, winner.matches_played, winner.matches_won) == (1, 1, 1)
+    assert (loser.score, loser.matches_played, loser.matches_won) == (0, 1, 0)
+    match = MatchResult.query.filter_by(tournament_id=tournament_id, player1_id=winner.id).one()
+    assert (match.winner, match.loser, match.score) == (winner.player, loser.player, '2-1')
+
+
+def test_a_batch_with_any_bad_result_records_nothing(make_tournament):
+    tournament_id = make_tournament(TournamentFormat.SWISS, 4)
+    with pytest.raises(ResultValidationError) as error:
+        record_results(tournament_id, [
+            {'player1': f'Player {tournament_id}-1', 'player2': f'Player {tournament_id}-3', 'score': '2-1'},
+            {'player1': f'Player {tournament_id}-2', 'player2': 'Nobody', 'score': '2-1'},
+            {'player1': f'Player {tournament_id}-4', 'player2': f'Player {tournament_id}-1', 'score': '2-1'},
+        ])
+    assert len(error.value.errors) == 2
+    assert MatchResult.query.filter_by(tournament_id=tournament_id).count() == 0
+    assert contestant(tournament_id, f'Player {tournament_id}-1').matches_played == 0
@@ -0,0 +1,46 @@
+from app import Tournament, TournamentFormat, db, record_result, register_bye, withdraw_player
+
+
+def progress(tournament_id):
+    tournament = Tournament.query.filter_by(tournament_id=tournament_id).one()
+    return tournament.current_round, tournament.round_expected, tournament.round_reported
+
+
+def test_counters_follow_results_and_close_the_round(make_tournament):
+    tournament_id = make_tournament(TournamentFormat.SWISS, 4)
+    assert progress(tournament_id) == (1, 4, 0)
+    record_result(tournament_id, f'Player {tournament_id}-1', f'Player {tournament_id}-3', '2-1')
+    assert progress(tournament_id) == (1, 4, 2)
+    record_result(tournament_id, f'Player {tournament_id}-2', f'Player {tournament_id}-4', '1-1', is_draw=True)
+    assert progress(tournament_id) == (2, 4, 0)
+
+
+def test_withdrawals_and_byes_count_towards_the_round(make_tournament):
+    tournament_id = make_tournament(TournamentFormat.SWISS, 4)
+    # Nobody waits for a player who withdrew before reporting
+    withdraw_player(tournament_id, f'Player {tournament_id}-4')
+    assert progress(tournament_id) == (1, 3, 0)
+    record_result(tournament_id, f'Player {tournament_id}-1', f'Player {tournament_id}-3', '2-1')
+    register_bye(tournament_id, f'Player {tournament_id}-2')
+    assert progress(tournament_id) == (2, 3, 0)
+
+
+def test_check_rounds_finds_and_repairs_wrong_counters(app, make_tournament):
+    tournament_id = make_tournament(TournamentFormat.SWISS, 4)
+    record_result(tournament_id, f'Player {tournament_id}-1', f'Player {tournament_id}-3', '2-1')
+    record_result(tournament_id, f'Player {tournament_id}-2', f'Player {tournament_id}-4', '2-1')
+    # Counters left behind as if the round had not finished
+    tournament = Tournament.query.filter_by(tournament_id=tournament_id).one()
+    tournament.current_round, tournament.round_expected, tournament.round_reported = 1, 5, 3
+    db.session.commit()
+
+    runner = app.test_cli_runner()
+    result = runner.invoke(args=['check_rounds'])
+    assert result.exit_code == 1
+    assert 'stored 3/5 reported, history says 4/4' in result.output
+
+    result = runner.invoke(args=['check_rounds', '--fix'])
+    assert result.exit_code == 0
+    db.session.expire_all()
+    assert progress(tournament_id) == (2, 4, 0)
+    assert runner.invoke(args=['check_rounds']).exit_code == 0
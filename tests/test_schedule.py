@@ -0,0 +1,30 @@
+from collections import Counter
+from itertools import combinations
+
+import pytest
+
+from schedule import iter_schedule
+
+
+def games(player_count, double=False):
+    return [
+        (home, away) for _, pairings in iter_schedule(player_count, double)
+        for home, away in pairings if away is not None
+    ]
+
+
+@pytest.mark.parametrize('player_count', range(3, 11))
+def test_everyone_meets_once_with_home_and_away_balanced(player_count):
+    played = games(player_count)
+    assert sorted(tuple(sorted(game)) for game in played) == list(combinations(range(player_count), 2))
+
+    home = Counter(home for home, _ in played)
+    away = Counter(away for _, away in played)
+    assert all(abs(home[player] - away[player]) <= 1 for player in range(player_count))
+
+
+@pytest.mark.parametrize('player_count', range(3, 11))
+def test_double_round_robin_swaps_home_and_away(player_count):
+    played = Counter(games(player_count, double=True))
+    assert all(played[(away, home)] == 1 for home, away in played)
+    assert set(played.values()) == {1}
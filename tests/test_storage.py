@@ -0,0 +1,15 @@
+from flask import Flask
+
+import storage
+
+
+def test_instance_config_is_read(tmp_path, monkeypatch):
+    (tmp_path / 'config.py').write_text("SQLITE_BUSY_TIMEOUT = 1234\nSQLITE_CACHE_SIZE = -1000\n")
+    monkeypatch.setenv('TOURNEYMAN_SQLITE_CACHE_SIZE', '-2000')
+    app = Flask(__name__, instance_path=str(tmp_path))
+    storage.load_config(app, {'SQLALCHEMY_DATABASE_URI': 'sqlite://'})
+
+    assert app.config['SQLITE_BUSY_TIMEOUT'] == 1234
+    assert app.config['SQLALCHEMY_ENGINE_OPTIONS']['connect_args']['timeout'] == 1.234
+    # Environment variables still take precedence over the file
+    assert app.config['SQLITE_CACHE_SIZE'] == -2000
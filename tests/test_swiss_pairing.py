@@ -0,0 +1,114 @@
+import itertools
+import random
+
+import pytest
+from conftest import add_tournament
+
+from app import Tournament, TournamentFormat, db, record_result
+from matching import max_weight_matching
+from pairing import build_opponent_index, swiss_pairings
+
+
+def swiss_pairs(tournament_id):
+    tournament = Tournament.query.filter_by(tournament_id=tournament_id).one()
+    return {
+        frozenset((player1.player, player2.player if player2 else None))
+        for player1, player2 in tournament.get_swiss_pairings()
+    }
+
+
+def test_pairs_results_written_by_another_process(shared_apps):
+    first, second = shared_apps
+    with first.app_context():
+        tournament_id = add_tournament(1, TournamentFormat.SWISS, 4)
+        played = swiss_pairs(tournament_id)
+
+    # Draws keep everyone level, so only the opponent history tells the rounds apart
+    with second.app_context():
+        for pair in played:
+            record_result(tournament_id, *sorted(pair), '1-1', is_draw=True)
+        assert Tournament.query.filter_by(tournament_id=tournament_id).one().current_round == 2
+
+    with first.app_context():
+        db.session.expire_all()
+        assert not swiss_pairs(tournament_id) & played
+
+
+def play_swiss(players, rounds, rng):
+    """Pair and play ``rounds`` rounds of random results; returns the rounds' pairings."""
+    score = {key: 0 for key in range(players)}
+    history = []
+    for _ in range(rounds):
+        opponents, byes = build_opponent_index(pair for pairs in history for pair in pairs)
+        pairs = swiss_pairings([(key, score[key], key) for key in score], opponents, byes)
+        for a, b in pairs:
+            score[b if b is not None and rng.random() < 0.5 else a] += 1
+        history.append(pairs)
+    return history
+
+
+@pytest.mark.parametrize('players', range(4, 13))
+def test_no_repeat_pairings(players):
+    rng = random.Random(players)
+    for _ in range(20):
+        seen = set()
+        for pairs in play_swiss(players, players // 2, rng):
+            assert sorted(key for pair in pairs for key in pair if key is not None) == list(range(players))
+            games = {frozenset(pair) for pair in pairs if None not in pair}
+            assert not games & seen
+            seen |= games
+
+
+@pytest.mark.parametrize('players', [5, 7, 9, 11])
+def test_byes_go_to_different_players(players):
+    rng = random.Random(players)
+    for _ in range(20):
+        byes = [a for pairs in play_swiss(players, players, rng) for a, b in pairs if b is None]
+        assert len(byes) == players
+        assert len(set(byes)) == players
+
+
+def test_bye_goes_to_the_lowest_ranked_player_without_one():
+    players = [('a', 2, 1), ('b', 1, 2), ('c', 1, 3), ('d', 0, 4), ('e', 0, 5)]
+    assert swiss_pairings(players)[-1] == ('e', None)
+    assert swiss_pairings(players, byes={'e': 1})[-1] == ('d', None)
+    assert swiss_pairings(players, byes={'d': 1, 'e': 1})[-1] == ('c', None)
+
+
+def test_rematch_only_when_unavoidable():
+    # Everyone has played everyone but a-b and c-d
+    opponents, byes = build_opponent_index([('a', 'c'), ('a', 'd'), ('b', 'c'), ('b', 'd')])
+    pairs = swiss_pairings([('a', 1, 1), ('b', 1, 2), ('c', 1, 3), ('d', 1, 4)], opponents, byes)
+    assert {frozenset(pair) for pair in pairs} == {frozenset('ab'), frozenset('cd')}
+
+    # Nobody left to play: still a full round
+    opponents, byes = build_opponent_index([('a', 'b')])
+    assert swiss_pairings([('a', 1, 1), ('b', 0, 2)], opponents, byes) == [('a', 'b')]
+
+
+def best_matching_weight(vertices, edges, maxcardinality):
+    """Brute-force (cardinality, weight) of the best matching, for comparison."""
+    best = (0, 0)
+    for size in range(1, len(vertices) // 2 + 1):
+        for chosen in itertools.combinations(edges, size):
+            ends = [v for i, j, _ in chosen for v in (i, j)]
+            if len(set(ends)) == len(ends):
+                found = (size if maxcardinality else 0, sum(w for _, _, w in chosen))
+                best = max(best, found)
+    return best
+
+
+@pytest.mark.parametrize('maxcardinality', [False, True])
+def test_matching_is_maximum_weight(maxcardinality):
+    rng = random.Random(1)
+    for _ in range(200):
+        vertices = range(rng.randint(2, 7))
+        edges = [(i, j, rng.randint(1, 20)) for i, j in itertools.combinations(vertices, 2) if rng.random() < 0.6]
+        if not edges:
+            continue
+        mate = max_weight_matching(edges, maxcardinality=maxcardinality)
+        weights = {frozenset((i, j)): w for i, j, w in edges}
+        chosen = {frozenset((i, j)) for i, j in enumerate(mate) if j != -1}
+        assert all(mate[j] == i for i, j in enumerate(mate) if j != -1)
+        found = (len(chosen) if maxcardinality else 0, sum(weights[pair] for pair in chosen))
+        assert found == best_matching_weight(vertices, edges, maxcardinality)
@@ -0,0 +1,35 @@
+import threading
+from contextlib import contextmanager
+
+
+class TournamentLocks:
+    """One lock per tournament, held while writing to it.
+
+    Writes to the same tournament from this process's threads take turns
+    instead of racing to commit and retrying, while writes to different
+    tournaments run side by side. Locks exist only while someone holds or
+    waits for them. Writes from other processes are caught by the
+    tournament's version check instead.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._locks = {}  # tournament_id -> [lock, threads holding or waiting]
+
+    @contextmanager
+    def hold(self, tournament_id):
+        with self._lock:
+            entry = self._locks.setdefault(tournament_id, [threading.RLock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._locks[tournament_id]
+
+    def __len__(self):
+        with self._lock:
+            return len(self._locks)